@@ -0,0 +1,97 @@
+"""
+Async Lanes Benchmark - Many checkout lanes served by one event loop
+
+Usage: python -m benchmarks.async_lanes [--lanes N] [--sales N] [--products N] [--read-workers N]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from benchmarks.datagen import populate, product_id_for
+from database.db_connection import DatabaseConnection
+from services.async_app_context import AsyncAppContext
+
+
+async def run_lane(context: AsyncAppContext, lane: int, sales: int, products: int,
+                   items_per_sale: int, latencies: list) -> int:
+    """Ring up sales on one lane, recording the latency of every call"""
+    rng = random.Random(lane)
+    checkout = context.new_checkout_service()
+    completed = 0
+    for _ in range(sales):
+        await checkout.start_new_order()
+        for _ in range(items_per_sale):
+            started = time.perf_counter()
+            await checkout.add_item(product_id_for(rng.randrange(products)), 1)
+            latencies.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        success, _, _ = await checkout.process_payment('card')
+        latencies.append(time.perf_counter() - started)
+        if success:
+            completed += 1
+        else:
+            await checkout.cancel_order()
+    return completed
+
+
+async def run_lanes(db_path: str, lanes: int, sales: int, products: int, items_per_sale: int,
+                    read_workers: int) -> dict:
+    """Run every lane concurrently on the current event loop"""
+    context = AsyncAppContext(db_path, read_workers)
+    latencies = []
+    started = time.perf_counter()
+    try:
+        completed = await asyncio.gather(*(
+            run_lane(context, lane, sales, products, items_per_sale, latencies)
+            for lane in range(lanes)
+        ))
+    finally:
+        elapsed = time.perf_counter() - started
+        context.close()
+    latencies.sort()
+    
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    
+    return {
+        'lanes': lanes,
+        'sales': sum(completed),
+        'calls': len(latencies),
+        'seconds': elapsed,
+        'sales_per_second': sum(completed) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0
+    }
+
+
+def main():
+    """Generate a store database and drive many async lanes against it"""
+    parser = argparse.ArgumentParser(description="Benchmark many async checkout lanes")
+    parser.add_argument("--db", help="existing database (skips data generation)")
+    parser.add_argument("--lanes", type=int, default=200)
+    parser.add_argument("--sales", type=int, default=10, help="sales per lane")
+    parser.add_argument("--items", type=int, default=3, help="items per sale")
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--read-workers", type=int, default=4)
+    args = parser.parse_args()
+    
+    db_path = args.db
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="pos_async_"), "async.db")
+        print(f"Generating {args.products} products in {db_path}...")
+        populate(DatabaseConnection(db_path, profile="bulk_import"), args.products, 0)
+    
+    result = asyncio.run(run_lanes(db_path, args.lanes, args.sales, args.products,
+                                   args.items, args.read_workers))
+    print("-" * 60)
+    print(f"{result['lanes']} lanes, {result['sales']} sales, {result['calls']} calls "
+          f"in {result['seconds']:.2f}s ({result['sales_per_second']:,.0f} sales/s)")
+    print(f"Call latency: p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+          f"max {result['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Synthetic Data Generator - Build store databases at benchmark scale
+
+Usage: python -m benchmarks.datagen DB_PATH [--products N] [--orders N] [--items-per-order N] [--days N]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+from database.db_connection import DatabaseConnection
+from database.schema import create_tables
+from storage.sales_summary_storage import SalesSummaryStorage
+
+CATEGORIES = ['Beverage', 'Food', 'Dairy', 'Snacks', 'Bakery', 'Produce', 'Frozen', 'Household']
+WORDS = ['Cola', 'Noodles', 'Milk', 'Cookies', 'Chips', 'Bread', 'Apple', 'Rice', 'Tea', 'Coffee',
+         'Juice', 'Yogurt', 'Cheese', 'Soap', 'Tissue', 'Water', 'Candy', 'Cereal', 'Butter', 'Eggs']
+PAYMENT_METHODS = ['cash', 'card', 'alipay', 'wechat']
+BATCH_SIZE = 20000
+
+
+def product_id_for(index: int) -> str:
+    """Product ID for the index-th synthetic product"""
+    return f"P{index:08d}"
+
+
+def barcode_for(index: int) -> str:
+    """Barcode for the index-th synthetic product"""
+    return f"{6900000000000 + index}"
+
+
+def generate_products(count: int, rng: random.Random) -> Iterator[Tuple]:
+    """Yield product rows"""
+    for i in range(count):
+        name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+        price = round(rng.uniform(0.5, 99.0), 2)
+        yield (product_id_for(i), name, price, barcode_for(i), rng.choice(CATEGORIES))
+
+
+def generate_orders(count: int, product_count: int, items_per_order: int, days: int,
+                    rng: random.Random) -> Iterator[Tuple[Tuple, List[Tuple]]]:
+    """Yield (order_row, item_rows) spread evenly over the last `days` days"""
+    end = datetime.now().replace(microsecond=0)
+    start = end - timedelta(days=days)
+    span = (end - start).total_seconds()
+    for i in range(count):
+        created = start + timedelta(seconds=span * i / max(count, 1))
+        order_id = f"ORD-{created.strftime('%Y%m%d%H%M%S')}-{i:08X}"
+        lines = {}
+        for _ in range(rng.randint(1, items_per_order * 2 - 1)):
+            product = rng.randrange(product_count)
+            lines[product] = lines.get(product, 0) + rng.randint(1, 3)
+        item_rows = []
+        total = 0.0
+        for product, quantity in lines.items():
+            unit_price = round(1.0 + product % 97, 2)
+            total += unit_price * quantity
+            item_rows.append((order_id, product_id_for(product), quantity, unit_price))
+        order_row = (order_id, round(total, 2), rng.choice(PAYMENT_METHODS), 'paid',
+                     created.strftime("%Y-%m-%d %H:%M:%S"), 'completed')
+        yield order_row, item_rows
+
+
+def _batches(rows: Iterator, size: int) -> Iterator[list]:
+    """Group an iterator into lists of at most size"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def populate(db: DatabaseConnection, products: int = 10000, orders: int = 100000,
+             items_per_order: int = 3, days: int = 365, stock: int = 1000000, seed: int = 42) -> dict:
+    """Fill a database with synthetic products, inventory and order history"""
+    rng = random.Random(seed)
+    create_tables(db)
+    started = time.perf_counter()
+    
+    for batch in _batches(generate_products(products, rng), BATCH_SIZE):
+        with db.transaction():
+            db.execute_many(
+                """INSERT OR IGNORE INTO products (product_id, name, price, barcode, category)
+                   VALUES (?, ?, ?, ?, ?)""",
+                batch
+            )
+            db.execute_many(
+                """INSERT INTO inventory (product_id, quantity) VALUES (?, ?)
+                   ON CONFLICT(product_id) DO UPDATE SET quantity = excluded.quantity""",
+                [(row[0], stock) for row in batch]
+            )
+    
+    item_count = 0
+    for batch in _batches(generate_orders(orders, products, items_per_order, days, rng), BATCH_SIZE // 4):
+        with db.transaction():
+            db.execute_many(
+                """INSERT OR IGNORE INTO orders (order_id, total_amount, payment_method,
+                   payment_status, created_at, status)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [order_row for order_row, _ in batch]
+            )
+            item_rows = [item for _, items in batch for item in items]
+            db.execute_many(
+                """INSERT INTO order_items (order_key, product_id, quantity, unit_price)
+                   SELECT order_key, ?2, ?3, ?4 FROM orders WHERE order_id = ?1""",
+                item_rows
+            )
+            item_count += len(item_rows)
+    
+    # Orders were inserted directly, so summarize them in one pass
+    if orders:
+        SalesSummaryStorage(db).rebuild()
+    
+    return {
+        'products': products,
+        'orders': orders,
+        'order_items': item_count,
+        'days': days,
+        'seconds': time.perf_counter() - started
+    }
+
+
+def main():
+    """Generate a synthetic store database"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic POS database")
+    parser.add_argument("db_path")
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--items-per-order", type=int, default=3)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    result = populate(DatabaseConnection(args.db_path, profile="bulk_import"), args.products, args.orders,
+                      args.items_per_order, args.days, seed=args.seed)
+    print(f"Generated {result['products']} products, {result['orders']} orders, "
+          f"{result['order_items']} order items in {result['seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+HTTP Load Generator - Drive many lanes against the headless POS server
+
+Usage: python -m benchmarks.load_http [--url http://host:port] [--lanes N] [--duration S]
+
+Without --url a server is started on a free port against a freshly generated
+database. Each lane is a thread with its own keep-alive connection that rings
+up sales: start an order, scan --items products, pay by card.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+from urllib.parse import urlsplit
+from benchmarks.datagen import populate, product_id_for
+from database.db_connection import DatabaseConnection
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Lane(threading.Thread):
+    """One terminal ringing up sales until the deadline"""
+    
+    def __init__(self, host: str, port: int, terminal_id: str, products: int, items: int,
+                 deadline: float):
+        """Initialize lane"""
+        super().__init__(daemon=True)
+        self.conn = http.client.HTTPConnection(host, port, timeout=60)
+        self.terminal_id = terminal_id
+        self.rng = random.Random(terminal_id)
+        self.products = products
+        self.items = items
+        self.deadline = deadline
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.sales = 0
+    
+    def request(self, method: str, path: str, body: dict = None) -> int:
+        """Send one request, record its latency, return the status"""
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if data is not None else {}
+        started = time.perf_counter()
+        self.conn.request(method, path, data, headers)
+        response = self.conn.getresponse()
+        response.read()
+        self.latencies.append(time.perf_counter() - started)
+        if response.status >= 400:
+            self.errors += 1
+        return response.status
+    
+    def run(self):
+        """Ring up sales until the deadline"""
+        base = f"/terminals/{self.terminal_id}"
+        while time.monotonic() < self.deadline:
+            self.request('POST', f"{base}/order")
+            for _ in range(self.items):
+                code = product_id_for(self.rng.randrange(self.products))
+                self.request('POST', f"{base}/items", {'code': code, 'quantity': 1})
+            if self.request('POST', f"{base}/payment", {'method': 'card'}) == 200:
+                self.sales += 1
+        self.conn.close()
+
+
+def start_server(db_path: str, pool_size: int):
+    """Start a server subprocess on a free port, returns (process, port)"""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "server", "--port", "0", "--db", db_path,
+         "--pool-size", str(pool_size)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True
+    )
+    line = proc.stdout.readline()
+    if "listening on" not in line:
+        proc.kill()
+        raise RuntimeError(f"Server failed to start: {line!r}")
+    port = int(line.split("http://", 1)[1].split()[0].rsplit(":", 1)[1])
+    return proc, port
+
+
+def run_load(host: str, port: int, lanes: int, duration: float, products: int, items: int) -> dict:
+    """Run every lane for duration seconds and summarise the results"""
+    deadline = time.monotonic() + duration
+    workers = [Lane(host, port, f"lane-{i}", products, items, deadline) for i in range(lanes)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    
+    latencies = sorted(latency for worker in workers for latency in worker.latencies)
+    
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+    
+    return {
+        'lanes': lanes,
+        'seconds': elapsed,
+        'requests': len(latencies),
+        'errors': sum(worker.errors for worker in workers),
+        'sales': sum(worker.sales for worker in workers),
+        'requests_per_second': len(latencies) / elapsed,
+        'sales_per_second': sum(worker.sales for worker in workers) / elapsed,
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99)
+    }
+
+
+def main():
+    """Load-test the POS server"""
+    parser = argparse.ArgumentParser(description="Load generator for the POS HTTP server")
+    parser.add_argument("--url", help="running server to target (otherwise one is started)")
+    parser.add_argument("--lanes", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--items", type=int, default=3, help="items per sale")
+    parser.add_argument("--products", type=int, default=10000,
+                        help="catalog size (generated, or of the target database)")
+    parser.add_argument("--pool-size", type=int, default=16)
+    args = parser.parse_args()
+    
+    proc = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="pos_http_"), "http.db")
+        print(f"Generating {args.products} products in {db_path}...")
+        populate(DatabaseConnection(db_path, profile="bulk_import"), args.products, 0)
+        proc, port = start_server(db_path, args.pool_size)
+        host = "127.0.0.1"
+    
+    try:
+        print(f"Running {args.lanes} lanes for {args.duration:.0f}s against http://{host}:{port}")
+        result = run_load(host, port, args.lanes, args.duration, args.products, args.items)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    
+    print("-" * 60)
+    print(f"{result['requests']} requests ({result['errors']} errors), {result['sales']} sales "
+          f"in {result['seconds']:.1f}s")
+    print(f"{result['requests_per_second']:,.0f} requests/s, {result['sales_per_second']:,.0f} sales/s")
+    print(f"Request latency: p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Order Keys Benchmark - Insert throughput and index size of the orders tables
+
+Compares the legacy layout (random-suffix text order IDs copied into every
+order_items row) with the current one (time-ordered order IDs, integer
+order_key in order_items). Throughput is reported for the first and last
+tenth of the run, since random inserts slow down once the indexes outgrow
+the page cache.
+
+Usage: python -m benchmarks.order_keys [--orders N] [--items N] [--batch N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from database.db_connection import DatabaseConnection
+from database.schema import MIGRATIONS, create_tables
+from services.order_id_generator import OrderIdGenerator
+
+LEGACY_VERSION = 6  # Last schema version with text order_id in order_items
+
+
+def legacy_batch(db: DatabaseConnection, orders: list):
+    """Insert orders the way the legacy schema stored them (random suffixes can collide)"""
+    db.execute_many(
+        """INSERT OR IGNORE INTO orders (order_id, total_amount, payment_method, payment_status, created_at, status)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        [(order_id, total, 'cash', 'paid', created, 'completed') for order_id, total, created, _ in orders]
+    )
+    db.execute_many(
+        "INSERT INTO order_items (order_id, product_id, quantity, unit_price) VALUES (?, ?, ?, ?)",
+        [(order_id, *item) for order_id, _, _, items in orders for item in items]
+    )
+
+
+def keyed_batch(db: DatabaseConnection, orders: list):
+    """Insert orders the way OrderStorage.add_many does"""
+    first_key = db.fetch_one("SELECT COALESCE(MAX(order_key), 0) + 1 FROM orders")[0]
+    keyed = list(enumerate(orders, first_key))
+    db.execute_many(
+        """INSERT INTO orders (order_key, order_id, total_amount, payment_method, payment_status,
+           created_at, status) VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        [(key, order_id, total, 'cash', 'paid', created, 'completed')
+         for key, (order_id, total, created, _) in keyed]
+    )
+    db.execute_many(
+        "INSERT INTO order_items (order_key, product_id, quantity, unit_price) VALUES (?, ?, ?, ?)",
+        [(key, *item) for key, (_, _, _, items) in keyed for item in items]
+    )
+
+
+def run_layout(db_path: str, layout: str, orders: int, items: int, batch: int, seed: int = 7) -> dict:
+    """Insert orders into a fresh database with one layout, returns timings and sizes"""
+    db = DatabaseConnection(db_path, pool_size=1)
+    if layout == 'legacy':
+        with db.transaction():
+            for migration in MIGRATIONS[:LEGACY_VERSION]:
+                migration(db)
+        insert, next_id = legacy_batch, None
+    else:
+        create_tables(db)
+        insert, next_id = keyed_batch, OrderIdGenerator(1).next_id
+    
+    rng = random.Random(seed)
+    tenth = max(orders // 10 // batch, 1)
+    batch_times = []
+    started = time.perf_counter()
+    for done in range(0, orders, batch):
+        created = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = []
+        for _ in range(min(batch, orders - done)):
+            if next_id is None:
+                order_id = f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}-{str(uuid.uuid4())[:8].upper()}"
+            else:
+                order_id = next_id()
+            lines = [(f"P{rng.randrange(10000):06d}", 1, 1.0) for _ in range(items)]
+            rows.append((order_id, float(items), created, lines))
+        batch_started = time.perf_counter()
+        with db.transaction():
+            insert(db, rows)
+        batch_times.append(time.perf_counter() - batch_started)
+    elapsed = time.perf_counter() - started
+    
+    sizes = {row['name']: row['size'] for row in db.fetch_all(
+        "SELECT name, SUM(pgsize) AS size FROM dbstat GROUP BY name"
+    )}
+    db.close()
+    return {
+        'layout': layout,
+        'seconds': elapsed,
+        'first_tenth_per_second': tenth * batch / sum(batch_times[:tenth]),
+        'last_tenth_per_second': tenth * batch / sum(batch_times[-tenth:]),
+        'orders_bytes': sum(size for name, size in sizes.items()
+                            if name == 'orders' or name.startswith(('idx_orders', 'sqlite_autoindex_orders'))),
+        'order_items_bytes': sum(size for name, size in sizes.items()
+                                 if name == 'order_items' or name.startswith('idx_order_items')),
+        'file_bytes': os.path.getsize(db_path)
+    }
+
+
+def main():
+    """Insert the same orders with both layouts and compare"""
+    parser = argparse.ArgumentParser(description="Benchmark order ID and key layouts")
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--items", type=int, default=3, help="items per order")
+    parser.add_argument("--batch", type=int, default=500, help="orders per transaction")
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp(prefix="pos_keys_")
+    print(f"Inserting {args.orders:,} orders x {args.items} items per layout in {directory}")
+    print("-" * 60)
+    for layout in ('legacy', 'keyed'):
+        result = run_layout(os.path.join(directory, f"{layout}.db"), layout,
+                            args.orders, args.items, args.batch)
+        print(f"{layout:<7} {result['seconds']:7.1f}s  "
+              f"first 10%: {result['first_tenth_per_second']:9,.0f} orders/s  "
+              f"last 10%: {result['last_tenth_per_second']:9,.0f} orders/s")
+        print(f"{'':<7} orders {result['orders_bytes'] / 2**20:7.1f} MiB  "
+              f"order_items {result['order_items_bytes'] / 2**20:7.1f} MiB  "
+              f"file {result['file_bytes'] / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
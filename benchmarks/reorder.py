@@ -0,0 +1,99 @@
+"""
+Reorder Benchmark - Reorder planning for a large catalog with a long sales history
+
+Fills sales_summary with synthetic per-product daily sales (each product sells
+on a random share of days) and times ReorderService.forecast for several window
+lengths, next to a per-product loop that queries each product's window on its
+own. The loop is timed on a sample and extrapolated to the whole catalog.
+
+Usage: python -m benchmarks.reorder [--products N] [--days N] [--sell-rate R] [--sample N]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from database.db_connection import DatabaseConnection
+from database.schema import create_tables
+from services.reorder_service import ReorderService
+
+
+def populate_history(db: DatabaseConnection, products: int, days: int, sell_rate: float, as_of: str):
+    """Create products with stock and `days` days of per-product sales ending before as_of"""
+    first_day = (date.fromisoformat(as_of) - timedelta(days=days)).isoformat()
+    with db.transaction():
+        db.execute(
+            """WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < ?)
+               INSERT INTO products (product_id, name, price, barcode, category)
+               SELECT printf('P%06d', i), 'Product ' || i, 1.0, NULL, 'Bench' FROM n""",
+            (products,)
+        )
+        db.execute(
+            """INSERT INTO inventory (product_id, quantity)
+               SELECT product_id, abs(random()) % 200 FROM products"""
+        )
+        # Each product sells on its own share of days (0 to twice sell_rate); the draw
+        # refers to the product's rate so SQLite evaluates it for every day and product
+        db.execute(
+            """WITH RECURSIVE d(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM d WHERE i + 1 < ?),
+               p AS (SELECT product_id, (rowid * 7919) % 1000 * ? * 2 AS rate FROM products)
+               INSERT INTO sales_summary (day, dimension, key, orders, units, revenue)
+               SELECT date(?, '+' || d.i || ' days'), 'product', p.product_id, 1, 1 + abs(random()) % 5, 0
+               FROM d CROSS JOIN p
+               WHERE abs(random()) % 1000 < p.rate""",
+            (days, sell_rate, first_day)
+        )
+
+
+def per_product_loop(db: DatabaseConnection, service: ReorderService, product_ids: list, as_of: str) -> float:
+    """Seconds to read each product's window with its own query and compute its velocity"""
+    start = (date.fromisoformat(as_of) - timedelta(days=service.window_days)).isoformat()
+    started = time.perf_counter()
+    for product_id in product_ids:
+        rows = db.fetch_all(
+            """SELECT units FROM sales_summary
+               WHERE day >= ? AND day < ? AND dimension = 'product' AND key = ?""",
+            (start, as_of, product_id)
+        )
+        sum(row['units'] for row in rows) / service.window_days
+    return time.perf_counter() - started
+
+
+def main():
+    """Generate a sales history and time reorder planning over it"""
+    parser = argparse.ArgumentParser(description="Benchmark reorder planning")
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=365, help="days of sales history")
+    parser.add_argument("--sell-rate", type=float, default=0.15, help="share of days a product sells on")
+    parser.add_argument("--sample", type=int, default=200, help="products timed in the per-product loop")
+    args = parser.parse_args()
+    
+    as_of = date.today().isoformat()
+    directory = tempfile.mkdtemp(prefix="pos_reorder_")
+    db = DatabaseConnection(os.path.join(directory, "reorder.db"), pool_size=1, profile="backoffice")
+    create_tables(db)
+    print(f"Generating {args.products:,} products x {args.days} days of sales in {directory}")
+    started = time.perf_counter()
+    populate_history(db, args.products, args.days, args.sell_rate, as_of)
+    rows = db.fetch_one("SELECT COUNT(*) FROM sales_summary")[0]
+    print(f"{rows:,} summary rows in {time.perf_counter() - started:.1f}s")
+    print("-" * 60)
+    
+    for window in (7, 28, 91, args.days):
+        service = ReorderService(db, window_days=window)
+        started = time.perf_counter()
+        forecast = service.forecast(as_of=as_of)
+        elapsed = time.perf_counter() - started
+        due = sum(1 for item in forecast if item['reorder'])
+        print(f"window {window:>3} days  {elapsed:6.2f}s  {len(forecast):>8,} products  {due:>7,} to reorder")
+    
+    service = ReorderService(db)
+    sample = [f"P{i:06d}" for i in range(0, args.products, max(args.products // args.sample, 1))][:args.sample]
+    elapsed = per_product_loop(db, service, sample, as_of)
+    print(f"per-product loop ({service.window_days} days): {elapsed / len(sample) * 1000:.1f} ms/product, "
+          f"~{elapsed / len(sample) * args.products:,.0f}s for the catalog")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Benchmark Runner - Time the POS hot paths against a synthetic store database
+
+Usage: python -m benchmarks.run [--products N] [--orders N] [--output results.json] [--compare old.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+from benchmarks.datagen import populate, product_id_for, barcode_for
+from database.db_connection import DatabaseConnection
+from services.checkout_service import CheckoutService
+from services.inventory_service import InventoryService
+from services.return_service import ReturnService
+from storage.order_storage import OrderStorage
+from ui.inventory_ui import InventoryUI
+
+
+class CountingDatabaseConnection(DatabaseConnection):
+    """DatabaseConnection that counts the SQL statements it executes"""
+    
+    def __init__(self, *args, **kwargs):
+        """Initialize counting connection"""
+        self.statements = 0
+        super().__init__(*args, **kwargs)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that reports every top-level statement"""
+        conn = super()._connect()
+        conn.set_trace_callback(self._trace)
+        return conn
+    
+    def _trace(self, statement: str):
+        """Count statements, ignoring those run by triggers"""
+        if not statement.startswith("--"):
+            self.statements += 1
+
+
+def measure(name: str, db: CountingDatabaseConnection, operation: Callable[[int], None],
+            iterations: int) -> Dict:
+    """Run operation(i) iterations times and summarise latency, throughput and queries"""
+    latencies = []
+    db.statements = 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    
+    result = {
+        'name': name,
+        'iterations': iterations,
+        'seconds': elapsed,
+        'ops_per_second': iterations / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+        'max_ms': latencies[-1] * 1000,
+        'queries_per_op': db.statements / iterations
+    }
+    print(f"{name:<34} {result['ops_per_second']:>10.0f} ops/s  p50 {result['p50_ms']:>8.3f} ms  "
+          f"p99 {result['p99_ms']:>8.3f} ms  {result['queries_per_op']:>6.1f} queries/op")
+    return result
+
+
+def run_benchmarks(db_path: str, products: int, iterations: int, skip_load_all: bool) -> List[Dict]:
+    """Run every hot-path benchmark against an existing database"""
+    db = CountingDatabaseConnection(db_path)
+    rng = random.Random(7)
+    results = []
+    
+    checkout = CheckoutService(db)
+    returns = ReturnService(db)
+    inventory_ui = InventoryUI(InventoryService(db))
+    
+    def random_code(_):
+        index = rng.randrange(products)
+        return barcode_for(index) if rng.random() < 0.8 else product_id_for(index)
+    
+    # Scanner lookups as done by CheckoutUI.scan_product
+    results.append(measure("scan_product lookup", db,
+                           lambda i: checkout.product_storage.resolve(random_code(i)), iterations))
+    
+    # Adding items to a cart, starting a fresh cart every 20 lines
+    def add_item(i):
+        if i % 20 == 0:
+            checkout.start_new_order()
+        checkout.add_item(random_code(i), 1)
+    results.append(measure("CheckoutService.add_item", db, add_item, iterations))
+    checkout.cancel_order()
+    
+    # Paying for three-line carts
+    paid_orders = []
+    
+    def process_payment(i):
+        checkout.start_new_order()
+        for _ in range(3):
+            checkout.add_item(product_id_for(rng.randrange(products)), 1)
+        success, _, info = checkout.process_payment('card')
+        if success:
+            paid_orders.append(info['order'])
+    results.append(measure("CheckoutService.process_payment", db, process_payment,
+                           max(1, iterations // 10)))
+    
+    # Returning one line of each paid order
+    def process_return(i):
+        order = paid_orders[i % len(paid_orders)]
+        returns.process_return(order.order_id, {order.items[0].product.product_id: 1}, "benchmark")
+    if paid_orders:
+        results.append(measure("ReturnService.process_return", db, process_return, len(paid_orders)))
+    
+    # Whole-catalog inventory report, output discarded
+    def display_inventory(_):
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+            inventory_ui.display_all_inventory()
+    results.append(measure("InventoryUI.display_all_inventory", db, display_inventory, 1))
+    
+    if not skip_load_all:
+        order_storage = OrderStorage(db)
+        results.append(measure("OrderStorage.load_all", db, lambda _: order_storage.load_all(), 1))
+    
+    db.close()
+    return results
+
+
+def compare(results: List[Dict], baseline_path: str):
+    """Print the change against a previous results file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {r['name']: r for r in json.load(f)['results']}
+    print("-" * 60)
+    print(f"Compared with {baseline_path}:")
+    for result in results:
+        old = baseline.get(result['name'])
+        if old is None or not old['p50_ms']:
+            continue
+        change = (result['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100
+        print(f"{result['name']:<34} p50 {old['p50_ms']:.3f} -> {result['p50_ms']:.3f} ms ({change:+.1f}%)")
+
+
+def main():
+    """Generate (or reuse) a database, run the benchmarks and save the results"""
+    parser = argparse.ArgumentParser(description="Benchmark POS hot paths")
+    parser.add_argument("--db", help="existing database to benchmark (skips data generation)")
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--skip-load-all", action="store_true",
+                        help="skip OrderStorage.load_all (impractical at millions of orders)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+    
+    db_path = args.db
+    generation = None
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="pos_bench_"), "bench.db")
+        print(f"Generating {args.products} products and {args.orders} orders in {db_path}...")
+        generation = populate(DatabaseConnection(db_path, profile="bulk_import"), args.products, args.orders, days=args.days)
+        print(f"Generated {generation['order_items']} order items in {generation['seconds']:.1f}s")
+    
+    print("-" * 60)
+    results = run_benchmarks(db_path, args.products, args.iterations, args.skip_load_all)
+    
+    report = {
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'scale': {'products': args.products, 'orders': args.orders, 'days': args.days},
+        'generation': generation,
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print("-" * 60)
+    print(f"Results saved to {args.output}")
+    
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
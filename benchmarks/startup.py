@@ -0,0 +1,106 @@
+"""
+Startup Benchmark - Time a terminal cold start against a large database
+
+Usage: python -m benchmarks.startup [--db PATH] [--products N] [--orders N] [--runs N]
+
+Two measurements are taken:
+  in-process: AppContext construction plus the sample-data check, i.e. the work
+              main() does before it prints the menu
+  process:    a fresh `python main.py` from launch until the menu prompt is
+              printed, next to the time to start a bare interpreter
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+from benchmarks.datagen import populate
+from database.db_connection import DatabaseConnection
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MENU_PROMPT = "Please select an option"
+
+
+def _median_ms(samples: List[float]) -> float:
+    """Median of samples in seconds, as milliseconds"""
+    samples = sorted(samples)
+    return samples[len(samples) // 2] * 1000
+
+
+def time_in_process(db_path: str, runs: int) -> List[float]:
+    """Time AppContext startup and the emptiness check"""
+    from services.app_context import AppContext
+    from main import initialize_sample_data
+    
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        context = AppContext(db_path)
+        initialize_sample_data(context)
+        samples.append(time.perf_counter() - started)
+        context.close()
+    return samples
+
+
+def time_process(db_path: str, runs: int) -> List[float]:
+    """Time `python main.py` from launch until it prompts at the main menu"""
+    env = dict(os.environ, POS_DB_PATH=db_path, PYTHONUNBUFFERED="1")
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env, text=True,
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        output = ""
+        while MENU_PROMPT not in output:
+            char = proc.stdout.read(1)
+            if not char:
+                raise RuntimeError("main.py exited before showing the menu")
+            output += char
+        samples.append(time.perf_counter() - started)
+        proc.communicate("6\n")
+    return samples
+
+
+def time_interpreter(runs: int) -> List[float]:
+    """Time a bare interpreter start as the baseline"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    """Generate (or reuse) a database and time cold starts against it"""
+    parser = argparse.ArgumentParser(description="Benchmark terminal startup time")
+    parser.add_argument("--db", help="existing database to start against (skips data generation)")
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--orders", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    
+    db_path = args.db
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="pos_startup_"), "startup.db")
+        print(f"Generating {args.products} products and {args.orders} orders in {db_path}...")
+        populate(DatabaseConnection(db_path, profile="bulk_import"), args.products, args.orders)
+    db_path = os.path.abspath(db_path)
+    print(f"Database size: {os.path.getsize(db_path) / (1 << 20):.1f} MiB")
+    print("-" * 60)
+    
+    in_process = time_in_process(db_path, args.runs)
+    print(f"{'In-process startup (median)':<34} {_median_ms(in_process):>9.1f} ms")
+    print(f"{'In-process startup (max)':<34} {max(in_process) * 1000:>9.1f} ms")
+    
+    interpreter = _median_ms(time_interpreter(args.runs))
+    process = _median_ms(time_process(db_path, args.runs))
+    print(f"{'python main.py to menu (median)':<34} {process:>9.1f} ms")
+    print(f"{'bare interpreter (median)':<34} {interpreter:>9.1f} ms")
+    print(f"{'main.py startup overhead':<34} {process - interpreter:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
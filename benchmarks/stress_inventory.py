@@ -0,0 +1,87 @@
+"""
+Inventory Stress Test - Many terminals selling the same SKU must never oversell
+
+Usage: python -m benchmarks.stress_inventory [terminals]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from database.schema import init_database
+from database.db_connection import DatabaseConnection
+from models.product import Product
+from services.checkout_service import CheckoutService
+from storage.product_storage import ProductStorage
+from storage.inventory_storage import InventoryStorage
+
+PRODUCT_ID = "STRESS-001"
+
+
+def run_terminal(args) -> int:
+    """Sell one unit at a time until the product is sold out, returns units sold"""
+    db_path, attempts = args
+    service = CheckoutService(DatabaseConnection(db_path))
+    sold = 0
+    for _ in range(attempts):
+        service.start_new_order()
+        success, _ = service.add_item(PRODUCT_ID, 1)
+        if not success:
+            continue
+        success, _, _ = service.process_payment('card')
+        if success:
+            sold += 1
+        else:
+            service.cancel_order()
+    return sold
+
+
+def run_stress_test(terminals: int = 8, initial_stock: int = 200, attempts_per_terminal: int = 60,
+                    db_path: str = None) -> dict:
+    """Run concurrent terminals against one database and verify no oversell"""
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="pos_stress_"), "stress.db")
+    
+    db = init_database(db_path)
+    ProductStorage(db).add(Product(PRODUCT_ID, "Stress Test Item", 1.00, "0000000000001", "Test"))
+    inventory_storage = InventoryStorage(db)
+    inventory_storage.set_quantity(PRODUCT_ID, initial_stock)
+    
+    start = time.perf_counter()
+    with multiprocessing.Pool(terminals) as pool:
+        sold_per_terminal = pool.map(run_terminal, [(db_path, attempts_per_terminal)] * terminals)
+    elapsed = time.perf_counter() - start
+    
+    remaining = inventory_storage.get_quantity(PRODUCT_ID)
+    recorded = db.fetch_one(
+        "SELECT COALESCE(SUM(quantity), 0) AS total FROM order_items WHERE product_id = ?",
+        (PRODUCT_ID,)
+    )['total']
+    sold = sum(sold_per_terminal)
+    
+    return {
+        'terminals': terminals,
+        'initial_stock': initial_stock,
+        'sold': sold,
+        'recorded_in_orders': recorded,
+        'remaining_stock': remaining,
+        'elapsed_seconds': elapsed,
+        'oversold': sold > initial_stock or remaining < 0 or sold + remaining != initial_stock
+                    or recorded != sold
+    }
+
+
+def main():
+    """Run the stress test and exit non-zero on oversell"""
+    terminals = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    result = run_stress_test(terminals=terminals)
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    if result['oversold']:
+        print("FAIL: inventory was oversold")
+        sys.exit(1)
+    print("OK: no oversell")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,11 @@
 Database Module
 """
 from .db_connection import DatabaseConnection
+from .connection_pool import ConnectionPool, PoolTimeoutError
+from .profiles import PerformanceProfile, PROFILES, get_profile
+from .instrumentation import Instrumentation, instrumentation, instrumented
 from .schema import create_tables, init_database
 
-__all__ = ['DatabaseConnection', 'create_tables', 'init_database']
+__all__ = ['DatabaseConnection', 'ConnectionPool', 'PoolTimeoutError',
+           'PerformanceProfile', 'PROFILES', 'get_profile',
+           'Instrumentation', 'instrumentation', 'instrumented', 'create_tables', 'init_database']
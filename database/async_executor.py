@@ -0,0 +1,67 @@
+"""
+Async Executor - Run blocking SQLite work off the event loop
+
+SQLite allows many readers but only one writer at a time (WAL mode). Reads are
+spread over a small thread pool; every write goes through a single writer
+thread, so write transactions queue in order inside the process instead of
+contending for the database lock and spinning on busy timeouts.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class DatabaseExecutor:
+    """Dedicated reader pool and single-writer queue for async callers"""
+    
+    def __init__(self, read_workers: int = 4):
+        """
+        Initialize executor
+        read_workers: threads serving concurrent reads; keep it below the
+        DatabaseConnection pool size so the writer always finds a connection
+        """
+        if read_workers < 1:
+            raise ValueError("Need at least one read worker")
+        self.read_workers = read_workers
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="db-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+        self._lock = threading.Lock()
+        self.pending_reads = 0
+        self.pending_writes = 0
+    
+    async def read(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a read-only call on the reader pool"""
+        return await self._submit(self._readers, 'pending_reads', func, args, kwargs)
+    
+    async def write(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a call that writes on the single writer thread (FIFO)"""
+        return await self._submit(self._writer, 'pending_writes', func, args, kwargs)
+    
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for queued calls to finish"""
+        self._readers.shutdown(wait=wait)
+        self._writer.shutdown(wait=wait)
+    
+    def stats(self) -> dict:
+        """Get queue depths"""
+        return {
+            'read_workers': self.read_workers,
+            'pending_reads': self.pending_reads,
+            'pending_writes': self.pending_writes
+        }
+    
+    async def _submit(self, pool: ThreadPoolExecutor, counter: str, func, args, kwargs):
+        """Hand a call to a pool and await its result while tracking queue depth"""
+        self._adjust(counter, 1)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+        finally:
+            self._adjust(counter, -1)
+    
+    def _adjust(self, counter: str, delta: int):
+        """Update a queue depth counter"""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + delta)
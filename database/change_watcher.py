@@ -0,0 +1,68 @@
+"""
+Change Watcher - Detect commits made by other connections or processes
+"""
+import threading
+import time
+from .db_connection import DatabaseConnection
+
+
+class ChangeWatcher:
+    """
+    Watch a version counter maintained by triggers and report when it moves.
+    PRAGMA data_version on a dedicated connection is used as a cheap first check:
+    it only changes when some other connection has committed, so the counter
+    query itself runs only after a real write somewhere in the database.
+    """
+    
+    def __init__(self, db: DatabaseConnection, version_query: str, check_interval: float = 1.0):
+        """
+        Initialize change watcher
+        version_query: query returning a single counter value for the watched data
+        check_interval: minimum seconds between checks (bounds staleness)
+        """
+        self.version_query = version_query
+        self.check_interval = check_interval
+        self._conn = db.get_connection()
+        self._lock = threading.Lock()
+        self._data_version = self._read_data_version()
+        self._version = self._read_version()
+        self._last_check = time.monotonic()
+    
+    def changed(self) -> bool:
+        """Return True if the watched data changed since the last call"""
+        if time.monotonic() - self._last_check < self.check_interval:
+            return False
+        with self._lock:
+            self._last_check = time.monotonic()
+            data_version = self._read_data_version()
+            if data_version == self._data_version:
+                return False
+            self._data_version = data_version
+            version = self._read_version()
+            if version == self._version:
+                return False
+            self._version = version
+            return True
+    
+    def acknowledge(self, before, after):
+        """
+        Take a change made through this process (the counter moved from before
+        to after) as already seen. Ignored if a change made elsewhere is still
+        unseen, so that one is still reported.
+        """
+        with self._lock:
+            if self._version == before:
+                self._version = after
+    
+    def close(self):
+        """Close the watcher connection"""
+        self._conn.close()
+    
+    def _read_data_version(self) -> int:
+        """Read the connection-local database change counter"""
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _read_version(self):
+        """Read the watched version counter"""
+        row = self._conn.execute(self.version_query).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,121 @@
+"""
+Connection Pool - Bounded pool of reusable SQLite connections
+"""
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, List
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections with checkout/return and health checks"""
+    
+    def __init__(self, connect: Callable[[], sqlite3.Connection], size: int = 5,
+                 timeout: float = 30.0, health_check_interval: float = 60.0):
+        """
+        Initialize connection pool
+        connect: factory that opens a new configured connection
+        size: maximum number of open connections
+        timeout: seconds to wait for a free connection before giving up
+        health_check_interval: idle seconds after which a connection is pinged on checkout
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._idle = queue.LifoQueue()  # (connection, last_used) - LIFO keeps hot connections warm
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._all: List[sqlite3.Connection] = []
+        self._closed = False
+        self.connections_opened = 0
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, opening a new one if none is idle"""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeoutError(f"No database connection available after {self.timeout}s")
+        try:
+            while True:
+                try:
+                    conn, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._open()
+                if time.monotonic() - last_used < self.health_check_interval or self._is_healthy(conn):
+                    return conn
+                self._discard(conn)
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool (closing it if the pool has been closed meanwhile)"""
+        try:
+            if conn.in_transaction:
+                # Never hand out a connection with a half-finished transaction
+                conn.rollback()
+            with self._lock:
+                if not self._closed:
+                    self._idle.put((conn, time.monotonic()))
+                    return
+            self._discard(conn)
+        except sqlite3.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+    
+    def close_all(self):
+        """
+        Close the pool: idle connections are closed now, connections still
+        checked out by other threads are closed as they are released
+        """
+        with self._lock:
+            self._closed = True
+            idle = []
+            while True:
+                try:
+                    idle.append(self._idle.get_nowait()[0])
+                except queue.Empty:
+                    break
+        for conn in idle:
+            self._discard(conn)
+    
+    @property
+    def idle_count(self) -> int:
+        """Number of connections currently idle in the pool"""
+        return self._idle.qsize()
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open a new connection and track it"""
+        conn = self._connect()
+        with self._lock:
+            self._all.append(conn)
+            self.connections_opened += 1
+        return conn
+    
+    def _discard(self, conn: sqlite3.Connection):
+        """Close and forget a broken connection"""
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        """Ping a connection that has been idle for a while"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
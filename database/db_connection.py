@@ -3,22 +3,39 @@ Database Connection - SQLite database connection management
 """
 import sqlite3
 import os
+import threading
+import time
 from contextlib import contextmanager
-from typing import Optional
+from typing import Callable, Iterator, Optional, Union
+from .connection_pool import ConnectionPool
+from .profiles import PerformanceProfile, get_profile
+from .instrumentation import instrumentation
 
 
 class DatabaseConnection:
     """Database connection manager for SQLite"""
     
-    def __init__(self, db_path: str = "data/pos_system.db"):
-        """Initialize database connection"""
+    def __init__(self, db_path: str = "data/pos_system.db", pool_size: int = 5,
+                 profile: Union[str, PerformanceProfile, None] = None):
+        """
+        Initialize database connection
+        pool_size: number of persistent connections to reuse (0 disables pooling
+        and opens a new connection per query)
+        profile: performance profile name ('lane', 'backoffice', 'bulk_import');
+        defaults to the POS_DB_PROFILE environment variable, then 'lane'
+        """
         self.db_path = db_path
+        self.profile = get_profile(profile)
         self._ensure_data_dir()
         self._ensure_database()
+        self.pool = ConnectionPool(self._connect, pool_size) if pool_size > 0 else None
+        self._local = threading.local()  # Per-thread unit of work connection
     
     def _ensure_data_dir(self):
         """Ensure data directory exists"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
     
     def _ensure_database(self):
         """Ensure database file exists"""
@@ -27,70 +44,187 @@ class DatabaseConnection:
             conn = self.get_connection()
             conn.close()
     
-    def get_connection(self) -> sqlite3.Connection:
-        """Get a database connection"""
-        conn = sqlite3.connect(self.db_path)
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new configured connection"""
+        # Pooled connections are handed between threads, but only ever used by one at a time
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row  # Enable column access by name
+        self.profile.apply(conn)
+        if instrumentation.enabled:
+            instrumentation.record_connection()
         return conn
     
+    def get_connection(self) -> sqlite3.Connection:
+        """Get a new, unpooled database connection (caller must close it)"""
+        return self._connect()
+    
+    @property
+    def in_transaction(self) -> bool:
+        """Whether the current thread is inside a unit of work"""
+        return getattr(self._local, 'conn', None) is not None
+    
     @contextmanager
-    def get_cursor(self):
-        """Context manager for database cursor"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            yield cursor
+    def connection(self):
+        """Context manager that checks a connection out of the pool and returns it"""
+        enlisted = getattr(self._local, 'conn', None)
+        if enlisted is not None:
+            # Inside a unit of work every statement shares its connection
+            yield enlisted
+        elif self.pool is None:
+            conn = self._connect()
+            try:
+                yield conn
+            finally:
+                conn.close()
+        else:
+            conn = self.pool.acquire()
+            try:
+                yield conn
+            finally:
+                self.pool.release(conn)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work spanning every storage that shares this connection manager.
+        All statements issued by the current thread inside the block run in one
+        SQLite transaction and are committed once on exit (rolled back on error).
+        Nested blocks join the outermost transaction.
+        """
+        if self.in_transaction:
+            yield self._local.conn
+            return
+        
+        with self.connection() as conn:
+            started = time.perf_counter() if instrumentation.enabled else 0.0
+            conn.execute("BEGIN IMMEDIATE")
+            if started:
+                instrumentation.record_statement("BEGIN IMMEDIATE", time.perf_counter() - started)
+            self._local.conn = conn
+            self._local.after_commit = []
+            try:
+                yield conn
+                started = time.perf_counter() if instrumentation.enabled else 0.0
+                conn.commit()
+                if started:
+                    instrumentation.record_statement("COMMIT", time.perf_counter() - started)
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._local.conn = None
+                callbacks, self._local.after_commit = self._local.after_commit, []
+            for callback in callbacks:
+                callback()
+    
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        Run callback once the current unit of work commits (immediately outside one).
+        Callbacks are dropped if the transaction rolls back, so in-memory state
+        such as caches only changes when the database change is durable.
+        """
+        if self.in_transaction:
+            self._local.after_commit.append(callback)
+        else:
+            callback()
+    
+    def _commit(self, conn: sqlite3.Connection):
+        """Commit unless the statement belongs to an enclosing unit of work"""
+        if not self.in_transaction:
             conn.commit()
-        except Exception:
+    
+    def _rollback(self, conn: sqlite3.Connection):
+        """Roll back unless the enclosing unit of work owns the transaction"""
+        if not self.in_transaction:
             conn.rollback()
-            raise
-        finally:
-            conn.close()
+    
+    def close(self):
+        """Close all pooled connections"""
+        if self.pool is not None:
+            self.pool.close_all()
+    
+    @contextmanager
+    def get_cursor(self):
+        """Context manager for database cursor"""
+        with self.connection() as conn:
+            try:
+                cursor = conn.cursor()
+                yield cursor
+                self._commit(conn)
+            except Exception:
+                self._rollback(conn)
+                raise
     
     def execute(self, query: str, params: tuple = ()):
         """Execute a single query"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            conn.commit()
-            return cursor
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        started = time.perf_counter() if instrumentation.enabled else 0.0
+        with self.connection() as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                self._commit(conn)
+            except Exception:
+                self._rollback(conn)
+                raise
+        if started:
+            instrumentation.record_statement(query, time.perf_counter() - started)
+        return cursor
     
     def execute_many(self, query: str, params_list: list):
         """Execute a query multiple times"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.executemany(query, params_list)
-            conn.commit()
-            return cursor
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        started = time.perf_counter() if instrumentation.enabled else 0.0
+        with self.connection() as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.executemany(query, params_list)
+                self._commit(conn)
+            except Exception:
+                self._rollback(conn)
+                raise
+        if started:
+            instrumentation.record_statement(query, time.perf_counter() - started)
+        return cursor
     
     def fetch_one(self, query: str, params: tuple = ()) -> Optional[sqlite3.Row]:
         """Fetch one row"""
-        conn = self.get_connection()
-        try:
+        started = time.perf_counter() if instrumentation.enabled else 0.0
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            return cursor.fetchone()
-        finally:
-            conn.close()
+            row = cursor.fetchone()
+            cursor.close()  # Release the statement before the connection is reused
+        if started:
+            instrumentation.record_statement(query, time.perf_counter() - started)
+        return row
+    
+    def iter_rows(self, query: str, params: tuple = (), batch_size: int = 1000) -> Iterator[sqlite3.Row]:
+        """
+        Stream rows of a query, holding at most batch_size in memory.
+        The query keeps one pooled connection (and one read snapshot) until the
+        iterator is exhausted or closed.
+        """
+        started = time.perf_counter() if instrumentation.enabled else 0.0
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                cursor.close()
+        if started:
+            instrumentation.record_statement(query, time.perf_counter() - started)
     
     def fetch_all(self, query: str, params: tuple = ()) -> list:
         """Fetch all rows"""
-        conn = self.get_connection()
-        try:
+        started = time.perf_counter() if instrumentation.enabled else 0.0
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            return cursor.fetchall()
-        finally:
-            conn.close()
+            rows = cursor.fetchall()
+        if started:
+            instrumentation.record_statement(query, time.perf_counter() - started)
+        return rows
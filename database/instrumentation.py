@@ -0,0 +1,146 @@
+"""
+Instrumentation - Statement counts and latency histograms for database and service calls
+
+Disabled by default; when disabled every hook is a single attribute check.
+Enable with instrumentation.enable() or the POS_INSTRUMENTATION=1 environment variable.
+"""
+import functools
+import os
+import re
+import threading
+import time
+from typing import Dict
+
+
+class LatencyHistogram:
+    """Latency histogram with power-of-two microsecond buckets"""
+    
+    BUCKETS = 27  # 1us .. ~67s
+    
+    def __init__(self):
+        """Initialize empty histogram"""
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float):
+        """Add one observation"""
+        micros = int(seconds * 1_000_000)
+        self.buckets[min(micros.bit_length(), self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, p: float) -> float:
+        """Upper bound in milliseconds of the bucket holding the p-th percentile"""
+        if self.count == 0:
+            return 0.0
+        target = p * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return min((1 << index) / 1000, self.max * 1000)
+        return self.max * 1000
+    
+    def summary(self) -> dict:
+        """Count, mean, p50, p90, p99 and max latency in milliseconds"""
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(0.50),
+            'p90_ms': self.percentile(0.90),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max * 1000
+        }
+
+
+class Instrumentation:
+    """Collects per-statement and per-operation metrics"""
+    
+    def __init__(self, enabled: bool = False):
+        """Initialize instrumentation"""
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._normalized: Dict[str, str] = {}
+        self.reset()
+    
+    def enable(self):
+        """Start collecting metrics"""
+        self.enabled = True
+    
+    def disable(self):
+        """Stop collecting metrics (collected data is kept)"""
+        self.enabled = False
+    
+    def reset(self):
+        """Discard all collected metrics"""
+        with self._lock:
+            self.connections_opened = 0
+            self.statements: Dict[str, LatencyHistogram] = {}
+            self.operations: Dict[str, LatencyHistogram] = {}
+    
+    def record_connection(self):
+        """Count a newly opened database connection"""
+        with self._lock:
+            self.connections_opened += 1
+    
+    def record_statement(self, sql: str, seconds: float):
+        """Record one SQL statement execution"""
+        key = self._normalize(sql)
+        with self._lock:
+            histogram = self.statements.get(key)
+            if histogram is None:
+                histogram = self.statements[key] = LatencyHistogram()
+            histogram.record(seconds)
+    
+    def record_operation(self, name: str, seconds: float):
+        """Record one service operation"""
+        with self._lock:
+            histogram = self.operations.get(name)
+            if histogram is None:
+                histogram = self.operations[name] = LatencyHistogram()
+            histogram.record(seconds)
+    
+    def snapshot(self) -> dict:
+        """Get a copy of all metrics"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'connections_opened': self.connections_opened,
+                'statement_count': sum(h.count for h in self.statements.values()),
+                'statements': {sql: h.summary() for sql, h in self.statements.items()},
+                'operations': {name: h.summary() for name, h in self.operations.items()}
+            }
+    
+    def _normalize(self, sql: str) -> str:
+        """Collapse whitespace and IN (...) lists so similar statements share a bucket"""
+        normalized = self._normalized.get(sql)
+        if normalized is None:
+            normalized = re.sub(r"\s+", " ", sql).strip()
+            normalized = re.sub(r"IN \((\?, )*\?\)", "IN (...)", normalized)
+            if len(self._normalized) < 10000:
+                self._normalized[sql] = normalized
+        return normalized
+
+
+instrumentation = Instrumentation(enabled=os.environ.get("POS_INSTRUMENTATION", "") == "1")
+
+
+def instrumented(name: str):
+    """Decorator that records the latency of a service method under name"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                instrumentation.record_operation(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
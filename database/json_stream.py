@@ -0,0 +1,130 @@
+"""
+JSON Stream - Incrementally read the elements of a top-level JSON array or object
+"""
+import codecs
+import json
+from typing import Any, Iterator, Tuple
+
+WHITESPACE = " \t\n\r"
+
+
+class JsonStreamReader:
+    """
+    Yield the elements of a top-level JSON array (values) or object ((key, value) pairs)
+    without loading the whole file. After each element the reader reports the byte
+    offset just past it, which can be passed back as start_offset to resume there.
+    """
+    
+    def __init__(self, path: str, start_offset: int = 0, chunk_size: int = 1 << 20):
+        """Initialize stream reader"""
+        self.path = path
+        self.start_offset = start_offset
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+    
+    def __iter__(self) -> Iterator[Tuple[Any, int]]:
+        """Yield (element, byte_offset_after_element)"""
+        with open(self.path, 'rb') as f:
+            self._file = f
+            self._text = codecs.getincrementaldecoder('utf-8')()
+            self._eof = False
+            self._buf = ""
+            self._pos = 0  # parse position in _buf
+            self._mark = 0  # start of text in _buf not yet counted in _offset
+            self._offset = 0  # byte offset of _buf[_mark] in the file
+            
+            opening = self._next_char()
+            if opening not in ('[', '{'):
+                raise ValueError(f"{self.path}: expected a JSON array or object")
+            is_object = opening == '{'
+            first = True
+            
+            if self.start_offset > 0:
+                # Resume right after a previously reported element
+                f.seek(self.start_offset)
+                self._text.reset()
+                self._eof = False
+                self._buf = ""
+                self._pos = self._mark = 0
+                self._offset = self.start_offset
+                first = False
+            
+            while True:
+                if self._peek_char() in (']', '}'):
+                    return
+                if not first and self._next_char() != ',':
+                    raise ValueError(f"{self.path}: expected ',' at byte {self._byte_position()}")
+                first = False
+                
+                if is_object:
+                    key = self._decode_value()
+                    if self._next_char() != ':':
+                        raise ValueError(f"{self.path}: expected ':' at byte {self._byte_position()}")
+                    element = (key, self._decode_value())
+                else:
+                    element = self._decode_value()
+                yield element, self._consume()
+    
+    def _fill(self) -> bool:
+        """Read another chunk into the buffer, returns False at end of file"""
+        if self._eof:
+            return False
+        # Drop text that has already been counted so the buffer stays bounded
+        if self._mark:
+            self._buf = self._buf[self._mark:]
+            self._pos -= self._mark
+            self._mark = 0
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            self._buf += self._text.decode(b"", final=True)
+            return False
+        self._buf += self._text.decode(chunk)
+        return True
+    
+    def _skip_whitespace(self):
+        """Advance past whitespace, reading more data as needed"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._fill():
+                return
+    
+    def _peek_char(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        self._skip_whitespace()
+        if self._pos >= len(self._buf):
+            raise ValueError(f"{self.path}: unexpected end of file")
+        return self._buf[self._pos]
+    
+    def _next_char(self) -> str:
+        """Consume and return the next non-whitespace character"""
+        char = self._peek_char()
+        self._pos += 1
+        return char
+    
+    def _decode_value(self) -> Any:
+        """Decode one JSON value, reading more data until it is complete"""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+    
+    def _consume(self) -> int:
+        """Count parsed text towards the byte offset, returns the current byte offset"""
+        self._offset += len(self._buf[self._mark:self._pos].encode('utf-8'))
+        self._mark = self._pos
+        return self._offset
+    
+    def _byte_position(self) -> int:
+        """Byte offset of the current parse position (for error messages)"""
+        return self._offset + len(self._buf[self._mark:self._pos].encode('utf-8'))
@@ -1,103 +1,151 @@
 """
 Migration Script - Migrate data from JSON files to SQLite database
+
+Files are parsed incrementally and written in chunked transactions, so memory use
+stays bounded regardless of file size. Each chunk commits together with a
+checkpoint in the migration_checkpoints table; re-running the script after an
+interruption resumes right after the last committed chunk.
 """
-import json
 import os
+import time
+from typing import Callable, List
 from database.db_connection import DatabaseConnection
+from database.json_stream import JsonStreamReader
+from database.profiles import PROFILES
 from database.schema import create_tables
 from storage.product_storage import ProductStorage
 from storage.order_storage import OrderStorage
 from storage.inventory_storage import InventoryStorage
 from models.product import Product
+from models.order import Order
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def _get_checkpoint(db: DatabaseConnection, source: str):
+    """Get (byte_offset, records, completed) for a source file"""
+    row = db.fetch_one(
+        "SELECT byte_offset, records, completed FROM migration_checkpoints WHERE source = ?",
+        (source,)
+    )
+    if row is None:
+        return 0, 0, False
+    return row['byte_offset'], row['records'], bool(row['completed'])
 
 
-def migrate_products_from_json(json_path: str, product_storage: ProductStorage):
-    """Migrate products from JSON file"""
+def _save_checkpoint(db: DatabaseConnection, source: str, byte_offset: int, records: int,
+                     completed: bool = False):
+    """Record migration progress for a source file"""
+    db.execute(
+        """INSERT INTO migration_checkpoints (source, byte_offset, records, completed)
+           VALUES (?, ?, ?, ?)
+           ON CONFLICT(source) DO UPDATE SET byte_offset = excluded.byte_offset,
+               records = excluded.records, completed = excluded.completed""",
+        (source, byte_offset, records, int(completed))
+    )
+
+
+def _stream_migrate(db: DatabaseConnection, json_path: str, label: str,
+                    write_chunk: Callable[[List], int], chunk_size: int, restart: bool) -> int:
+    """
+    Stream elements from json_path and hand them to write_chunk in chunks.
+    Each chunk and its checkpoint commit in one transaction.
+    Returns number of records written in this run.
+    """
     if not os.path.exists(json_path):
-        print(f"Products JSON file not found: {json_path}")
+        print(f"{label} JSON file not found: {json_path}")
         return 0
     
+    source = os.path.abspath(json_path)
+    start_offset, records, completed = (0, 0, False) if restart else _get_checkpoint(db, source)
+    if completed:
+        print(f"{label}: already migrated ({records} records), skipping")
+        return 0
+    if start_offset:
+        print(f"{label}: resuming at byte {start_offset} after {records} records")
+    
+    file_size = os.path.getsize(json_path)
+    written = 0
+    chunk = []
+    offset = start_offset
+    started = time.perf_counter()
+    
+    def flush():
+        nonlocal written, records, chunk
+        with db.transaction():
+            written += write_chunk(chunk)
+            records += len(chunk)
+            _save_checkpoint(db, source, offset, records)
+        chunk = []
+        elapsed = time.perf_counter() - started
+        rate = written / elapsed if elapsed > 0 else 0.0
+        print(f"{label}: {records} records read, {written} written, "
+              f"{offset * 100 // max(file_size, 1)}% of file, {rate:,.0f} rows/s")
+    
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            products = [Product.from_dict(item) for item in data]
-            
-            count = 0
-            for product in products:
-                if product_storage.add(product):
-                    count += 1
-                else:
-                    print(f"Product {product.product_id} already exists, skipping...")
-            
-            print(f"Migrated {count} products from JSON")
-            return count
+        for element, offset in JsonStreamReader(json_path, start_offset):
+            chunk.append(element)
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
     except Exception as e:
-        print(f"Error migrating products: {e}")
-        return 0
+        print(f"Error migrating {label.lower()}: {e}")
+        print(f"Progress up to record {records} is saved; re-run to resume")
+        return written
+    
+    _save_checkpoint(db, source, offset, records, completed=True)
+    print(f"Migrated {written} {label.lower()} from JSON")
+    return written
 
 
-def migrate_orders_from_json(json_path: str, order_storage: OrderStorage):
-    """Migrate orders from JSON file"""
-    if not os.path.exists(json_path):
-        print(f"Orders JSON file not found: {json_path}")
-        return 0
+def migrate_products_from_json(json_path: str, product_storage: ProductStorage,
+                               chunk_size: int = DEFAULT_CHUNK_SIZE, restart: bool = False) -> int:
+    """Migrate products from JSON file (existing product IDs are skipped)"""
+    def write_chunk(items: List[dict]) -> int:
+        return product_storage.add_many([Product.from_dict(item) for item in items])
     
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-            # Get all products for order reconstruction
-            products = order_storage.product_storage.load_all()
-            products_dict = {p.product_id: p for p in products}
-            
-            from models.order import Order
-            orders = [Order.from_dict(item, products_dict) for item in data]
-            
-            count = 0
-            for order in orders:
-                if order_storage.add(order):
-                    count += 1
-                else:
-                    print(f"Order {order.order_id} already exists, skipping...")
-            
-            print(f"Migrated {count} orders from JSON")
-            return count
-    except Exception as e:
-        print(f"Error migrating orders: {e}")
-        return 0
+    return _stream_migrate(product_storage.db, json_path, "Products", write_chunk, chunk_size, restart)
 
 
-def migrate_inventory_from_json(json_path: str, inventory_storage: InventoryStorage):
-    """Migrate inventory from JSON file"""
-    if not os.path.exists(json_path):
-        print(f"Inventory JSON file not found: {json_path}")
-        return 0
+def migrate_orders_from_json(json_path: str, order_storage: OrderStorage,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE, restart: bool = False) -> int:
+    """Migrate orders from JSON file (existing order IDs are skipped, should run after products)"""
+    products = {}  # Identity map shared across chunks
     
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            inventory = json.load(f)
-            
-            count = 0
-            for product_id, quantity in inventory.items():
-                inventory_storage.set_quantity(product_id, quantity)
-                count += 1
-            
-            print(f"Migrated {count} inventory records from JSON")
-            return count
-    except Exception as e:
-        print(f"Error migrating inventory: {e}")
-        return 0
+    def write_chunk(items: List[dict]) -> int:
+        product_ids = {line['product_id'] for item in items for line in item['items']}
+        missing = product_ids - products.keys()
+        if missing:
+            products.update(order_storage.product_storage.get_many(missing))
+        return order_storage.add_many([Order.from_dict(item, products) for item in items])
+    
+    return _stream_migrate(order_storage.db, json_path, "Orders", write_chunk, chunk_size, restart)
+
+
+def migrate_inventory_from_json(json_path: str, inventory_storage: InventoryStorage,
+                                chunk_size: int = DEFAULT_CHUNK_SIZE, restart: bool = False) -> int:
+    """Migrate inventory from JSON file ({product_id: quantity})"""
+    def write_chunk(items: List[tuple]) -> int:
+        inventory_storage.set_many(dict(items))
+        return len(items)
+    
+    return _stream_migrate(inventory_storage.db, json_path, "Inventory records", write_chunk,
+                           chunk_size, restart)
 
 
-def migrate_all(json_data_dir: str = "data", db_path: str = "data/pos_system.db"):
+def migrate_all(json_data_dir: str = "data", db_path: str = "data/pos_system.db",
+                chunk_size: int = DEFAULT_CHUNK_SIZE, restart: bool = False,
+                profile: str = "bulk_import"):
     """Migrate all data from JSON files to database"""
     print("Starting migration from JSON to SQLite database...")
     print(f"Database path: {db_path}")
     print(f"JSON data directory: {json_data_dir}")
+    print(f"Database profile: {profile}")
     print("-" * 60)
     
     # Initialize database
-    db = DatabaseConnection(db_path)
+    db = DatabaseConnection(db_path, profile=profile)
     create_tables(db)
     print("Database tables created/verified")
     
@@ -108,15 +156,15 @@ def migrate_all(json_data_dir: str = "data", db_path: str = "data/pos_system.db"
     
     # Migrate products
     products_json = os.path.join(json_data_dir, "products.json")
-    product_count = migrate_products_from_json(products_json, product_storage)
+    product_count = migrate_products_from_json(products_json, product_storage, chunk_size, restart)
     
     # Migrate inventory
     inventory_json = os.path.join(json_data_dir, "inventory.json")
-    inventory_count = migrate_inventory_from_json(inventory_json, inventory_storage)
+    inventory_count = migrate_inventory_from_json(inventory_json, inventory_storage, chunk_size, restart)
     
     # Migrate orders (should be done after products)
     orders_json = os.path.join(json_data_dir, "orders.json")
-    order_count = migrate_orders_from_json(orders_json, order_storage)
+    order_count = migrate_orders_from_json(orders_json, order_storage, chunk_size, restart)
     
     print("-" * 60)
     print("Migration completed!")
@@ -127,9 +175,17 @@ def migrate_all(json_data_dir: str = "data", db_path: str = "data/pos_system.db"
 
 
 if __name__ == "__main__":
-    import sys
+    import argparse
     
-    json_dir = sys.argv[1] if len(sys.argv) > 1 else "data"
-    db_path = sys.argv[2] if len(sys.argv) > 2 else "data/pos_system.db"
+    parser = argparse.ArgumentParser(description="Migrate JSON data files into the SQLite database")
+    parser.add_argument("json_dir", nargs="?", default="data")
+    parser.add_argument("db_path", nargs="?", default="data/pos_system.db")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="records per transaction")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore saved checkpoints and start from the beginning")
+    parser.add_argument("--profile", default="bulk_import", choices=sorted(PROFILES),
+                        help="SQLite performance profile")
+    args = parser.parse_args()
     
-    migrate_all(json_dir, db_path)
+    migrate_all(args.json_dir, args.db_path, args.chunk_size, args.restart, args.profile)
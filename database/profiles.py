@@ -0,0 +1,65 @@
+"""
+Performance Profiles - Named SQLite connection settings for different workloads
+
+Select a profile by name when creating a DatabaseConnection, or set the
+POS_DB_PROFILE environment variable (lane, backoffice or bulk_import).
+"""
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Union
+
+
+@dataclass(frozen=True)
+class PerformanceProfile:
+    """PRAGMA settings applied to every new connection"""
+    name: str
+    journal_mode: str = "WAL"  # WAL lets readers and the writer run concurrently
+    synchronous: str = "NORMAL"  # NORMAL is crash-safe under WAL; FULL also survives power loss
+    cache_size_kib: int = 16384  # Page cache per connection
+    mmap_size: int = 64 * 1024 * 1024  # Bytes of the file read through memory mapping (0 disables)
+    temp_store: str = "MEMORY"  # Where sorts and temporary indexes live
+    busy_timeout_ms: int = 5000  # How long a writer waits for the lock before "database is locked"
+    
+    def apply(self, conn: sqlite3.Connection):
+        """Apply the settings to an open connection"""
+        # Busy timeout first so switching the journal mode waits out other connections
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA temp_store = {self.temp_store}")
+
+
+PROFILES: Dict[str, PerformanceProfile] = {
+    # Checkout terminals: short transactions, low latency, modest memory
+    'lane': PerformanceProfile('lane'),
+    # Reports and back-office screens: large scans and sorts
+    'backoffice': PerformanceProfile(
+        'backoffice', cache_size_kib=65536, mmap_size=256 * 1024 * 1024, busy_timeout_ms=30000
+    ),
+    # One-off imports: throughput over durability, rerun the import after a crash
+    'bulk_import': PerformanceProfile(
+        'bulk_import', synchronous="OFF", cache_size_kib=262144,
+        mmap_size=256 * 1024 * 1024, busy_timeout_ms=60000
+    ),
+}
+
+DEFAULT_PROFILE = 'lane'
+
+
+def get_profile(profile: Union[str, PerformanceProfile, None] = None) -> PerformanceProfile:
+    """
+    Resolve a profile by name.
+    None selects POS_DB_PROFILE from the environment, falling back to 'lane'.
+    """
+    if isinstance(profile, PerformanceProfile):
+        return profile
+    name = profile or os.environ.get("POS_DB_PROFILE") or DEFAULT_PROFILE
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown database profile '{name}', expected one of: {', '.join(PROFILES)}"
+        ) from None
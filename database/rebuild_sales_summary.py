@@ -0,0 +1,28 @@
+"""
+Rebuild Sales Summary - Recompute the daily sales summary from orders and returns
+
+Usage: python -m database.rebuild_sales_summary [DB_PATH]
+"""
+import argparse
+import time
+from database.db_connection import DatabaseConnection
+from database.schema import create_tables, rebuild_sales_summary
+
+
+def main():
+    """Rebuild sales summary"""
+    parser = argparse.ArgumentParser(description="Rebuild the daily sales summary tables")
+    parser.add_argument("db_path", nargs="?", default="data/pos_system.db")
+    args = parser.parse_args()
+    
+    db = DatabaseConnection(args.db_path, profile="bulk_import")
+    create_tables(db)
+    started = time.perf_counter()
+    rebuild_sales_summary(db)
+    rows = db.fetch_one("SELECT COUNT(*) FROM sales_summary")[0]
+    db.close()
+    print(f"Rebuilt sales summary ({rows} rows) in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Register Report - Print an X report, or close the day with a Z report
+
+Usage: python -m database.register_report [x|z] [--day YYYY-MM-DD] [--db DB_PATH] [--dir REPORT_DIR]
+
+--day defaults to today for an X report and to yesterday for a Z report.
+"""
+import argparse
+import time
+from database.db_connection import DatabaseConnection
+from database.schema import create_tables
+from services.register_report_service import RegisterReportService
+
+
+def main():
+    """Build a register report and write it to a file"""
+    parser = argparse.ArgumentParser(description="X (mid-day) or Z (end-of-day) register report")
+    parser.add_argument("kind", nargs="?", choices=["x", "z"], default="x")
+    parser.add_argument("--day", help="business day (default today for x, yesterday for z)")
+    parser.add_argument("--db", default="data/pos_system.db")
+    parser.add_argument("--dir", default="data/reports", help="directory for report files")
+    args = parser.parse_args()
+    
+    db = DatabaseConnection(args.db, profile="backoffice")
+    create_tables(db)
+    service = RegisterReportService(db, args.dir)
+    started = time.perf_counter()
+    try:
+        report = service.z_report(args.day) if args.kind == "z" else service.x_report(args.day)
+    except ValueError as e:
+        print(f"Error: {e}")
+        raise SystemExit(1)
+    finally:
+        db.close()
+    print(service.render(report), end="")
+    print(f"Written to {report['path']} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
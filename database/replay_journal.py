@@ -0,0 +1,32 @@
+"""
+Replay Order Journal - Write sales still pending in an order journal to the database
+
+Usage: python -m database.replay_journal JOURNAL_PATH [DB_PATH]
+"""
+import argparse
+import time
+from services.app_context import AppContext
+from services.order_journal import OrderJournal
+
+
+def main():
+    """Replay order journal"""
+    parser = argparse.ArgumentParser(description="Replay pending sales from an order journal")
+    parser.add_argument("journal_path")
+    parser.add_argument("db_path", nargs="?", default="data/pos_system.db")
+    args = parser.parse_args()
+    
+    context = AppContext(args.db_path, preload_index=False)
+    journal = OrderJournal(args.journal_path, context.order_storage, context.inventory_service)
+    started = time.perf_counter()
+    written = journal.replay()
+    journal.close()
+    context.close()
+    print(f"Replayed {written} sales in {time.perf_counter() - started:.2f}s "
+          f"({journal.oversold} lines exceeded recorded stock)")
+    if journal.rejected:
+        print(f"{journal.rejected} unreadable sales moved to {args.journal_path}.rejected: {journal.last_error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,12 @@
 """
 Database Schema - SQL table definitions
 """
+import sqlite3
 from .db_connection import DatabaseConnection
 
 
-def create_tables(db: DatabaseConnection):
-    """Create all database tables"""
+def _create_base_tables(db: DatabaseConnection):
+    """Version 1: products, orders, order items and inventory"""
     
     # Products table
     db.execute("""
@@ -59,6 +60,438 @@ def create_tables(db: DatabaseConnection):
     db.execute("CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders(created_at)")
 
 
+def _create_order_query_indexes(db: DatabaseConnection):
+    """Version 2: composite indexes for keyset-paginated order queries"""
+    db.execute("CREATE INDEX IF NOT EXISTS idx_orders_created_at_order_id ON orders(created_at, order_id)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_orders_status_created_at ON orders(status, created_at, order_id)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_orders_payment_status_created_at ON orders(payment_status, created_at, order_id)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_orders_payment_method_created_at ON orders(payment_method, created_at, order_id)")
+
+
+def _create_catalog_version(db: DatabaseConnection):
+    """
+    Version 3: catalog version counter, bumped by triggers so caches on other
+    connections and terminals can detect product changes
+    """
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    db.execute("INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_products_{event.lower()}_version
+            AFTER {event} ON products
+            BEGIN
+                UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+            END
+        """)
+
+
+def _create_migration_checkpoints(db: DatabaseConnection):
+    """Version 5: progress of resumable JSON imports"""
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS migration_checkpoints (
+            source TEXT PRIMARY KEY,
+            byte_offset INTEGER NOT NULL DEFAULT 0,
+            records INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def _create_returns_ledger(db: DatabaseConnection):
+    """
+    Version 6: append-only ledger of returns and their lines.
+    Earlier returns only changed orders.status, so orders already partial_returned
+    get no ledger rows; ReturnService refuses further returns on them.
+    """
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS returns (
+            return_id TEXT PRIMARY KEY,
+            order_id TEXT NOT NULL,
+            return_amount REAL NOT NULL,
+            reason TEXT,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (order_id) REFERENCES orders(order_id)
+        )
+    """)
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS return_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            return_id TEXT NOT NULL,
+            order_id TEXT NOT NULL,
+            product_id TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            unit_price REAL NOT NULL,
+            FOREIGN KEY (return_id) REFERENCES returns(return_id),
+            FOREIGN KEY (order_id) REFERENCES orders(order_id)
+        )
+    """)
+    db.execute("CREATE INDEX IF NOT EXISTS idx_returns_order_id ON returns(order_id)")
+    # Covers the per-product SUM(quantity) behind returnable quantities
+    db.execute("""CREATE INDEX IF NOT EXISTS idx_return_items_order_product
+                  ON return_items(order_id, product_id, quantity)""")
+
+
+def _use_integer_order_keys(db: DatabaseConnection):
+    """
+    Version 7: integer surrogate key for orders. orders is rebuilt around an
+    INTEGER PRIMARY KEY (order_key, assigned in creation order) with order_id
+    kept as a unique column, and order_items references order_key instead of
+    repeating the text order_id in every line.
+    """
+    columns = {row['name'] for row in db.fetch_all("PRAGMA table_info(order_items)")}
+    if 'order_key' in columns:
+        return
+    
+    db.execute("""
+        CREATE TABLE orders_new (
+            order_key INTEGER PRIMARY KEY,
+            order_id TEXT NOT NULL UNIQUE,
+            total_amount REAL NOT NULL,
+            payment_method TEXT NOT NULL,
+            payment_status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            status TEXT NOT NULL
+        )
+    """)
+    db.execute("""
+        INSERT INTO orders_new (order_id, total_amount, payment_method,
+                                payment_status, created_at, status)
+        SELECT order_id, total_amount, payment_method, payment_status, created_at, status
+        FROM orders ORDER BY created_at, order_id
+    """)
+    db.execute("""
+        CREATE TABLE order_items_new (
+            id INTEGER PRIMARY KEY,
+            order_key INTEGER NOT NULL,
+            product_id TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            unit_price REAL NOT NULL,
+            FOREIGN KEY (order_key) REFERENCES orders(order_key) ON DELETE CASCADE,
+            FOREIGN KEY (product_id) REFERENCES products(product_id)
+        )
+    """)
+    db.execute("""
+        INSERT INTO order_items_new (id, order_key, product_id, quantity, unit_price)
+        SELECT oi.id, o.order_key, oi.product_id, oi.quantity, oi.unit_price
+        FROM order_items oi JOIN orders_new o ON o.order_id = oi.order_id
+        ORDER BY oi.id
+    """)
+    db.execute("DROP TABLE order_items")
+    db.execute("DROP TABLE orders")
+    db.execute("ALTER TABLE orders_new RENAME TO orders")
+    db.execute("ALTER TABLE order_items_new RENAME TO order_items")
+    
+    db.execute("CREATE INDEX IF NOT EXISTS idx_order_items_order_key ON order_items(order_key)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_order_items_product_id ON order_items(product_id)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders(created_at)")
+    _create_order_query_indexes(db)
+
+
+# Sales lines of the selected orders; {where} filters on o.order_key
+SUMMARY_ORDER_LINES = """
+    SELECT o.order_key, substr(o.created_at, 1, 10) AS day, o.payment_method,
+           oi.product_id, COALESCE(p.category, '') AS category,
+           COALESCE(oi.quantity, 0) AS quantity,
+           COALESCE(oi.quantity * oi.unit_price, 0) AS amount
+    FROM orders o
+    LEFT JOIN order_items oi ON oi.order_key = o.order_key
+    LEFT JOIN products p ON p.product_id = oi.product_id
+    WHERE {where}
+"""
+
+# Returned lines of the selected returns, dated by the return; {where} filters on r.return_id
+SUMMARY_RETURN_LINES = """
+    SELECT r.return_id, substr(r.created_at, 1, 10) AS day, o.payment_method,
+           ri.product_id, COALESCE(p.category, '') AS category,
+           ri.quantity, ri.quantity * ri.unit_price AS amount
+    FROM returns r
+    JOIN return_items ri ON ri.return_id = r.return_id
+    LEFT JOIN orders o ON o.order_id = r.order_id
+    LEFT JOIN products p ON p.product_id = ri.product_id
+    WHERE {where}
+"""
+
+
+def summary_upsert(lines: str, count_column: str, columns: tuple) -> str:
+    """
+    Build one statement that folds a set of lines into every dimension.
+    columns are the (count, units, amount) summary columns the lines add to;
+    each value is multiplied by the :sign parameter (+1 to add, -1 to take back).
+    """
+    count, units, amount = columns
+    selects = " UNION ALL ".join(
+        f"""SELECT day, '{dimension}', {key}, COUNT(DISTINCT {count_column}) * :sign,
+                   SUM(quantity) * :sign, SUM(amount) * :sign
+            FROM lines {'WHERE product_id IS NOT NULL' if dimension in ('category', 'product') else ''}
+            GROUP BY day, {key}"""
+        for dimension, key in (('total', "''"), ('payment_method', 'payment_method'),
+                               ('category', 'category'), ('product', 'product_id'))
+    )
+    return f"""
+        WITH lines AS ({lines})
+        INSERT INTO sales_summary (day, dimension, key, {count}, {units}, {amount})
+        {selects}
+        ON CONFLICT (day, dimension, key) DO UPDATE SET
+            {count} = {count} + excluded.{count},
+            {units} = {units} + excluded.{units},
+            {amount} = {amount} + excluded.{amount}
+    """
+
+
+SUMMARY_ORDER_COLUMNS = ('orders', 'units', 'revenue')
+SUMMARY_RETURN_COLUMNS = ('returns', 'returned_units', 'refunds')
+
+
+def _fill_sales_summary(db: DatabaseConnection):
+    """Replace the rows of sales_summary with totals recomputed from orders and returns"""
+    db.execute("DELETE FROM sales_summary")
+    db.execute(summary_upsert(SUMMARY_ORDER_LINES.format(where="1"), 'order_key', SUMMARY_ORDER_COLUMNS),
+               {'sign': 1})
+    db.execute(summary_upsert(SUMMARY_RETURN_LINES.format(where="1"), 'return_id', SUMMARY_RETURN_COLUMNS),
+               {'sign': 1})
+
+
+def rebuild_sales_summary(db: DatabaseConnection):
+    """Recompute the whole sales_summary table from orders and returns (and product_demand from it)"""
+    with db.transaction():
+        # Row-by-row trigger upkeep of product_demand would cost far more than refilling it once
+        _drop_product_demand_triggers(db)
+        _fill_sales_summary(db)
+        rebuild_product_demand(db)
+
+
+# Net units of a sales_summary row (sales less returns that day)
+_NET = "({row}.units - {row}.returned_units)"
+
+
+def _drop_product_demand_triggers(db: DatabaseConnection):
+    """Stop keeping product_demand in step with sales_summary"""
+    for event in ('insert', 'update', 'delete'):
+        db.execute(f"DROP TRIGGER IF EXISTS trg_sales_summary_demand_{event}")
+
+
+def rebuild_product_demand(db: DatabaseConnection):
+    """
+    Recompute product_demand from the per-product rows of sales_summary and
+    (re)create the triggers that keep it up to date from then on
+    """
+    with db.transaction():
+        _drop_product_demand_triggers(db)
+        db.execute("DELETE FROM product_demand")
+        db.execute(f"""
+            INSERT INTO product_demand (product_id, day, units, squares)
+            SELECT key, day, SUM({_NET.format(row='s')}) OVER running,
+                   SUM({_NET.format(row='s')} * {_NET.format(row='s')}) OVER running
+            FROM sales_summary s
+            WHERE dimension = 'product'
+            WINDOW running AS (PARTITION BY key ORDER BY day)
+        """)
+        new_net, old_net = _NET.format(row='new'), _NET.format(row='old')
+        # A new day starts from the running totals of the product's previous day
+        db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_sales_summary_demand_insert
+            AFTER INSERT ON sales_summary WHEN new.dimension = 'product'
+            BEGIN
+                INSERT OR IGNORE INTO product_demand (product_id, day, units, squares)
+                VALUES (new.key, new.day,
+                        COALESCE((SELECT units FROM product_demand WHERE product_id = new.key
+                                  AND day < new.day ORDER BY day DESC LIMIT 1), 0),
+                        COALESCE((SELECT squares FROM product_demand WHERE product_id = new.key
+                                  AND day < new.day ORDER BY day DESC LIMIT 1), 0));
+                UPDATE product_demand
+                SET units = units + {new_net}, squares = squares + {new_net} * {new_net}
+                WHERE product_id = new.key AND day >= new.day;
+            END
+        """)
+        db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_sales_summary_demand_update
+            AFTER UPDATE OF units, returned_units ON sales_summary
+            WHEN new.dimension = 'product' AND {new_net} <> {old_net}
+            BEGIN
+                UPDATE product_demand
+                SET units = units + {new_net} - {old_net},
+                    squares = squares + {new_net} * {new_net} - {old_net} * {old_net}
+                WHERE product_id = new.key AND day >= new.day;
+            END
+        """)
+        db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_sales_summary_demand_delete
+            AFTER DELETE ON sales_summary WHEN old.dimension = 'product'
+            BEGIN
+                DELETE FROM product_demand WHERE product_id = old.key AND day = old.day;
+                UPDATE product_demand
+                SET units = units - {old_net}, squares = squares - {old_net} * {old_net}
+                WHERE product_id = old.key AND day > old.day;
+            END
+        """)
+
+
+def _create_sales_summary(db: DatabaseConnection):
+    """
+    Version 8: per-day sales totals kept up to date by every order and return.
+    Existing history is summarized once here; afterwards rows are only adjusted.
+    """
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS sales_summary (
+            day TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            orders INTEGER NOT NULL DEFAULT 0,
+            units INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            returns INTEGER NOT NULL DEFAULT 0,
+            returned_units INTEGER NOT NULL DEFAULT 0,
+            refunds REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, dimension, key)
+        ) WITHOUT ROWID
+    """)
+    _fill_sales_summary(db)
+
+
+def _create_register_reports(db: DatabaseConnection):
+    """
+    Version 9: amount tendered per order (for change given), numbered Z-report
+    closings, and a created_at index for reading one day's returns
+    """
+    columns = {row['name'] for row in db.fetch_all("PRAGMA table_info(orders)")}
+    if 'paid_amount' not in columns:
+        db.execute("ALTER TABLE orders ADD COLUMN paid_amount REAL NOT NULL DEFAULT 0")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS z_reports (
+            z_number INTEGER PRIMARY KEY,
+            day TEXT NOT NULL UNIQUE,
+            generated_at TEXT NOT NULL,
+            orders INTEGER NOT NULL,
+            net_sales REAL NOT NULL,
+            report_path TEXT
+        )
+    """)
+    db.execute("CREATE INDEX IF NOT EXISTS idx_returns_created_at ON returns(created_at)")
+
+
+def _create_product_demand(db: DatabaseConnection):
+    """
+    Version 10: running per-product totals of net units sold (units less returned
+    units) and of their daily squares, kept by triggers on sales_summary. The
+    demand over any range of days is the difference of two rows per product, so
+    reorder planning costs the same for a week as for a year.
+    """
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS product_demand (
+            product_id TEXT NOT NULL,
+            day TEXT NOT NULL,
+            units INTEGER NOT NULL,
+            squares INTEGER NOT NULL,
+            PRIMARY KEY (product_id, day)
+        ) WITHOUT ROWID
+    """)
+    rebuild_product_demand(db)
+
+
+def create_product_search_index(db: DatabaseConnection) -> bool:
+    """
+    Create the FTS5 product search index and the triggers that keep it in sync.
+    Returns False if this SQLite build has no FTS5 (search falls back to LIKE).
+    """
+    exists = db.fetch_one(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+    )
+    if exists:
+        return True
+    
+    try:
+        db.execute("""
+            CREATE VIRTUAL TABLE products_fts USING fts5(
+                name, category,
+                content='products', content_rowid='rowid',
+                prefix='2 3'
+            )
+        """)
+    except sqlite3.OperationalError:
+        return False
+    
+    db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_insert AFTER INSERT ON products
+        BEGIN
+            INSERT INTO products_fts (rowid, name, category)
+            VALUES (new.rowid, new.name, new.category);
+        END
+    """)
+    db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_delete AFTER DELETE ON products
+        BEGIN
+            INSERT INTO products_fts (products_fts, rowid, name, category)
+            VALUES ('delete', old.rowid, old.name, old.category);
+        END
+    """)
+    db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_update AFTER UPDATE ON products
+        BEGIN
+            INSERT INTO products_fts (products_fts, rowid, name, category)
+            VALUES ('delete', old.rowid, old.name, old.category);
+            INSERT INTO products_fts (rowid, name, category)
+            VALUES (new.rowid, new.name, new.category);
+        END
+    """)
+    # Index products that existed before the search index was added
+    db.execute("INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+    return True
+
+
+# Ordered schema migrations; a database at version N has had the first N applied.
+# Append new migrations to the end, never reorder or edit released ones.
+MIGRATIONS = [
+    _create_base_tables,
+    _create_order_query_indexes,
+    _create_catalog_version,
+    create_product_search_index,
+    _create_migration_checkpoints,
+    _create_returns_ledger,
+    _use_integer_order_keys,
+    _create_sales_summary,
+    _create_register_reports,
+    _create_product_demand,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(db: DatabaseConnection) -> int:
+    """Get the schema version stored in PRAGMA user_version"""
+    return db.fetch_one("PRAGMA user_version")[0]
+
+
+def create_tables(db: DatabaseConnection) -> int:
+    """
+    Bring the database schema up to date.
+    An up-to-date database costs a single PRAGMA read; otherwise each pending
+    migration runs in its own transaction together with the version bump, after
+    re-reading the version under the write lock.
+    Databases created before versioning (version 0 with existing tables) are
+    safe to upgrade because every migration is idempotent.
+    Returns the number of migrations applied.
+    """
+    version = get_schema_version(db)
+    if version >= SCHEMA_VERSION:
+        return 0
+    
+    applied = 0
+    for number in range(version + 1, SCHEMA_VERSION + 1):
+        with db.transaction():
+            # Another process starting at the same time may have applied this step already
+            if get_schema_version(db) >= number:
+                continue
+            MIGRATIONS[number - 1](db)
+            db.execute(f"PRAGMA user_version = {number}")
+            applied += 1
+    return applied
+
+
 def init_database(db_path: str = "data/pos_system.db"):
     """Initialize database with tables"""
     db = DatabaseConnection(db_path)
@@ -1,26 +1,20 @@
 """
 POS System - Main Entry Point
+
+UI modules are imported on first use so a terminal reaches the main menu
+without loading screens it may never open.
 """
-from ui.checkout_ui import CheckoutUI
-from ui.return_ui import ReturnUI
-from ui.inventory_ui import InventoryUI
-from storage.product_storage import ProductStorage
-from storage.inventory_storage import InventoryStorage
+import os
+from services.app_context import AppContext
 
 
-def initialize_sample_data():
+def initialize_sample_data(context: AppContext):
     """Initialize sample products and inventory for testing"""
-    from database.schema import init_database
-    
-    # Initialize database
-    init_database()
-    
-    product_storage = ProductStorage()
-    inventory_storage = InventoryStorage()
+    product_storage = context.product_storage
+    inventory_storage = context.inventory_storage
     
     # Check if products already exist
-    existing_products = product_storage.load_all()
-    if len(existing_products) > 0:
+    if not product_storage.is_empty():
         return  # Data already exists
     
     # Sample products
@@ -53,52 +47,65 @@ def show_main_menu():
     print("1. Checkout")
     print("2. Return")
     print("3. View Inventory")
-    print("4. Exit")
+    print("4. Statistics")
+    print("5. Register Report")
+    print("6. Exit")
     print("="*60)
 
 
+def _build_ui(choice: str, context: AppContext):
+    """Import and construct the screen for a menu choice"""
+    if choice == '1':
+        from ui.checkout_ui import CheckoutUI
+        return CheckoutUI(context.checkout_service)
+    if choice == '2':
+        from ui.return_ui import ReturnUI
+        return ReturnUI(context.return_service)
+    if choice == '3':
+        from ui.inventory_ui import InventoryUI
+        return InventoryUI(context.inventory_service, context.product_storage, context.reorder_service)
+    if choice == '5':
+        from ui.report_ui import ReportUI
+        return ReportUI(context.register_report_service)
+    from ui.stats_ui import StatsUI
+    return StatsUI()
+
+
 def main():
     """Main function"""
+    # Open the database and build shared services once
+    # POS_ORDER_JOURNAL turns on write-behind sales (the lane keeps selling if the database is down)
+    # POS_TERMINAL_ID (0-999) keeps order IDs of lanes sharing one database apart
+    terminal_id = os.environ.get("POS_TERMINAL_ID")
+    context = AppContext(os.environ.get("POS_DB_PATH", "data/pos_system.db"),
+                         journal_path=os.environ.get("POS_ORDER_JOURNAL"),
+                         terminal_id=int(terminal_id) if terminal_id else None)
+    
     # Initialize sample data
     try:
-        initialize_sample_data()
+        initialize_sample_data(context)
     except Exception as e:
         print(f"Error initializing data: {e}")
     
-    checkout_ui = CheckoutUI()
-    return_ui = ReturnUI()
-    inventory_ui = InventoryUI()
+    screens = {}
     
     while True:
         show_main_menu()
-        choice = input("Please select an option (1-4): ").strip()
-        
-        if choice == '1':
-            try:
-                checkout_ui.run()
-            except KeyboardInterrupt:
-                print("\n\nOperation cancelled")
-            except Exception as e:
-                print(f"\nError occurred: {e}")
-        
-        elif choice == '2':
-            try:
-                return_ui.run()
-            except KeyboardInterrupt:
-                print("\n\nOperation cancelled")
-            except Exception as e:
-                print(f"\nError occurred: {e}")
+        choice = input("Please select an option (1-6): ").strip()
         
-        elif choice == '3':
+        if choice in ('1', '2', '3', '4', '5'):
             try:
-                inventory_ui.run()
+                if choice not in screens:
+                    screens[choice] = _build_ui(choice, context)
+                screens[choice].run()
             except KeyboardInterrupt:
                 print("\n\nOperation cancelled")
             except Exception as e:
                 print(f"\nError occurred: {e}")
         
-        elif choice == '4':
+        elif choice == '6':
             print("\nThank you for using POS System. Goodbye!")
+            context.close()
             break
         
         else:
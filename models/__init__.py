@@ -4,6 +4,7 @@ Data Models Module
 from .product import Product
 from .order import Order
 from .order_item import OrderItem
+from .cart import Cart
 
-__all__ = ['Product', 'Order', 'OrderItem']
+__all__ = ['Product', 'Order', 'OrderItem', 'Cart']
 
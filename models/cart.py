@@ -0,0 +1,93 @@
+"""
+Cart Model - Open order with constant-time line edits
+"""
+from fractions import Fraction
+from typing import Dict, Iterator, Optional
+from .order import Order
+from .order_item import OrderItem
+from .product import Product
+
+
+class Cart:
+    """
+    Lines of an open order indexed by product_id.
+    Lines keep scan order and the total is maintained incrementally (exactly,
+    so repeated edits never drift). The Order handed to storage and receipts is materialized on demand.
+    """
+    
+    def __init__(self, order: Order):
+        """Initialize cart for an order (existing order lines are indexed)"""
+        self.order = order
+        self._lines: Dict[str, OrderItem] = {}
+        self._total = Fraction(0)
+        self._dirty = False
+        for item in order.items:
+            self.add(item.product, item.quantity, item.unit_price)
+    
+    def get(self, product_id: str) -> Optional[OrderItem]:
+        """Get the line for a product"""
+        return self._lines.get(product_id)
+    
+    def quantity(self, product_id: str) -> int:
+        """Quantity of a product in the cart (0 if absent)"""
+        item = self._lines.get(product_id)
+        return item.quantity if item is not None else 0
+    
+    def add(self, product: Product, quantity: int, unit_price: float = None) -> OrderItem:
+        """Add quantity to a product's line, creating the line if needed"""
+        item = self._lines.get(product.product_id)
+        if item is None:
+            item = OrderItem(
+                product=product,
+                quantity=quantity,
+                unit_price=product.price if unit_price is None else unit_price
+            )
+            self._lines[product.product_id] = item
+            self._dirty = True
+        else:
+            item.quantity += quantity
+        self._total += Fraction(item.unit_price) * quantity
+        return item
+    
+    def set_quantity(self, product_id: str, quantity: int) -> bool:
+        """Set a line's quantity, returns False if the product is not in the cart"""
+        item = self._lines.get(product_id)
+        if item is None:
+            return False
+        self._total += Fraction(item.unit_price) * (quantity - item.quantity)
+        item.quantity = quantity
+        return True
+    
+    def remove(self, product_id: str) -> bool:
+        """Remove a line, returns False if the product is not in the cart"""
+        item = self._lines.pop(product_id, None)
+        if item is None:
+            return False
+        self._total -= Fraction(item.unit_price) * item.quantity
+        self._dirty = True
+        return True
+    
+    @property
+    def total(self) -> float:
+        """Current total"""
+        return float(self._total)
+    
+    def to_order(self) -> Order:
+        """Get the order with its items and total brought up to date"""
+        if self._dirty:
+            self.order.items = list(self._lines.values())
+            self._dirty = False
+        self.order.total_amount = self.total
+        return self.order
+    
+    def __len__(self) -> int:
+        """Number of lines"""
+        return len(self._lines)
+    
+    def __iter__(self) -> Iterator[OrderItem]:
+        """Iterate lines in scan order"""
+        return iter(self._lines.values())
+    
+    def __contains__(self, product_id: str) -> bool:
+        """Check whether a product has a line in the cart"""
+        return product_id in self._lines
@@ -17,6 +17,7 @@ class Order:
     payment_status: str = "pending"  # Payment status (pending, paid, refunded)
     created_at: str = ""  # Creation time
     status: str = "completed"  # Order status (completed, returned, partial_returned)
+    paid_amount: float = 0.0  # Amount tendered (0 if not recorded)
     
     def __post_init__(self):
         """Initialize creation time if not provided"""
@@ -37,7 +38,8 @@ class Order:
             'payment_method': self.payment_method,
             'payment_status': self.payment_status,
             'created_at': self.created_at,
-            'status': self.status
+            'status': self.status,
+            'paid_amount': self.paid_amount
         }
     
     @classmethod
@@ -60,7 +62,8 @@ class Order:
             payment_method=data['payment_method'],
             payment_status=data['payment_status'],
             created_at=data['created_at'],
-            status=data['status']
+            status=data['status'],
+            paid_amount=data.get('paid_amount', 0.0)
         )
         return order
 
@@ -0,0 +1,7 @@
+"""
+Server Module
+"""
+from .sessions import TerminalSession, TerminalSessions
+from .http_server import POSHTTPServer, POSRequestHandler
+
+__all__ = ['TerminalSession', 'TerminalSessions', 'POSHTTPServer', 'POSRequestHandler']
@@ -0,0 +1,6 @@
+"""
+Run the headless POS server: python -m server
+"""
+from server.http_server import main
+
+main()
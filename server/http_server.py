@@ -0,0 +1,398 @@
+"""
+POS HTTP Server - Headless JSON API for many terminals against one store database
+
+Usage: python -m server [--host H] [--port N] [--db PATH] [--pool-size N]
+
+Endpoints (request and response bodies are JSON):
+  GET    /health                             server status
+  GET    /terminals/{tid}/order              the terminal's open cart
+  POST   /terminals/{tid}/order              start a new cart
+  DELETE /terminals/{tid}/order              cancel the cart
+  POST   /terminals/{tid}/items              scan {"code": ID or barcode, "quantity": n}
+  PUT    /terminals/{tid}/items/{product_id} set {"quantity": n} (0 removes the line)
+  DELETE /terminals/{tid}/items/{product_id} remove a line
+  POST   /terminals/{tid}/payment            pay {"method": "cash", "paid_amount": x}
+  GET    /orders/{order_id}                  order with returnable quantities
+  POST   /orders/{order_id}/returns          return {"items": {product_id: n}, "reason": ""}
+  GET    /inventory?after=ID&limit=N         one page of the inventory report
+  GET    /inventory/summary                  catalog-wide stock counts
+  GET    /inventory/{product_id}             stock for one product
+  GET    /products/search?q=TEXT&limit=N     product search
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from models.order import Order
+from services.app_context import AppContext
+from server.sessions import TerminalSessions
+from services.order_id_generator import TerminalIdsExhaustedError
+
+
+class HTTPError(Exception):
+    """Error with an HTTP status, reported to the client as JSON"""
+    
+    def __init__(self, status: int, message: str):
+        """Initialize error"""
+        super().__init__(message)
+        self.status = status
+
+
+class POSHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the shared application context and terminal sessions"""
+    
+    daemon_threads = True
+    
+    def __init__(self, address: Tuple[str, int], context: AppContext, idle_timeout: float = 1800.0):
+        """Initialize server"""
+        super().__init__(address, POSRequestHandler)
+        self.context = context
+        self.sessions = TerminalSessions(context, idle_timeout)
+        # Payments and returns are serialized in-process, so concurrent lanes queue
+        # here instead of spinning on SQLite's busy timeout
+        self.write_lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+    
+    def count_request(self):
+        """Count one request (handler threads run concurrently)"""
+        with self._requests_lock:
+            self.requests += 1
+
+
+class POSRequestHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the checkout, return and inventory services"""
+    
+    protocol_version = "HTTP/1.1"  # Keep-alive so a lane reuses one connection
+    disable_nagle_algorithm = True  # Headers and body are separate writes; don't wait for the ACK
+    server: POSHTTPServer
+    
+    ROUTES: List[Tuple[str, str, str]] = [
+        ('GET', r'/health', 'health'),
+        ('GET', r'/terminals/([^/]+)/order', 'get_order'),
+        ('POST', r'/terminals/([^/]+)/order', 'start_order'),
+        ('DELETE', r'/terminals/([^/]+)/order', 'cancel_order'),
+        ('POST', r'/terminals/([^/]+)/items', 'add_item'),
+        ('PUT', r'/terminals/([^/]+)/items/([^/]+)', 'update_item'),
+        ('DELETE', r'/terminals/([^/]+)/items/([^/]+)', 'remove_item'),
+        ('POST', r'/terminals/([^/]+)/payment', 'pay'),
+        ('GET', r'/orders/([^/]+)', 'find_order'),
+        ('POST', r'/orders/([^/]+)/returns', 'process_return'),
+        ('GET', r'/inventory', 'inventory_page'),
+        ('GET', r'/inventory/summary', 'inventory_summary'),
+        ('GET', r'/inventory/([^/]+)', 'stock'),
+        ('GET', r'/products/search', 'search'),
+    ]
+    _compiled = [(method, re.compile(pattern + '$'), name) for method, pattern, name in ROUTES]
+    
+    def do_GET(self):
+        self._dispatch('GET')
+    
+    def do_POST(self):
+        self._dispatch('POST')
+    
+    def do_PUT(self):
+        self._dispatch('PUT')
+    
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+    
+    def log_message(self, format, *args):
+        """Silence per-request logging (it dominates the cost of small requests)"""
+    
+    # ---- Terminal (cart) endpoints -------------------------------------------------
+    
+    def get_order(self, terminal_id: str):
+        """Show the terminal's open cart"""
+        return self._with_checkout(terminal_id, lambda checkout: self._cart(checkout))
+    
+    def start_order(self, terminal_id: str):
+        """Start a new cart, discarding any open one"""
+        def start(checkout):
+            checkout.start_new_order()
+            return 201, self._cart(checkout)
+        return self._with_checkout(terminal_id, start)
+    
+    def cancel_order(self, terminal_id: str):
+        """Cancel the open cart"""
+        def cancel(checkout):
+            checkout.cancel_order()
+            return {'cancelled': True}
+        return self._with_checkout(terminal_id, cancel)
+    
+    def add_item(self, terminal_id: str):
+        """Scan a product by ID or barcode"""
+        body = self._body()
+        code = str(self._require(body, 'code'))
+        quantity = self._int(body.get('quantity', 1), 'quantity')
+        if quantity <= 0:
+            raise HTTPError(400, "Quantity must be greater than 0")
+        
+        def add(checkout):
+            success, message = checkout.add_item(code, quantity)
+            if not success:
+                return 404 if message.startswith("Product not found") else 409, {'error': message}
+            return {'message': message, **self._cart(checkout)}
+        return self._with_checkout(terminal_id, add)
+    
+    def update_item(self, terminal_id: str, product_id: str):
+        """Set the quantity of a cart line"""
+        quantity = self._int(self._require(self._body(), 'quantity'), 'quantity')
+        
+        def update(checkout):
+            success, message = checkout.update_item_quantity(product_id, quantity)
+            if not success:
+                return 409, {'error': message}
+            return {'message': message, **self._cart(checkout)}
+        return self._with_checkout(terminal_id, update)
+    
+    def remove_item(self, terminal_id: str, product_id: str):
+        """Remove a cart line"""
+        def remove(checkout):
+            if not checkout.remove_item(product_id):
+                return 409, {'error': "No active order"}
+            return self._cart(checkout)
+        return self._with_checkout(terminal_id, remove)
+    
+    def pay(self, terminal_id: str):
+        """Pay for the open cart"""
+        body = self._body()
+        method = str(self._require(body, 'method'))
+        paid_amount = body.get('paid_amount')
+        if paid_amount is not None:
+            paid_amount = self._float(paid_amount, 'paid_amount')
+        
+        def pay(checkout):
+            with self.server.write_lock:
+                success, message, info = checkout.process_payment(method, paid_amount)
+            if not success:
+                return 409, {'error': message}
+            return {
+                'message': message,
+                'order': info['order'].to_dict(),
+                'payment': info['payment']
+            }
+        return self._with_checkout(terminal_id, pay)
+    
+    # ---- Orders and returns -----------------------------------------------------
+    
+    def find_order(self, order_id: str):
+        """Show an order with its returnable quantities"""
+        return_service = self.server.context.return_service
+        order = return_service.find_order(order_id)
+        if order is None:
+            raise HTTPError(404, f"Order not found: {order_id}")
+        returnable = {
+            entry['item'].product.product_id: entry['returnable_quantity']
+            for entry in return_service.get_returnable_items(order)
+        }
+        return {'order': order.to_dict(), 'returnable': returnable}
+    
+    def process_return(self, order_id: str):
+        """Return items from an order"""
+        body = self._body()
+        items = self._require(body, 'items')
+        if not isinstance(items, dict):
+            raise HTTPError(400, "items must map product IDs to quantities")
+        return_items = {str(pid): self._int(qty, 'quantity') for pid, qty in items.items()}
+        
+        with self.server.write_lock:
+            success, message, info = self.server.context.return_service.process_return(
+                order_id, return_items, str(body.get('reason', ''))
+            )
+        if not success:
+            return 404 if message.startswith("Order not found") else 409, {'error': message}
+        return {
+            'message': message,
+            'order_id': info['order_id'],
+            'return_amount': info['return_amount'],
+            'items': {ri['item'].product.product_id: ri['quantity'] for ri in info['items']},
+            'return_time': info['return_time']
+        }
+    
+    # ---- Inventory and products ---------------------------------------------------
+    
+    def inventory_page(self):
+        """One page of the inventory report"""
+        query = self._query()
+        limit = min(self._int(query.get('limit', 50), 'limit'), 1000)
+        rows, next_cursor = self.server.context.inventory_service.get_inventory_page(
+            query.get('after'), limit
+        )
+        return {'items': rows, 'next': next_cursor}
+    
+    def inventory_summary(self):
+        """Catalog-wide stock counts"""
+        return self.server.context.inventory_service.get_inventory_summary()
+    
+    def stock(self, product_id: str):
+        """Stock for one product"""
+        inventory_service = self.server.context.inventory_service
+        stock = inventory_service.get_stock(product_id)
+        return {
+            'product_id': product_id,
+            'stock': stock,
+            'status': inventory_service.get_stock_status(stock)
+        }
+    
+    def search(self):
+        """Search products by name or category"""
+        query = self._query()
+        limit = min(self._int(query.get('limit', 20), 'limit'), 200)
+        results = self.server.context.product_storage.search(query.get('q', ''), limit)
+        return {'products': [dict(product.to_dict(), stock=stock) for product, stock in results]}
+    
+    def health(self):
+        """Server status"""
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - self.server.started, 1),
+            'sessions': len(self.server.sessions),
+            'requests': self.server.requests
+        }
+    
+    # ---- Plumbing -------------------------------------------------------------------
+    
+    def _dispatch(self, method: str):
+        """Route a request, run its handler and write the JSON response"""
+        self.server.count_request()
+        path = urlsplit(self.path).path.rstrip('/') or '/'
+        try:
+            handler, args = self._route(method, path)
+            result = handler(*args)
+            status, payload = result if isinstance(result, tuple) else (200, result)
+        except HTTPError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': f"Internal error: {e}"}
+        self._send(status, payload)
+    
+    def _route(self, method: str, path: str) -> Tuple[Callable, tuple]:
+        """Find the handler for a method and path"""
+        path_matched = False
+        for route_method, pattern, name in self._compiled:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            path_matched = True
+            if route_method == method:
+                return getattr(self, name), tuple(unquote(group) for group in match.groups())
+        if path_matched:
+            raise HTTPError(405, f"Method {method} not allowed for {path}")
+        raise HTTPError(404, f"No such endpoint: {path}")
+    
+    def _with_checkout(self, terminal_id: str, action: Callable):
+        """Run an action against a terminal's checkout service while holding its session lock"""
+        while True:
+            try:
+                session = self.server.sessions.get(terminal_id)
+            except TerminalIdsExhaustedError as e:
+                raise HTTPError(503, str(e))
+            with session.lock:
+                # Expired while we waited for it: start over with a fresh session
+                if not session.closed:
+                    return action(session.checkout_service)
+    
+    @staticmethod
+    def _cart(checkout) -> dict:
+        """Serialize a terminal's open cart"""
+        order: Optional[Order] = checkout.current_order
+        if order is None:
+            return {'order': None}
+        return {'order': order.to_dict()}
+    
+    def _body(self) -> dict:
+        """Parse the JSON request body"""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length == 0:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except (ValueError, UnicodeDecodeError):
+            raise HTTPError(400, "Request body is not valid JSON") from None
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return body
+    
+    def _query(self) -> dict:
+        """Parse the query string (last value wins)"""
+        return {key: values[-1] for key, values in parse_qs(urlsplit(self.path).query).items()}
+    
+    @staticmethod
+    def _require(body: dict, key: str):
+        """Get a required body field"""
+        if key not in body:
+            raise HTTPError(400, f"Missing field: {key}")
+        return body[key]
+    
+    @staticmethod
+    def _int(value, name: str) -> int:
+        """Parse an integer parameter"""
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"{name} must be an integer") from None
+    
+    @staticmethod
+    def _float(value, name: str) -> float:
+        """Parse a number parameter"""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"{name} must be a number") from None
+    
+    def _send(self, status: int, payload: dict):
+        """Write a JSON response"""
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8080, db_path: str = "data/pos_system.db",
+          pool_size: int = 16, idle_timeout: float = 1800.0, journal_path: str = None):
+    """Run the server until interrupted"""
+    context = AppContext(db_path, pool_size, journal_path=journal_path)
+    server = POSHTTPServer((host, port), context, idle_timeout)
+    
+    def expire_sessions():
+        while True:
+            time.sleep(60)
+            server.sessions.expire_idle()
+    
+    threading.Thread(target=expire_sessions, name="session-expiry", daemon=True).start()
+    print(f"POS server listening on http://{host}:{server.server_address[1]} (database: {db_path})",
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        context.close()
+
+
+def main():
+    """Start the headless POS server"""
+    parser = argparse.ArgumentParser(description="Headless POS server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", default="data/pos_system.db")
+    parser.add_argument("--pool-size", type=int, default=16, help="database connections")
+    parser.add_argument("--idle-timeout", type=float, default=1800.0,
+                        help="seconds before an idle terminal's cart is discarded")
+    parser.add_argument("--journal", default=None,
+                        help="order journal file for write-behind sales")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.db, args.pool_size, args.idle_timeout, args.journal)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Terminal Sessions - One open cart per terminal for the headless server
+"""
+import threading
+import time
+from typing import Dict
+from services.app_context import AppContext
+from services.checkout_service import CheckoutService
+
+
+class TerminalSession:
+    """Checkout state of one terminal"""
+    
+    def __init__(self, terminal_id: str, checkout_service: CheckoutService):
+        """Initialize terminal session"""
+        self.terminal_id = terminal_id
+        self.checkout_service = checkout_service
+        # Requests from the same terminal run one at a time against its cart
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.closed = False  # Expired: its terminal ID may already belong to a new session
+
+
+class TerminalSessions:
+    """
+    Registry of terminal sessions keyed by terminal ID.
+    Every session gets its own CheckoutService (and so its own open order)
+    while sharing the context's storages, cache and connection pool.
+    Sessions idle for longer than idle_timeout seconds are dropped.
+    """
+    
+    def __init__(self, context: AppContext, idle_timeout: float = 1800.0):
+        """Initialize session registry"""
+        self.context = context
+        self.idle_timeout = idle_timeout
+        self._sessions: Dict[str, TerminalSession] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, terminal_id: str) -> TerminalSession:
+        """Get the session for a terminal, creating it on first use"""
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(terminal_id)
+            if session is None:
+                session = TerminalSession(terminal_id, self.context.new_checkout_service())
+                self._sessions[terminal_id] = session
+            session.last_used = now
+            return session
+    
+    def expire_idle(self) -> int:
+        """Drop idle sessions, cancelling their open carts, returns number dropped"""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [self._sessions.pop(tid) for tid, session in list(self._sessions.items())
+                    if session.last_used < cutoff]
+        for session in idle:
+            with session.lock:
+                session.checkout_service.cancel_order()  # Release its stock holds now
+                session.closed = True
+                self.context.release_checkout_service(session.checkout_service)
+        return len(idle)
+    
+    def __len__(self) -> int:
+        """Number of active sessions"""
+        return len(self._sessions)
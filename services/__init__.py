@@ -5,6 +5,11 @@ from .checkout_service import CheckoutService
 from .return_service import ReturnService
 from .inventory_service import InventoryService
 from .payment_service import PaymentService
+from .reporting_service import ReportingService
+from .register_report_service import RegisterReportService
+from .reorder_service import ReorderService
+from .app_context import AppContext
 
-__all__ = ['CheckoutService', 'ReturnService', 'InventoryService', 'PaymentService']
+__all__ = ['CheckoutService', 'ReturnService', 'InventoryService', 'PaymentService',
+           'ReportingService', 'RegisterReportService', 'ReorderService', 'AppContext']
 
@@ -0,0 +1,90 @@
+"""
+Application Context - Build the shared connection, storages and services once
+"""
+from typing import Optional
+from database.db_connection import DatabaseConnection
+from database.schema import create_tables
+from storage.product_storage import ProductStorage
+from storage.order_storage import OrderStorage
+from storage.inventory_storage import InventoryStorage
+from storage.return_storage import ReturnStorage
+from storage.sales_summary_storage import SalesSummaryStorage
+from services.checkout_service import CheckoutService
+from services.return_service import ReturnService
+from services.inventory_service import InventoryService
+from services.payment_service import PaymentService
+from services.reporting_service import ReportingService
+from services.register_report_service import RegisterReportService
+from services.reorder_service import ReorderService
+from services.order_journal import OrderJournal
+from services.order_id_generator import OrderIdGenerator, TerminalIdPool
+
+
+class AppContext:
+    """
+    Application-wide container.
+    Every service shares one DatabaseConnection (one connection pool) and one
+    ProductStorage, so the product cache and scan index are built once and
+    seen by checkout, returns and inventory alike.
+    """
+    
+    def __init__(self, db_path: str = "data/pos_system.db", pool_size: int = 5,
+                 product_cache_size: int = 50000, preload_index: bool = True,
+                 profile: Optional[str] = None, hold_ttl: float = 600.0,
+                 journal_path: Optional[str] = None, terminal_id: Optional[int] = None):
+        """
+        Initialize application context
+        profile: SQLite performance profile (defaults to POS_DB_PROFILE, then 'lane')
+        hold_ttl: seconds an idle cart keeps its stock reservations
+        journal_path: order journal file; when set, sales are written behind through it
+        terminal_id: ID of the first lane (0-999) for order IDs, later lanes count up from it
+        """
+        self.db = DatabaseConnection(db_path, pool_size, profile)
+        create_tables(self.db)  # A single PRAGMA read when the schema is current
+        
+        # Storage layer
+        self.product_storage = ProductStorage(self.db, cache_size=product_cache_size,
+                                              preload_index=preload_index,
+                                              index_in_background=True)
+        self.inventory_storage = InventoryStorage(self.db, self.product_storage)
+        self.sales_summary = SalesSummaryStorage(self.db)
+        self.order_storage = OrderStorage(self.db, self.product_storage, self.sales_summary)
+        self.return_storage = ReturnStorage(self.db, self.sales_summary)
+        
+        # Service layer
+        self.payment_service = PaymentService()
+        self.inventory_service = InventoryService(self.db, self.inventory_storage, hold_ttl)
+        self.journal: Optional[OrderJournal] = None
+        if journal_path:
+            self.journal = OrderJournal(journal_path, self.order_storage, self.inventory_service)
+            self.journal.replay()  # Sales left over from the last run (a crash or an outage)
+            self.journal.start()
+        self.terminal_ids = TerminalIdPool(terminal_id)
+        self.checkout_service = self.new_checkout_service()
+        self.return_service = ReturnService(
+            self.db, self.order_storage, self.inventory_service, self.payment_service,
+            self.return_storage
+        )
+        self.reporting_service = ReportingService(self.db, self.sales_summary)
+        self.register_report_service = RegisterReportService(self.db)
+        self.reorder_service = ReorderService(self.db, self.sales_summary)
+    
+    def new_checkout_service(self) -> CheckoutService:
+        """Build a checkout service for one more lane, sharing storages with the others"""
+        return CheckoutService(
+            self.db, self.product_storage, self.order_storage,
+            self.inventory_service, self.payment_service, self.journal,
+            OrderIdGenerator(self.terminal_ids.acquire())
+        )
+    
+    def release_checkout_service(self, checkout_service: CheckoutService):
+        """Close a lane: its terminal ID may be handed to a new one"""
+        self.terminal_ids.release(checkout_service.id_generator.terminal_id)
+    
+    def close(self):
+        """Drain the order journal and release database connections"""
+        if self.journal is not None:
+            self.journal.close()
+        self.product_storage.close()
+        self.db.close()
+
@@ -0,0 +1,40 @@
+"""
+Async Application Context - Serve many lanes from one event loop
+
+Kept apart from app_context so the synchronous terminal never imports asyncio.
+"""
+from typing import Optional
+from database.async_executor import DatabaseExecutor
+from storage.async_storage import AsyncProductStorage, AsyncOrderStorage, AsyncInventoryStorage
+from services.app_context import AppContext
+from services.async_checkout_service import AsyncCheckoutService
+from services.async_return_service import AsyncReturnService
+
+
+class AsyncAppContext:
+    """
+    Async application container for serving many lanes from one event loop.
+    Wraps an AppContext; all SQLite work runs on a DatabaseExecutor with
+    read_workers reader threads and one writer thread.
+    """
+    
+    def __init__(self, db_path: str = "data/pos_system.db", read_workers: int = 4,
+                 product_cache_size: int = 50000, profile: Optional[str] = None):
+        """Initialize async application context"""
+        # One pooled connection per reader thread, plus the writer
+        self.context = AppContext(db_path, read_workers + 1, product_cache_size, profile=profile)
+        self.executor = DatabaseExecutor(read_workers)
+        
+        self.product_storage = AsyncProductStorage(self.context.product_storage, self.executor)
+        self.order_storage = AsyncOrderStorage(self.context.order_storage, self.executor)
+        self.inventory_storage = AsyncInventoryStorage(self.context.inventory_storage, self.executor)
+        self.return_service = AsyncReturnService(self.context.return_service, self.executor)
+    
+    def new_checkout_service(self) -> AsyncCheckoutService:
+        """Build an async checkout service for one lane"""
+        return AsyncCheckoutService(self.context.new_checkout_service(), self.executor)
+    
+    def close(self):
+        """Finish queued work and release database connections"""
+        self.executor.shutdown()
+        self.context.close()
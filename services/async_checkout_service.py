@@ -0,0 +1,76 @@
+"""
+Async Checkout Service - Awaitable checkout for one lane
+"""
+import asyncio
+from typing import Optional, Tuple
+from models.order import Order
+from database.async_executor import DatabaseExecutor
+from services.checkout_service import CheckoutService
+
+
+class AsyncCheckoutService:
+    """
+    Async counterpart of CheckoutService.
+    One instance per lane (it holds that lane's open order). Scans and stock
+    checks run on the executor's reader pool; payment, which writes stock and
+    the order in one transaction, runs on the single writer thread.
+    """
+    
+    def __init__(self, checkout_service: CheckoutService, executor: DatabaseExecutor):
+        """Initialize async checkout service"""
+        self.service = checkout_service
+        self.executor = executor
+        # Requests for the same lane run one at a time against its open order
+        self._lock = asyncio.Lock()
+    
+    @property
+    def current_order(self) -> Optional[Order]:
+        """The lane's open order"""
+        return self.service.current_order
+    
+    async def start_new_order(self) -> Order:
+        """Start a new order (in memory, no database access)"""
+        async with self._lock:
+            return self.service.start_new_order()
+    
+    async def add_item(self, product_id: str, quantity: int = 1) -> Tuple[bool, str]:
+        """
+        Add item to current order
+        Returns: (success, message)
+        """
+        async with self._lock:
+            return await self.executor.read(self.service.add_item, product_id, quantity)
+    
+    async def remove_item(self, product_id: str) -> bool:
+        """Remove item from current order (in memory, no database access)"""
+        async with self._lock:
+            return self.service.remove_item(product_id)
+    
+    async def update_item_quantity(self, product_id: str, quantity: int) -> Tuple[bool, str]:
+        """
+        Update item quantity in current order
+        Returns: (success, message)
+        """
+        async with self._lock:
+            return await self.executor.read(self.service.update_item_quantity, product_id, quantity)
+    
+    def get_current_total(self) -> float:
+        """Get current order total"""
+        return self.service.get_current_total()
+    
+    def get_line_count(self) -> int:
+        """Get number of distinct products in current order"""
+        return self.service.get_line_count()
+    
+    async def process_payment(self, payment_method: str, paid_amount: float = None) -> Tuple[bool, str, dict]:
+        """
+        Process payment for current order
+        Returns: (success, message, payment_info)
+        """
+        async with self._lock:
+            return await self.executor.write(self.service.process_payment, payment_method, paid_amount)
+    
+    async def cancel_order(self):
+        """Cancel current order (waits for an add or payment in flight on this lane)"""
+        async with self._lock:
+            self.service.cancel_order()
@@ -0,0 +1,36 @@
+"""
+Async Return Service - Awaitable return processing
+"""
+from typing import Dict, List, Optional, Tuple
+from models.order import Order
+from database.async_executor import DatabaseExecutor
+from services.return_service import ReturnService
+
+
+class AsyncReturnService:
+    """
+    Async counterpart of ReturnService.
+    Stateless, so one instance can serve every lane.
+    """
+    
+    def __init__(self, return_service: ReturnService, executor: DatabaseExecutor):
+        """Initialize async return service"""
+        self.service = return_service
+        self.executor = executor
+    
+    async def find_order(self, order_id: str) -> Optional[Order]:
+        """Find order by ID"""
+        return await self.executor.read(self.service.find_order, order_id)
+    
+    async def get_returnable_items(self, order: Order) -> List[Dict]:
+        """Get list of returnable items from order (reads the return ledger)"""
+        return await self.executor.read(self.service.get_returnable_items, order)
+    
+    async def process_return(self, order_id: str, return_items: Dict[str, int],
+                             reason: str = "") -> Tuple[bool, str, dict]:
+        """
+        Process return for an order
+        return_items: {product_id: quantity_to_return}
+        Returns: (success, message, return_info)
+        """
+        return await self.executor.write(self.service.process_return, order_id, return_items, reason)
@@ -1,85 +1,95 @@
 """
 Checkout Service - Handle checkout process
 """
-import uuid
-from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Optional, Tuple
+from models.cart import Cart
 from models.order import Order
-from models.order_item import OrderItem
-from models.product import Product
+from database.db_connection import DatabaseConnection
+from database.instrumentation import instrumented
 from storage.product_storage import ProductStorage
 from storage.order_storage import OrderStorage
 from services.inventory_service import InventoryService
 from services.payment_service import PaymentService
+from services.order_journal import OrderJournal
+from services.order_id_generator import OrderIdGenerator
 
 
 class CheckoutService:
     """Checkout service for processing sales"""
     
-    def __init__(self):
-        """Initialize checkout service"""
-        self.product_storage = ProductStorage()
-        self.order_storage = OrderStorage()
-        self.inventory_service = InventoryService()
-        self.payment_service = PaymentService()
-        self.current_order: Optional[Order] = None
+    def __init__(self, db: DatabaseConnection = None, product_storage: ProductStorage = None,
+                 order_storage: OrderStorage = None, inventory_service: InventoryService = None,
+                 payment_service: PaymentService = None, journal: OrderJournal = None,
+                 id_generator: OrderIdGenerator = None):
+        """
+        Initialize checkout service
+        journal: when set, paid orders are appended to it and written to the database in the background
+        id_generator: issues this lane's order IDs (one per terminal)
+        """
+        # One shared connection manager so a sale can run as a single unit of work
+        self.db = db or DatabaseConnection()
+        # Preloaded ID/barcode index so scans resolve without a database round trip
+        self.product_storage = product_storage or ProductStorage(self.db, preload_index=True)
+        self.order_storage = order_storage or OrderStorage(self.db, self.product_storage)
+        self.inventory_service = inventory_service or InventoryService(self.db)
+        self.payment_service = payment_service or PaymentService()
+        self.journal = journal
+        self.id_generator = id_generator or OrderIdGenerator()
+        self.cart: Optional[Cart] = None
+    
+    @property
+    def current_order(self) -> Optional[Order]:
+        """The open order (None if no order is in progress)"""
+        return self.cart.to_order() if self.cart is not None else None
+    
+    @current_order.setter
+    def current_order(self, order: Optional[Order]):
+        """Replace the open order"""
+        self._release_cart()
+        self.cart = Cart(order) if order is not None else None
     
     def start_new_order(self) -> Order:
         """Start a new order"""
-        order_id = f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}-{str(uuid.uuid4())[:8].upper()}"
-        self.current_order = Order(order_id=order_id)
-        return self.current_order
+        self._release_cart()
+        self.cart = Cart(Order(order_id=self.id_generator.next_id()))
+        return self.cart.order
     
+    @instrumented("checkout.add_item")
     def add_item(self, product_id: str, quantity: int = 1) -> Tuple[bool, str]:
         """
         Add item to current order
         Returns: (success, message)
         """
-        if self.current_order is None:
+        if self.cart is None:
             self.start_new_order()
         
-        # Get product
-        product = self.product_storage.get_by_id(product_id)
+        # Get product (accepts a product ID or barcode)
+        product = self.product_storage.resolve(product_id)
         if product is None:
             return False, f"Product not found: {product_id}"
+        product_id = product.product_id
         
-        # Check stock
-        if not self.inventory_service.check_stock(product_id, quantity):
-            available = self.inventory_service.get_stock(product_id)
-            return False, f"Insufficient stock. Available: {available}, Requested: {quantity}"
-        
-        # Check if item already exists in order
-        for item in self.current_order.items:
-            if item.product.product_id == product_id:
-                # Update quantity
-                new_quantity = item.quantity + quantity
-                if not self.inventory_service.check_stock(product_id, new_quantity):
-                    available = self.inventory_service.get_stock(product_id)
-                    return False, f"Insufficient stock. Available: {available}, Requested: {new_quantity}"
-                item.quantity = new_quantity
-                self.current_order.calculate_total()
-                return True, f"Updated quantity for {product.name}"
-        
-        # Add new item
-        order_item = OrderItem(
-            product=product,
-            quantity=quantity,
-            unit_price=product.price
+        # Hold stock for the line's new quantity (checked in memory against on-hand minus holds)
+        in_cart = self.cart.quantity(product_id)
+        requested = in_cart + quantity
+        reserved, available = self.inventory_service.reserve_stock(
+            self.cart.order.order_id, product_id, requested
         )
-        self.current_order.items.append(order_item)
-        self.current_order.calculate_total()
+        if not reserved:
+            return False, f"Insufficient stock. Available: {available}, Requested: {requested}"
+        
+        self.cart.add(product, quantity)
+        if in_cart:
+            return True, f"Updated quantity for {product.name}"
         return True, f"Added {product.name} x{quantity}"
     
     def remove_item(self, product_id: str) -> bool:
         """Remove item from current order"""
-        if self.current_order is None:
+        if self.cart is None:
             return False
         
-        self.current_order.items = [
-            item for item in self.current_order.items
-            if item.product.product_id != product_id
-        ]
-        self.current_order.calculate_total()
+        if self.cart.remove(product_id):
+            self.inventory_service.release_stock(self.cart.order.order_id, product_id)
         return True
     
     def update_item_quantity(self, product_id: str, quantity: int) -> Tuple[bool, str]:
@@ -87,41 +97,57 @@ class CheckoutService:
         Update item quantity in current order
         Returns: (success, message)
         """
-        if self.current_order is None:
+        if self.cart is None:
             return False, "No active order"
         
         if quantity <= 0:
             return self.remove_item(product_id), "Item removed"
         
-        # Check stock
-        if not self.inventory_service.check_stock(product_id, quantity):
-            available = self.inventory_service.get_stock(product_id)
-            return False, f"Insufficient stock. Available: {available}, Requested: {quantity}"
+        if product_id not in self.cart:
+            return False, "Item not found in order"
         
-        # Update quantity
-        for item in self.current_order.items:
-            if item.product.product_id == product_id:
-                item.quantity = quantity
-                self.current_order.calculate_total()
-                return True, "Quantity updated"
+        # Move the hold to the new quantity
+        reserved, available = self.inventory_service.reserve_stock(
+            self.cart.order.order_id, product_id, quantity
+        )
+        if not reserved:
+            return False, f"Insufficient stock. Available: {available}, Requested: {quantity}"
         
-        return False, "Item not found in order"
+        self.cart.set_quantity(product_id, quantity)
+        return True, "Quantity updated"
     
     def get_current_total(self) -> float:
         """Get current order total"""
-        if self.current_order is None:
+        if self.cart is None:
             return 0.0
-        return self.current_order.total_amount
+        return self.cart.total
     
+    def get_line_count(self) -> int:
+        """Get number of distinct products in current order"""
+        if self.cart is None:
+            return 0
+        return len(self.cart)
+    
+    @instrumented("checkout.process_payment")
     def process_payment(self, payment_method: str, paid_amount: float = None) -> Tuple[bool, str, dict]:
         """
         Process payment for current order
         Returns: (success, message, payment_info)
         """
-        if self.current_order is None or len(self.current_order.items) == 0:
+        if self.get_line_count() == 0:
             return False, "No items in order", {}
         
-        total = self.current_order.total_amount
+        order = self.cart.to_order()
+        total = order.total_amount
+        
+        # Re-assert holds (they may have lapsed while the cart sat idle) before taking payment
+        for item in order.items:
+            reserved, available = self.inventory_service.reserve_stock(
+                order.order_id, item.product.product_id, item.quantity
+            )
+            if not reserved:
+                return False, (f"Insufficient stock for {item.product.name}. "
+                               f"Available: {available}, Requested: {item.quantity}"), {}
         
         # Validate and process payment
         try:
@@ -132,21 +158,40 @@ class CheckoutService:
             return False, str(e), {}
         
         # Update order
-        self.current_order.payment_method = payment_info['method']
-        self.current_order.payment_status = 'paid'
-        
-        # Reduce inventory
-        for item in self.current_order.items:
-            if not self.inventory_service.reduce_stock(item.product.product_id, item.quantity):
-                # Rollback - this shouldn't happen if we checked earlier
-                return False, f"Failed to reduce stock for {item.product.name}", {}
-        
-        # Save order
-        if not self.order_storage.add(self.current_order):
-            return False, "Failed to save order", {}
+        order.payment_method = payment_info['method']
+        order.payment_status = 'paid'
+        order.paid_amount = payment_info['paid_amount']
+        
+        if self.journal is not None:
+            # One fsync'd append; the flusher reduces stock and saves the order, then drops the holds
+            self.journal.append(order)
+            self.inventory_service.pin_reservation(order.order_id)
+            self.cart = None
+            return True, "Payment processed successfully", {
+                'order': order,
+                'payment': payment_info
+            }
+        
+        # Reduce inventory and save the order as one transaction
+        try:
+            with self.db.transaction():
+                for item in order.items:
+                    if not self.inventory_service.reduce_stock(item.product.product_id, item.quantity):
+                        raise ValueError(f"Failed to reduce stock for {item.product.name}")
+                
+                if not self.order_storage.add(order):
+                    raise ValueError("Failed to save order")
+                
+                # The decrements above consume the holds once this commits
+                self.inventory_service.commit_reservation(order.order_id)
+        except ValueError as e:
+            # Nothing was written; leave the order (and its holds) open for the cashier
+            order.payment_method = ""
+            order.payment_status = 'pending'
+            order.paid_amount = 0.0
+            return False, str(e), {}
         
-        order = self.current_order
-        self.current_order = None
+        self.cart = None
         
         return True, "Payment processed successfully", {
             'order': order,
@@ -154,6 +199,12 @@ class CheckoutService:
         }
     
     def cancel_order(self):
-        """Cancel current order"""
-        self.current_order = None
+        """Cancel current order and release its stock holds"""
+        self._release_cart()
+        self.cart = None
+    
+    def _release_cart(self):
+        """Release the holds of the open order, if any"""
+        if self.cart is not None:
+            self.inventory_service.release_stock(self.cart.order.order_id)
 
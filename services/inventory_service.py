@@ -1,17 +1,30 @@
 """
 Inventory Service - Handle inventory management
 """
+from database.db_connection import DatabaseConnection
+from database.instrumentation import instrumented
 from storage.inventory_storage import InventoryStorage
-from typing import Optional
+from services.reservation_ledger import ReservationLedger
+from typing import Dict, Iterator, List, Optional, Tuple
 
 
 class InventoryService:
     """Inventory service for managing stock"""
     
-    def __init__(self):
-        """Initialize inventory service"""
-        self.storage = InventoryStorage()
+    LOW_STOCK_THRESHOLD = 10  # Stock below this (but above 0) is reported as low
     
+    def __init__(self, db: DatabaseConnection = None, storage: InventoryStorage = None,
+                 hold_ttl: float = 600.0, stock_cache_ttl: float = 5.0):
+        """
+        Initialize inventory service
+        hold_ttl: seconds an idle cart keeps its stock reservations
+        stock_cache_ttl: seconds a cached on-hand level is used for availability checks
+        """
+        self.db = db or DatabaseConnection()
+        self.storage = storage or InventoryStorage(self.db)
+        self.reservations = ReservationLedger(self.storage.get_quantity, hold_ttl, stock_cache_ttl)
+    
+    @instrumented("inventory.get_stock")
     def get_stock(self, product_id: str) -> int:
         """Get current stock for a product"""
         return self.storage.get_quantity(product_id)
@@ -25,15 +38,86 @@ class InventoryService:
         Reduce stock for a product
         Returns True if successful, False if insufficient stock
         """
-        if not self.check_stock(product_id, quantity):
+        if not self.storage.reduce_quantity(product_id, quantity):
             return False
-        return self.storage.reduce_quantity(product_id, quantity)
+        self._stock_changed(product_id)
+        return True
     
     def add_stock(self, product_id: str, quantity: int):
         """Add stock for a product (for returns)"""
         self.storage.add_quantity(product_id, quantity)
+        self._stock_changed(product_id)
     
     def set_stock(self, product_id: str, quantity: int):
         """Set stock quantity for a product"""
         self.storage.set_quantity(product_id, quantity)
-
+        self._stock_changed(product_id)
+    
+    def get_available_stock(self, product_id: str, order_id: str = None) -> int:
+        """Stock not held by other open orders (answered from memory when cached)"""
+        return self.reservations.available(product_id, order_id)
+    
+    def reserve_stock(self, order_id: str, product_id: str, quantity: int) -> Tuple[bool, int]:
+        """
+        Hold quantity of a product for an open order (replaces the order's previous hold)
+        Returns: (success, available)
+        """
+        return self.reservations.hold(order_id, product_id, quantity)
+    
+    def release_stock(self, order_id: str, product_id: str = None):
+        """Release an order's hold on one product, or all of its holds"""
+        self.reservations.release(order_id, product_id)
+    
+    def pin_reservation(self, order_id: str):
+        """Keep an order's holds past their TTL until release_stock (sold, stock not yet written)"""
+        self.reservations.pin(order_id)
+    
+    def commit_reservation(self, order_id: str):
+        """
+        Turn an order's holds into the stock decrements made in the current
+        transaction: the holds are released when (and only if) it commits
+        """
+        self.db.after_commit(lambda: self.reservations.release(order_id))
+    
+    def _stock_changed(self, product_id: str):
+        """Drop the cached on-hand level once the write is committed"""
+        self.db.after_commit(lambda: self.reservations.invalidate(product_id))
+    
+    def get_stock_status(self, stock: int) -> str:
+        """Get display status for a stock level"""
+        if stock <= 0:
+            return "Out of Stock"
+        if stock < self.LOW_STOCK_THRESHOLD:
+            return "Low Stock"
+        return "In Stock"
+    
+    def get_inventory_page(self, after: str = None, page_size: int = 50) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get one page of the inventory report in product_id order
+        Returns: (rows, next_cursor) - next_cursor is None on the last page
+        """
+        rows = self.storage.report_rows(after, page_size)
+        report = [
+            {
+                'product_id': row['product_id'],
+                'name': row['name'],
+                'stock': row['quantity'],
+                'status': self.get_stock_status(row['quantity'])
+            }
+            for row in rows
+        ]
+        next_cursor = report[-1]['product_id'] if len(report) == page_size else None
+        return report, next_cursor
+    
+    def iter_inventory_report(self, page_size: int = 500) -> Iterator[Dict]:
+        """Stream the whole inventory report one page at a time"""
+        after = None
+        while True:
+            rows, after = self.get_inventory_page(after, page_size)
+            yield from rows
+            if after is None:
+                return
+    
+    def get_inventory_summary(self) -> Dict:
+        """Get in-stock, out-of-stock, low-stock and total unit counts"""
+        return self.storage.summary(self.LOW_STOCK_THRESHOLD)
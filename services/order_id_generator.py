@@ -0,0 +1,89 @@
+"""
+Order ID Generator - Time-ordered, per-terminal order IDs
+"""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+MAX_TERMINALS = 1000
+SEQUENCE_LIMIT = 1000  # IDs per millisecond per terminal
+
+
+class TerminalIdsExhaustedError(Exception):
+    """Raised when every terminal ID is taken by a live lane"""
+
+
+class TerminalIdPool:
+    """
+    Terminal IDs for the lanes of one process. An ID is only handed out again
+    after the lane holding it has released it, so two live lanes never issue
+    order IDs from the same terminal number.
+    """
+    
+    def __init__(self, first: int = None):
+        """Initialize pool; IDs are handed out from first upwards (random if not given)"""
+        self._next = random.randrange(MAX_TERMINALS) if first is None else first % MAX_TERMINALS
+        self._in_use = set()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> int:
+        """Take the next free terminal ID"""
+        with self._lock:
+            for offset in range(MAX_TERMINALS):
+                terminal_id = (self._next + offset) % MAX_TERMINALS
+                if terminal_id not in self._in_use:
+                    self._in_use.add(terminal_id)
+                    self._next = (terminal_id + 1) % MAX_TERMINALS
+                    return terminal_id
+        raise TerminalIdsExhaustedError(f"All {MAX_TERMINALS} terminal IDs are in use")
+    
+    def release(self, terminal_id: int):
+        """Give a terminal ID back once its lane is closed"""
+        with self._lock:
+            self._in_use.discard(terminal_id)
+    
+    def __len__(self) -> int:
+        """Number of terminal IDs in use"""
+        return len(self._in_use)
+
+
+class OrderIdGenerator:
+    """
+    Snowflake-style order IDs: ORD-<UTC time to the millisecond>-<terminal><sequence>,
+    e.g. ORD-20250105143012345-007000. IDs from one generator sort in the order they
+    were issued, so new orders land at the right-hand edge of the order_id index
+    instead of at random pages. Should the clock step back or a millisecond run out
+    of sequence numbers, the generator keeps counting from its last timestamp.
+    """
+    
+    def __init__(self, terminal_id: int = None):
+        """
+        Initialize generator
+        terminal_id: 0-999, unique per lane writing to the same database
+        (a random one is picked if not given)
+        """
+        if terminal_id is None:
+            terminal_id = random.randrange(MAX_TERMINALS)
+        if not 0 <= terminal_id < MAX_TERMINALS:
+            raise ValueError(f"terminal_id must be between 0 and {MAX_TERMINALS - 1}")
+        self.terminal_id = terminal_id
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._sequence = 0
+    
+    def next_id(self) -> str:
+        """Issue the next order ID"""
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            else:
+                self._sequence += 1
+                if self._sequence >= SEQUENCE_LIMIT:
+                    self._last_ms += 1
+                    self._sequence = 0
+            ms, sequence = self._last_ms, self._sequence
+        stamp = datetime.fromtimestamp(ms // 1000, timezone.utc).strftime('%Y%m%d%H%M%S')
+        return f"ORD-{stamp}{ms % 1000:03d}-{self.terminal_id:03d}{sequence:03d}"
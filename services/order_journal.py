@@ -0,0 +1,255 @@
+"""
+Order Journal - Write-behind log of completed sales
+
+process_payment appends each sale to a local append-only file and fsyncs it,
+so the cashier waits for one sequential write instead of the shared database.
+A background flusher drains the journal into SQLite in batches; if the
+database is locked or unreachable the records simply wait and are retried.
+
+Each line is "<crc32 hex> <json>\\n". A torn write from a crash fails the
+checksum and is cut off on the next start. Flushed progress is kept in
+"<journal>.offset"; replaying is idempotent because orders already in the
+database (by order ID) are skipped together with their stock decrements.
+A record that can never become an order is moved to "<journal>.rejected".
+"""
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import List, Optional, Tuple
+from models.order import Order
+from models.product import Product
+from storage.order_storage import OrderStorage
+from services.inventory_service import InventoryService
+
+# Errors from a journal record that can never be saved as an order (missing or malformed fields)
+_BAD_RECORD = (KeyError, TypeError, ValueError, AttributeError)
+
+
+class OrderJournal:
+    """Append-only, fsync'd journal of sales drained into SQLite by a background thread"""
+    
+    def __init__(self, path: str, order_storage: OrderStorage, inventory_service: InventoryService,
+                 flush_interval: float = 0.5, batch_size: int = 500, retry_interval: float = 5.0):
+        """
+        Initialize order journal (an interrupted tail from a crash is truncated)
+        flush_interval: seconds between background flushes
+        batch_size: sales written per database transaction
+        retry_interval: seconds to wait after the database could not be written
+        """
+        self.path = path
+        self.order_storage = order_storage
+        self.inventory_service = inventory_service
+        self.db = order_storage.db
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._append_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        # An offset past the end (crash while compacting) would hide every new record
+        self.flushed_offset = min(self._read_offset(), os.fstat(self._fd).st_size)
+        self._truncate_torn_tail()
+        self.appended = 0
+        self.flushed = 0
+        self.oversold = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+    
+    def append(self, order: Order):
+        """Durably record a completed sale (returns once it is on disk)"""
+        data = json.dumps(order.to_dict(), separators=(',', ':'))
+        line = f"{zlib.crc32(data.encode('utf-8')):08x} {data}\n".encode('utf-8')
+        with self._append_lock:
+            os.write(self._fd, line)
+            os.fsync(self._fd)
+            self.appended += 1
+    
+    def pending_bytes(self) -> int:
+        """Bytes of journal not yet written to the database"""
+        return os.fstat(self._fd).st_size - self.flushed_offset
+    
+    def start(self):
+        """Start the background flusher"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="order-journal-flush", daemon=True)
+            self._thread.start()
+    
+    def close(self):
+        """Stop the flusher, drain what the database accepts and close the file"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            while self.flush():
+                pass
+        except (sqlite3.Error, OSError) as e:
+            self.last_error = str(e)  # Left in the journal for the next start
+        os.close(self._fd)
+    
+    def replay(self) -> int:
+        """Write every pending sale to the database now, returns sales written"""
+        before = self.flushed
+        while self.flush():
+            pass
+        return self.flushed - before
+    
+    def flush(self) -> int:
+        """Write up to batch_size pending sales in one transaction, returns records consumed"""
+        with self._flush_lock:
+            records, end_offset = self._read_pending(self.batch_size)
+            if not records:
+                self._compact()
+                return 0
+            error = None
+            try:
+                written = self._write([self._to_order(record) for record in records])
+            except _BAD_RECORD:
+                # A record the database can never take: write the batch one sale at a time
+                # and set the bad ones aside so they do not block the sales behind them
+                written = 0
+                for record in records:
+                    try:
+                        written += self._write([self._to_order(record)])
+                    except _BAD_RECORD as e:
+                        error = self._reject(record, e)
+            self.flushed_offset = end_offset
+            self.flushed += written
+            self.last_error = error
+            self._write_offset()
+            return len(records)
+    
+    def _write(self, orders: List[Order]) -> int:
+        """Save orders not yet in the database and take their stock in one transaction, returns orders saved"""
+        with self.db.transaction():
+            new_ids = self.order_storage.missing_ids([order.order_id for order in orders])
+            new_orders = [order for order in orders if order.order_id in new_ids]
+            self.order_storage.add_many(new_orders)
+            for order in new_orders:
+                for item in order.items:
+                    product_id = item.product.product_id
+                    if not self.inventory_service.reduce_stock(product_id, item.quantity):
+                        # The goods have already left the store; record stock as 0
+                        self.inventory_service.add_stock(product_id, -item.quantity)
+                        self.oversold += 1
+            for order in orders:
+                self.db.after_commit(
+                    lambda order_id=order.order_id: self.inventory_service.release_stock(order_id)
+                )
+        return len(new_orders)
+    
+    def _reject(self, record, error: Exception) -> str:
+        """Move a record that cannot become an order to "<journal>.rejected", returns the error text"""
+        order_id = record.get('order_id', '?') if isinstance(record, dict) else '?'
+        message = f"Order {order_id} set aside in {self.path}.rejected: {error!r}"
+        with open(self.path + ".rejected", 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'error': message, 'record': record}, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.rejected += 1
+        return message
+    
+    def _run(self):
+        """Flusher loop"""
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                while self.flush() and not self._stopping:
+                    pass
+            except Exception as e:
+                # Database locked or unreachable, offset not writable (disk full) or any
+                # other failure: keep the records, record the error and try again later
+                self.last_error = str(e) or repr(e)
+                self._wake.wait(self.retry_interval)
+    
+    def _read_pending(self, limit: int) -> Tuple[List[dict], int]:
+        """Read up to limit complete records after the flushed offset"""
+        records = []
+        offset = self.flushed_offset
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                record = self._parse(line)
+                if record is None:
+                    break  # Torn write still in progress or from a crash
+                records.append(record)
+                offset += len(line)
+                if len(records) >= limit:
+                    break
+        return records, offset
+    
+    @staticmethod
+    def _parse(line: bytes) -> Optional[dict]:
+        """Decode one journal line, None if incomplete or corrupt"""
+        if not line.endswith(b"\n") or len(line) < 10:
+            return None
+        checksum, data = line[:8], line[9:-1]
+        try:
+            if int(checksum, 16) != zlib.crc32(data):
+                return None
+            return json.loads(data)
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _to_order(record: dict) -> Order:
+        """Rebuild an order from a journal record (products carry only what storage needs)"""
+        products = {
+            item['product_id']: Product(item['product_id'], item['product_name'], item['unit_price'])
+            for item in record['items']
+        }
+        return Order.from_dict(record, products)
+    
+    def _truncate_torn_tail(self):
+        """Cut off a record that was only partly written before a crash"""
+        good = self.flushed_offset
+        with open(self.path, 'rb') as f:
+            f.seek(good)
+            for line in f:
+                if self._parse(line) is None:
+                    break
+                good += len(line)
+        if good < os.fstat(self._fd).st_size:
+            os.truncate(self.path, good)
+            os.fsync(self._fd)
+    
+    def _compact(self):
+        """Empty the journal once everything in it is in the database"""
+        with self._append_lock:
+            size = os.fstat(self._fd).st_size
+            if size == 0 or size != self.flushed_offset:
+                return
+            # Reset the offset first: a crash before the truncate only replays
+            # records that are already in the database, which is skipped
+            self.flushed_offset = 0
+            self._write_offset()
+            os.ftruncate(self._fd, 0)
+            os.fsync(self._fd)
+    
+    def _read_offset(self) -> int:
+        """Load the flushed offset"""
+        try:
+            with open(self.path + ".offset", 'r', encoding='utf-8') as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+    
+    def _write_offset(self):
+        """Persist the flushed offset atomically"""
+        temp_path = self.path + ".offset.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(str(self.flushed_offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path + ".offset")
+
@@ -0,0 +1,170 @@
+"""
+Register Report Service - X (mid-day) and Z (end-of-day) register reports
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Dict
+from database.db_connection import DatabaseConnection
+from storage.register_report_storage import RegisterReportStorage
+
+
+class RegisterReportService:
+    """
+    Builds register reports by streaming one day's orders and returns once.
+    Memory is bounded by the number of payment methods, categories and hours,
+    not by the number of transactions. An X report can be taken any time; a
+    Z report closes the day and is numbered in the z_reports table.
+    """
+    
+    def __init__(self, db: DatabaseConnection = None, report_dir: str = "data/reports",
+                 storage: RegisterReportStorage = None):
+        """Initialize register report service"""
+        self.db = db or DatabaseConnection()
+        self.report_dir = report_dir
+        self.storage = storage or RegisterReportStorage(self.db)
+    
+    def build_report(self, day: str = None, kind: str = 'X') -> Dict:
+        """Summarize a day ("YYYY-MM-DD", default today) in one pass over its orders and returns"""
+        day = day or datetime.now().strftime("%Y-%m-%d")
+        start = datetime.strptime(day, "%Y-%m-%d")
+        end = (start + timedelta(days=1)).strftime("%Y-%m-%d")
+        
+        report = {
+            'kind': kind, 'z_number': None, 'day': day,
+            'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'orders': 0, 'line_items': 0, 'units': 0, 'gross_sales': 0.0,
+            'first_order': None, 'last_order': None,
+            'payments': {}, 'categories': {}, 'hours': {},
+            'returns': 0, 'returned_units': 0, 'refunds': 0.0, 'refunds_by_method': {}
+        }
+        
+        last_key = None
+        for row in self.storage.order_lines(day, end):
+            if row['order_key'] != last_key:
+                last_key = row['order_key']
+                self._add_order(report, row)
+            if row['quantity'] is not None:
+                report['line_items'] += 1
+                report['units'] += row['quantity']
+                category = report['categories'].setdefault(row['category'], {'units': 0, 'amount': 0.0})
+                category['units'] += row['quantity']
+                category['amount'] += row['amount']
+        
+        last_return = None
+        for row in self.storage.return_lines(day, end):
+            if row['return_id'] != last_return:
+                last_return = row['return_id']
+                report['returns'] += 1
+            method = row['payment_method'] or ''
+            report['returned_units'] += row['quantity']
+            report['refunds'] += row['amount']
+            report['refunds_by_method'][method] = report['refunds_by_method'].get(method, 0.0) + row['amount']
+        
+        report['net_sales'] = report['gross_sales'] - report['refunds']
+        cash = report['payments'].get('cash', {}).get('amount', 0.0)
+        report['expected_cash'] = cash - report['refunds_by_method'].get('cash', 0.0)
+        return report
+    
+    def x_report(self, day: str = None) -> Dict:
+        """Take a mid-day X report and write it to a file (report['path'])"""
+        report = self.build_report(day, 'X')
+        stamp = report['generated_at'].replace('-', '').replace(':', '').replace(' ', '-')
+        report['path'] = self._write(report, f"X-{stamp}.txt")
+        return report
+    
+    def z_report(self, day: str = None) -> Dict:
+        """
+        Close a day that has ended (default yesterday): build its Z report, give it the
+        next Z number and write it to a file. The report is built and numbered in one
+        write transaction, so no sale or return can land in between uncounted; the file
+        is written once that has committed.
+        Raises ValueError if the day has not ended yet or has already been closed.
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        day = day or (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        if day >= today:
+            raise ValueError(f"{day} is still open; a Z report can only close a day that has ended")
+        with self.db.transaction():
+            report = self.build_report(day, 'Z')
+            report['z_number'] = self.storage.add_closing(
+                report['day'], report['generated_at'], report['orders'], report['net_sales'],
+                lambda z_number: self._path(f"Z{z_number:04d}-{report['day']}.txt")
+            )
+        report['path'] = self._write(report, f"Z{report['z_number']:04d}-{report['day']}.txt")
+        return report
+    
+    def render(self, report: Dict) -> str:
+        """Format a report as printable text"""
+        title = f"Z REPORT #{report['z_number']:04d}" if report['kind'] == 'Z' else "X REPORT"
+        lines = ["=" * 60, f"{title:^60}", "=" * 60,
+                 f"Business Day: {report['day']}",
+                 f"Generated:    {report['generated_at']}"]
+        if report['first_order']:
+            lines.append(f"Orders:       {report['first_order']} .. {report['last_order']}")
+        lines += ["-" * 60,
+                  f"{'Transactions':<32} {report['orders']:>14}",
+                  f"{'Line items':<32} {report['line_items']:>14}",
+                  f"{'Units sold':<32} {report['units']:>14}",
+                  f"{'Gross sales':<32} {self._money(report['gross_sales']):>14}",
+                  f"{'Returns':<32} {report['returns']:>14}",
+                  f"{'Units returned':<32} {report['returned_units']:>14}",
+                  f"{'Refunds':<32} {self._money(-report['refunds']):>14}",
+                  f"{'NET SALES':<32} {self._money(report['net_sales']):>14}",
+                  "-" * 60,
+                  f"{'Payment':<10} {'Count':>6} {'Sales':>14} {'Tendered':>14} {'Change':>14}"]
+        for method, totals in sorted(report['payments'].items()):
+            lines.append(f"{method or '-':<10} {totals['orders']:>6} {self._money(totals['amount']):>14} "
+                         f"{self._money(totals['tendered']):>14} {self._money(totals['change']):>14}")
+        for method, amount in sorted(report['refunds_by_method'].items()):
+            lines.append(f"{'refund ' + (method or '-'):<17} {self._money(-amount):>14}")
+        lines.append(f"{'Expected cash in drawer':<32} {self._money(report['expected_cash']):>14}")
+        
+        lines += ["-" * 60, f"{'Category':<32} {'Units':>8} {'Sales':>14}"]
+        for category, totals in sorted(report['categories'].items()):
+            lines.append(f"{category or '(none)':<32} {totals['units']:>8} {self._money(totals['amount']):>14}")
+        
+        lines += ["-" * 60, f"{'Hour':<32} {'Orders':>8} {'Sales':>14}"]
+        for hour, totals in sorted(report['hours'].items()):
+            lines.append(f"{hour + ':00':<32} {totals['orders']:>8} {self._money(totals['amount']):>14}")
+        lines.append("=" * 60)
+        return "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def _add_order(report: Dict, row):
+        """Fold one order's header into the report"""
+        report['orders'] += 1
+        report['gross_sales'] += row['total_amount']
+        if report['first_order'] is None:
+            report['first_order'] = row['created_at'][11:]
+        report['last_order'] = row['created_at'][11:]
+        
+        payment = report['payments'].setdefault(
+            row['payment_method'], {'orders': 0, 'amount': 0.0, 'tendered': 0.0, 'change': 0.0}
+        )
+        # Orders saved before the tendered amount was recorded count as exact payment
+        tendered = max(row['paid_amount'] or 0.0, row['total_amount'])
+        payment['orders'] += 1
+        payment['amount'] += row['total_amount']
+        payment['tendered'] += tendered
+        payment['change'] += tendered - row['total_amount']
+        
+        hour = report['hours'].setdefault(row['created_at'][11:13], {'orders': 0, 'amount': 0.0})
+        hour['orders'] += 1
+        hour['amount'] += row['total_amount']
+    
+    def _write(self, report: Dict, filename: str) -> str:
+        """Write the rendered report into the report directory"""
+        os.makedirs(self.report_dir, exist_ok=True)
+        path = self._path(filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.render(report))
+        return path
+    
+    def _path(self, filename: str) -> str:
+        """Path of a report file in the report directory"""
+        return os.path.join(self.report_dir, filename)
+    
+    @staticmethod
+    def _money(amount: float) -> str:
+        """Format an amount of money"""
+        return f"-${-amount:,.2f}" if amount < -0.005 else f"${abs(amount):,.2f}"
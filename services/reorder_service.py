@@ -0,0 +1,75 @@
+"""
+Reorder Service - Sales velocity, days of cover and reorder points for the catalog
+"""
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+from database.db_connection import DatabaseConnection
+from storage.sales_summary_storage import SalesSummaryStorage
+
+
+class ReorderService:
+    """
+    Reorder planning from the per-product running totals of the daily sales summary.
+    Velocity is the moving average of net units sold per day (sales less
+    returns) over the last window_days complete days (days without sales
+    count as zero), so often-returned items are not over-ordered. The reorder
+    point covers demand over the supplier lead time plus safety stock for the
+    day-to-day spread; a product at or below it is due for reordering, enough
+    to last the lead time and cover_days more.
+    """
+    
+    WINDOW_DAYS = 28  # Days of sales the moving average is taken over
+    LEAD_TIME_DAYS = 7  # Days from placing a purchase order to stock on the shelf
+    COVER_DAYS = 14  # Days of sales a reorder should last after it arrives
+    SAFETY_FACTOR = 1.65  # Standard deviations of lead-time demand held as safety stock (~95%)
+    
+    def __init__(self, db: DatabaseConnection = None, sales_summary: SalesSummaryStorage = None,
+                 window_days: int = WINDOW_DAYS, lead_time_days: int = LEAD_TIME_DAYS,
+                 cover_days: int = COVER_DAYS, safety_factor: float = SAFETY_FACTOR):
+        """Initialize reorder service"""
+        if window_days < 1:
+            raise ValueError("window_days must be at least 1")
+        self.db = db or DatabaseConnection()
+        self.sales_summary = sales_summary or SalesSummaryStorage(self.db)
+        self.window_days = window_days
+        self.lead_time_days = lead_time_days
+        self.cover_days = cover_days
+        self.safety_factor = safety_factor
+    
+    def forecast(self, product_ids: Iterable[str] = None, as_of: str = None) -> List[Dict]:
+        """
+        Velocity, days of cover and reorder point of every product sold in the
+        window ending before as_of ("YYYY-MM-DD", default today), or of product_ids only
+        """
+        end = as_of or datetime.now().strftime("%Y-%m-%d")
+        start = (datetime.strptime(end, "%Y-%m-%d") - timedelta(days=self.window_days)).strftime("%Y-%m-%d")
+        return [self._plan(row) for row in self.sales_summary.product_demand(start, end, product_ids)]
+    
+    def reorder_list(self, as_of: str = None, limit: int = None) -> List[Dict]:
+        """Products at or below their reorder point, fewest days of cover (then fastest selling) first"""
+        due = [item for item in self.forecast(as_of=as_of) if item['reorder']]
+        due.sort(key=lambda item: (item['days_of_cover'], -item['velocity'], item['product_id']))
+        return due if limit is None else due[:limit]
+    
+    def _plan(self, row) -> Dict:
+        """Reorder figures for one product's demand over the window"""
+        window = self.window_days
+        # Returns outweighing sales in the window leave no demand to plan for
+        velocity = max(row['units'], 0) / window
+        spread = math.sqrt(max(row['squares'] / window - velocity * velocity, 0.0))
+        safety_stock = self.safety_factor * spread * math.sqrt(self.lead_time_days)
+        reorder_point = velocity * self.lead_time_days + safety_stock
+        stock = row['stock']
+        order_up_to = reorder_point + velocity * self.cover_days
+        return {
+            'product_id': row['product_id'],
+            'name': row['name'] or '',
+            'stock': stock,
+            'velocity': velocity,
+            'days_of_cover': stock / velocity if velocity > 0 else math.inf,
+            'safety_stock': safety_stock,
+            'reorder_point': reorder_point,
+            'reorder': velocity > 0 and stock <= reorder_point,
+            'order_quantity': max(math.ceil(order_up_to - stock), 0)
+        }
@@ -0,0 +1,62 @@
+"""
+Reporting Service - Sales figures read from the maintained daily summary
+"""
+from datetime import datetime
+from typing import Dict, List
+from database.db_connection import DatabaseConnection
+from storage.sales_summary_storage import SalesSummaryStorage, DIMENSIONS
+
+
+class ReportingService:
+    """Sales reporting; every query is a primary-key lookup on sales_summary"""
+    
+    def __init__(self, db: DatabaseConnection = None, sales_summary: SalesSummaryStorage = None):
+        """Initialize reporting service"""
+        self.db = db or DatabaseConnection()
+        self.sales_summary = sales_summary or SalesSummaryStorage(self.db)
+    
+    def get_day_summary(self, day: str = None) -> Dict:
+        """Totals for a day ("YYYY-MM-DD", default today)"""
+        day = day or self._today()
+        row = self.sales_summary.get(day)
+        return self._with_net(row or {
+            'day': day, 'dimension': 'total', 'key': '', 'orders': 0, 'units': 0,
+            'revenue': 0.0, 'returns': 0, 'returned_units': 0, 'refunds': 0.0
+        })
+    
+    def get_breakdown(self, dimension: str, day: str = None, limit: int = None) -> List[Dict]:
+        """
+        A day's sales by payment_method, category or product, highest net revenue first
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{dimension}', expected one of: {', '.join(DIMENSIONS)}")
+        rows = self.sales_summary.breakdown(day or self._today(), dimension,
+                                            -1 if limit is None else limit)
+        return [self._with_net(row) for row in rows]
+    
+    def revenue_by_category(self, day: str = None) -> Dict[str, float]:
+        """Net revenue per category for a day (uncategorized products under '')"""
+        return {row['key']: row['net_revenue'] for row in self.get_breakdown('category', day)}
+    
+    def top_products(self, day: str = None, limit: int = 10) -> List[Dict]:
+        """Best-selling products of a day by net revenue"""
+        return self.get_breakdown('product', day, limit)
+    
+    def get_daily_totals(self, start_day: str, end_day: str) -> List[Dict]:
+        """Totals for each day with sales in [start_day, end_day]"""
+        return [self._with_net(row) for row in self.sales_summary.days(start_day, end_day)]
+    
+    def rebuild(self):
+        """Recompute the summary from the order and return history"""
+        self.sales_summary.rebuild()
+    
+    @staticmethod
+    def _with_net(row: dict) -> dict:
+        """Add net revenue (sales minus refunds) to a summary row"""
+        row['net_revenue'] = row['revenue'] - row['refunds']
+        return row
+    
+    @staticmethod
+    def _today() -> str:
+        """Today's date in the format orders are stamped with"""
+        return datetime.now().strftime("%Y-%m-%d")
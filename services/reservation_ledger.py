@@ -0,0 +1,160 @@
+"""
+Reservation Ledger - In-memory stock holds placed when items go into a cart
+"""
+import heapq
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+
+class ReservationLedger:
+    """
+    Tracks stock held by open orders and answers availability from memory.
+    Available stock is on-hand minus everything other orders hold. On-hand
+    levels are cached per product for stock_cache_ttl seconds (or until a
+    local write invalidates them); holds lapse hold_ttl seconds after the
+    order last changed. Holds are per process: terminals in other processes
+    are still kept honest by the conditional UPDATE at payment time.
+    """
+    
+    def __init__(self, load_on_hand: Callable[[str], int], hold_ttl: float = 600.0,
+                 stock_cache_ttl: float = 5.0):
+        """
+        Initialize reservation ledger
+        load_on_hand: reads the on-hand quantity of a product from the database
+        hold_ttl: seconds of inactivity after which an order's holds are released
+        stock_cache_ttl: seconds an on-hand level is trusted before it is re-read
+        """
+        self.load_on_hand = load_on_hand
+        self.hold_ttl = hold_ttl
+        self.stock_cache_ttl = stock_cache_ttl
+        self._lock = threading.Lock()
+        self._on_hand: Dict[str, Tuple[int, float]] = {}  # product_id -> (quantity, read_at)
+        self._held: Dict[str, int] = {}  # product_id -> quantity held by all orders
+        self._orders: Dict[str, Dict[str, int]] = {}  # order_id -> {product_id: quantity}
+        self._expires: Dict[str, float] = {}  # order_id -> deadline
+        self._deadlines: List[Tuple[float, str]] = []  # heap of (deadline, order_id), may hold stale entries
+        self._invalidations = 0  # Bumped by invalidate() so in-flight reads don't cache stale levels
+        self.stock_reads = 0
+        self.expired = 0
+    
+    def available(self, product_id: str, order_id: str = None) -> int:
+        """Stock that order_id could hold for a product (on-hand minus other orders' holds)"""
+        on_hand = self._get_on_hand(product_id)
+        with self._lock:
+            self._expire(time.monotonic())
+            own = self._orders.get(order_id, {}).get(product_id, 0) if order_id else 0
+            return on_hand - self._held.get(product_id, 0) + own
+    
+    def hold(self, order_id: str, product_id: str, quantity: int) -> Tuple[bool, int]:
+        """
+        Set an order's hold on a product to quantity (not add to it).
+        Returns: (success, available) - available is the most this order could hold
+        """
+        on_hand = self._get_on_hand(product_id)
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            holds = self._orders.setdefault(order_id, {})
+            current = holds.get(product_id, 0)
+            available = on_hand - self._held.get(product_id, 0) + current
+            if quantity > available:
+                if not holds:
+                    del self._orders[order_id]
+                return False, available
+            holds[product_id] = quantity
+            self._held[product_id] = self._held.get(product_id, 0) + quantity - current
+            self._touch(order_id, now)
+            return True, available
+    
+    def release(self, order_id: str, product_id: str = None):
+        """Release one product's hold, or every hold of the order"""
+        with self._lock:
+            holds = self._orders.get(order_id)
+            if holds is None:
+                return
+            if product_id is None:
+                self._drop_order(order_id)
+                return
+            quantity = holds.pop(product_id, 0)
+            self._unhold(product_id, quantity)
+            if not holds:
+                self._drop_order(order_id)
+    
+    def pin(self, order_id: str):
+        """Keep an order's holds until released explicitly (sold, but not yet in the database)"""
+        with self._lock:
+            self._expires.pop(order_id, None)
+    
+    def holds(self, order_id: str) -> Dict[str, int]:
+        """Get a copy of an order's holds"""
+        with self._lock:
+            self._expire(time.monotonic())
+            return dict(self._orders.get(order_id, {}))
+    
+    def invalidate(self, product_id: str):
+        """Forget the cached on-hand level after a write to that product's stock"""
+        with self._lock:
+            self._on_hand.pop(product_id, None)
+            self._invalidations += 1
+    
+    def stats(self) -> dict:
+        """Get ledger statistics"""
+        with self._lock:
+            return {
+                'orders_holding': len(self._orders),
+                'units_held': sum(self._held.values()),
+                'cached_products': len(self._on_hand),
+                'stock_reads': self.stock_reads,
+                'expired_orders': self.expired
+            }
+    
+    def _get_on_hand(self, product_id: str) -> int:
+        """Cached on-hand level, re-read from the database when stale"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._on_hand.get(product_id)
+            if cached is not None and now - cached[1] < self.stock_cache_ttl:
+                return cached[0]
+            invalidations = self._invalidations
+        # Read outside the lock so one slow query does not stall every lane
+        try:
+            quantity = self.load_on_hand(product_id)
+        except sqlite3.Error:
+            if cached is None:
+                raise
+            return cached[0]  # Database unavailable: keep selling against the last known level
+        with self._lock:
+            if self._invalidations == invalidations:
+                self._on_hand[product_id] = (quantity, now)
+            self.stock_reads += 1
+        return quantity
+    
+    def _touch(self, order_id: str, now: float):
+        """Push an order's deadline back by hold_ttl"""
+        deadline = now + self.hold_ttl
+        self._expires[order_id] = deadline
+        heapq.heappush(self._deadlines, (deadline, order_id))
+    
+    def _expire(self, now: float):
+        """Release holds of orders whose deadline has passed"""
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, order_id = heapq.heappop(self._deadlines)
+            if self._expires.get(order_id) == deadline:  # Skip entries superseded by _touch
+                self._drop_order(order_id)
+                self.expired += 1
+    
+    def _drop_order(self, order_id: str):
+        """Remove every hold of an order"""
+        for product_id, quantity in self._orders.pop(order_id, {}).items():
+            self._unhold(product_id, quantity)
+        self._expires.pop(order_id, None)
+    
+    def _unhold(self, product_id: str, quantity: int):
+        """Subtract from a product's total held quantity"""
+        remaining = self._held.get(product_id, 0) - quantity
+        if remaining > 0:
+            self._held[product_id] = remaining
+        else:
+            self._held.pop(product_id, None)
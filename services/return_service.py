@@ -6,7 +6,10 @@ from datetime import datetime
 from typing import List, Optional, Dict, Tuple
 from models.order import Order
 from models.order_item import OrderItem
+from database.db_connection import DatabaseConnection
+from database.instrumentation import instrumented
 from storage.order_storage import OrderStorage
+from storage.return_storage import ReturnStorage
 from services.inventory_service import InventoryService
 from services.payment_service import PaymentService
 
@@ -14,11 +17,15 @@ from services.payment_service import PaymentService
 class ReturnService:
     """Return service for processing returns"""
     
-    def __init__(self):
+    def __init__(self, db: DatabaseConnection = None, order_storage: OrderStorage = None,
+                 inventory_service: InventoryService = None, payment_service: PaymentService = None,
+                 return_storage: ReturnStorage = None):
         """Initialize return service"""
-        self.order_storage = OrderStorage()
-        self.inventory_service = InventoryService()
-        self.payment_service = PaymentService()
+        self.db = db or DatabaseConnection()
+        self.order_storage = order_storage or OrderStorage(self.db)
+        self.inventory_service = inventory_service or InventoryService(self.db)
+        self.payment_service = payment_service or PaymentService()
+        self.return_storage = return_storage or ReturnStorage(self.db)
     
     def find_order(self, order_id: str) -> Optional[Order]:
         """Find order by ID"""
@@ -29,17 +36,18 @@ class ReturnService:
         Get list of returnable items from order
         Returns list of items with return status
         """
+        # Purchased minus already returned, per product, from one aggregate query
+        returned = self.return_storage.returned_quantities(order.order_id)
+        closed = order.status == 'returned' or (order.status == 'partial_returned' and not returned)
         returnable = []
         for item in order.items:
-            # Calculate how many can be returned
-            # For simplicity, assume all items can be returned if order is not fully returned
-            if order.status == 'returned':
+            product_id = item.product.product_id
+            if closed:
                 returnable_qty = 0
-            elif order.status == 'partial_returned':
-                # In a real system, we'd track which items were returned
-                returnable_qty = item.quantity
             else:
-                returnable_qty = item.quantity
+                returnable_qty = max(item.quantity - returned.get(product_id, 0), 0)
+                # Repeated lines of one product share its returned quantity
+                returned[product_id] = max(returned.get(product_id, 0) - item.quantity, 0)
             
             returnable.append({
                 'item': item,
@@ -48,79 +56,85 @@ class ReturnService:
             })
         return returnable
     
+    @instrumented("return.process_return")
     def process_return(self, order_id: str, return_items: Dict[str, int], reason: str = "") -> Tuple[bool, str, dict]:
         """
         Process return for an order
         return_items: {product_id: quantity_to_return}
         Returns: (success, message, return_info)
         """
-        # Get order
-        order = self.find_order(order_id)
-        if order is None:
-            return False, f"Order not found: {order_id}", {}
+        return_items = {pid: qty for pid, qty in return_items.items() if qty > 0}
         
-        if order.status == 'returned':
-            return False, "Order has already been fully returned", {}
-        
-        # Validate return items
-        return_amount = 0.0
-        items_to_return = []
-        
-        for product_id, return_qty in return_items.items():
-            if return_qty <= 0:
-                continue
-            
-            # Find item in order
-            order_item = None
-            for item in order.items:
-                if item.product.product_id == product_id:
-                    order_item = item
-                    break
-            
-            if order_item is None:
-                return False, f"Product {product_id} not found in order", {}
-            
-            if return_qty > order_item.quantity:
-                return False, f"Cannot return more than purchased for {order_item.product.name}", {}
-            
-            items_to_return.append({
-                'item': order_item,
-                'quantity': return_qty,
-                'refund_amount': order_item.unit_price * return_qty
-            })
-            return_amount += order_item.unit_price * return_qty
-        
-        if len(items_to_return) == 0:
-            return False, "No items to return", {}
-        
-        # Process return
-        # Restore inventory
-        for return_item in items_to_return:
-            self.inventory_service.add_stock(
-                return_item['item'].product.product_id,
-                return_item['quantity']
-            )
-        
-        # Update order status
-        total_returned = sum(ri['quantity'] for ri in items_to_return)
-        total_ordered = sum(item.quantity for item in order.items)
-        
-        if total_returned >= total_ordered:
-            order.status = 'returned'
-            order.payment_status = 'refunded'
-        else:
-            order.status = 'partial_returned'
-        
-        # Update order in storage
-        self.order_storage.update(order)
+        # Validate against the ledger and record the return as one transaction,
+        # so concurrent returns of the same order cannot both pass the check
+        try:
+            with self.db.transaction():
+                status = self.order_storage.get_status(order_id)
+                if status is None:
+                    return False, f"Order not found: {order_id}", {}
+                
+                if status[0] == 'returned':
+                    return False, "Order has already been fully returned", {}
+                
+                if status[0] == 'partial_returned' and not self.return_storage.has_returns(order_id):
+                    # Partly returned before returns were itemized: what is left is unknown
+                    return False, "Order was partly returned before returns were itemized; process further returns manually", {}
+                
+                if len(return_items) == 0:
+                    return False, "No items to return", {}
+                
+                # Only the lines being returned are read
+                order_items = self.order_storage.get_items(order_id, return_items)
+                returned = self.return_storage.returned_quantities(order_id, return_items)
+                
+                return_amount = 0.0
+                items_to_return = []
+                for product_id, return_qty in return_items.items():
+                    order_item = order_items.get(product_id)
+                    if order_item is None:
+                        raise ValueError(f"Product {product_id} not found in order")
+                    
+                    if return_qty > order_item.quantity - returned.get(product_id, 0):
+                        raise ValueError(f"Cannot return more than purchased for {order_item.product.name}")
+                    
+                    items_to_return.append({
+                        'item': order_item,
+                        'quantity': return_qty,
+                        'refund_amount': order_item.unit_price * return_qty
+                    })
+                    return_amount += order_item.unit_price * return_qty
+                
+                return_id = f"RET-{datetime.now().strftime('%Y%m%d%H%M%S')}-{str(uuid.uuid4())[:8].upper()}"
+                return_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                
+                # Restore inventory and append the return to the ledger
+                for return_item in items_to_return:
+                    self.inventory_service.add_stock(
+                        return_item['item'].product.product_id,
+                        return_item['quantity']
+                    )
+                self.return_storage.add(
+                    return_id, order_id,
+                    [(ri['item'].product.product_id, ri['quantity'], ri['item'].unit_price)
+                     for ri in items_to_return],
+                    return_amount, reason, return_time
+                )
+                
+                # Update order status
+                if self.return_storage.outstanding_units(order_id) <= 0:
+                    self.order_storage.update_status(order_id, 'returned', 'refunded')
+                else:
+                    self.order_storage.update_status(order_id, 'partial_returned')
+        except ValueError as e:
+            return False, str(e), {}
         
         return_info = {
+            'return_id': return_id,
             'order_id': order_id,
             'return_amount': return_amount,
             'items': items_to_return,
             'reason': reason,
-            'return_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            'return_time': return_time
         }
         
         return True, "Return processed successfully", return_info
-
@@ -4,6 +4,10 @@ Storage Module
 from .product_storage import ProductStorage
 from .order_storage import OrderStorage
 from .inventory_storage import InventoryStorage
+from .return_storage import ReturnStorage
+from .sales_summary_storage import SalesSummaryStorage
+from .register_report_storage import RegisterReportStorage
 
-__all__ = ['ProductStorage', 'OrderStorage', 'InventoryStorage']
+__all__ = ['ProductStorage', 'OrderStorage', 'InventoryStorage', 'ReturnStorage',
+           'SalesSummaryStorage', 'RegisterReportStorage']
 
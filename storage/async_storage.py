@@ -0,0 +1,155 @@
+"""
+Async Storage - Awaitable facades over the SQLite storage classes
+
+Each facade wraps a synchronous storage and runs reads on the executor's
+reader pool and writes on its single writer thread, so an event loop can
+serve many terminals without blocking on SQLite.
+"""
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from models.product import Product
+from models.order import Order
+from database.async_executor import DatabaseExecutor
+from storage.product_storage import ProductStorage
+from storage.order_storage import OrderStorage
+from storage.inventory_storage import InventoryStorage
+
+
+class AsyncProductStorage:
+    """Async product storage"""
+    
+    def __init__(self, storage: ProductStorage, executor: DatabaseExecutor):
+        """Initialize async product storage"""
+        self.storage = storage
+        self.executor = executor
+    
+    async def get_by_id(self, product_id: str) -> Optional[Product]:
+        """Get product by ID"""
+        return await self.executor.read(self.storage.get_by_id, product_id)
+    
+    async def get_by_barcode(self, barcode: str) -> Optional[Product]:
+        """Get product by barcode"""
+        return await self.executor.read(self.storage.get_by_barcode, barcode)
+    
+    async def resolve(self, code: str) -> Optional[Product]:
+        """Find a product by ID or barcode"""
+        # Stays on the executor even with an index: a coherence check may reload it
+        return await self.executor.read(self.storage.resolve, code)
+    
+    async def get_many(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Get several products by ID"""
+        return await self.executor.read(self.storage.get_many, list(product_ids))
+    
+    async def search(self, text: str, limit: int = 20) -> List[Tuple[Product, int]]:
+        """Search products by name or category"""
+        return await self.executor.read(self.storage.search, text, limit)
+    
+    async def is_empty(self) -> bool:
+        """Check whether the catalog has no products"""
+        return await self.executor.read(self.storage.is_empty)
+    
+    async def add(self, product: Product) -> bool:
+        """Add new product"""
+        return await self.executor.write(self.storage.add, product)
+    
+    async def add_many(self, products: List[Product]) -> int:
+        """Add several products"""
+        return await self.executor.write(self.storage.add_many, products)
+    
+    async def update(self, product: Product) -> bool:
+        """Update existing product"""
+        return await self.executor.write(self.storage.update, product)
+    
+    async def delete(self, product_id: str) -> bool:
+        """Delete product"""
+        return await self.executor.write(self.storage.delete, product_id)
+
+
+class AsyncOrderStorage:
+    """Async order storage"""
+    
+    def __init__(self, storage: OrderStorage, executor: DatabaseExecutor):
+        """Initialize async order storage"""
+        self.storage = storage
+        self.executor = executor
+    
+    async def get_by_id(self, order_id: str) -> Optional[Order]:
+        """Get order by ID"""
+        return await self.executor.read(self.storage.get_by_id, order_id)
+    
+    async def exists(self, order_id: str) -> bool:
+        """Check whether an order exists"""
+        return await self.executor.read(self.storage.exists, order_id)
+    
+    async def query(self, status: str = None, payment_status: str = None, payment_method: str = None,
+                    start_date: str = None, end_date: str = None,
+                    after: Tuple[str, str] = None,
+                    limit: int = 50) -> Tuple[List[Order], Optional[Tuple[str, str]]]:
+        """Query one page of orders newest first (see OrderStorage.query)"""
+        return await self.executor.read(self.storage.query, status, payment_status, payment_method,
+                                        start_date, end_date, after, limit)
+    
+    async def iter_orders(self, status: str = None, payment_status: str = None,
+                          payment_method: str = None, start_date: str = None, end_date: str = None,
+                          batch_size: int = 500) -> AsyncIterator[Order]:
+        """Stream matching orders newest first, one page per executor call"""
+        after = None
+        while True:
+            orders, after = await self.query(status, payment_status, payment_method,
+                                             start_date, end_date, after, batch_size)
+            for order in orders:
+                yield order
+            if after is None:
+                return
+    
+    async def add(self, order: Order) -> bool:
+        """Add new order"""
+        return await self.executor.write(self.storage.add, order)
+    
+    async def add_many(self, orders: List[Order]) -> int:
+        """Add several orders"""
+        return await self.executor.write(self.storage.add_many, orders)
+    
+    async def update(self, order: Order) -> bool:
+        """Update existing order"""
+        return await self.executor.write(self.storage.update, order)
+
+
+class AsyncInventoryStorage:
+    """Async inventory storage"""
+    
+    def __init__(self, storage: InventoryStorage, executor: DatabaseExecutor):
+        """Initialize async inventory storage"""
+        self.storage = storage
+        self.executor = executor
+    
+    async def get_quantity(self, product_id: str) -> int:
+        """Get inventory quantity for product"""
+        return await self.executor.read(self.storage.get_quantity, product_id)
+    
+    async def has_stock(self, product_id: str, quantity: int) -> bool:
+        """Check if there is enough stock"""
+        return await self.executor.read(self.storage.has_stock, product_id, quantity)
+    
+    async def report_rows(self, after: str = None, limit: int = 500) -> List:
+        """Get one page of products with their stock"""
+        return await self.executor.read(self.storage.report_rows, after, limit)
+    
+    async def summary(self, low_stock_threshold: int) -> dict:
+        """Get catalog-wide stock counts"""
+        return await self.executor.read(self.storage.summary, low_stock_threshold)
+    
+    async def set_quantity(self, product_id: str, quantity: int):
+        """Set inventory quantity for product"""
+        return await self.executor.write(self.storage.set_quantity, product_id, quantity)
+    
+    async def set_many(self, quantities: Dict[str, int]):
+        """Set several quantities"""
+        return await self.executor.write(self.storage.set_many, quantities)
+    
+    async def add_quantity(self, product_id: str, quantity: int):
+        """Add to inventory quantity"""
+        return await self.executor.write(self.storage.add_quantity, product_id, quantity)
+    
+    async def reduce_quantity(self, product_id: str, quantity: int) -> bool:
+        """Reduce inventory quantity (returns False if stock is insufficient)"""
+        return await self.executor.write(self.storage.reduce_quantity, product_id, quantity)
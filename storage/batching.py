@@ -0,0 +1,15 @@
+"""
+Batching - Split long ID lists into IN (...) queries
+"""
+from typing import Iterable, Iterator, List, Tuple
+
+# Keep IN (...) lists well under SQLite's host parameter limit
+IN_BATCH_SIZE = 500
+
+
+def in_batches(values: Iterable, size: int = IN_BATCH_SIZE) -> Iterator[Tuple[List, str]]:
+    """Yield (batch, placeholders) for each run of up to size values, e.g. ([a, b], "?, ?")"""
+    values = list(values)
+    for start in range(0, len(values), size):
+        batch = values[start:start + size]
+        yield batch, ", ".join("?" * len(batch))
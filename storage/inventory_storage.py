@@ -1,7 +1,7 @@
 """
 Inventory Storage - SQLite database storage for inventory
 """
-from typing import Dict
+from typing import Dict, List
 from database.db_connection import DatabaseConnection
 from storage.product_storage import ProductStorage
 
@@ -9,10 +9,10 @@ from storage.product_storage import ProductStorage
 class InventoryStorage:
     """Inventory storage using SQLite database"""
     
-    def __init__(self, db: DatabaseConnection = None):
+    def __init__(self, db: DatabaseConnection = None, product_storage: ProductStorage = None):
         """Initialize inventory storage"""
         self.db = db or DatabaseConnection()
-        self.product_storage = ProductStorage(self.db)
+        self.product_storage = product_storage or ProductStorage(self.db)
     
     def load_all(self) -> Dict[str, int]:
         """Load all inventory from database"""
@@ -28,50 +28,86 @@ class InventoryStorage:
         return row['quantity'] if row else 0
     
     def set_quantity(self, product_id: str, quantity: int):
-        """Set inventory quantity for a product"""
+        """Set inventory quantity for a product (single-statement upsert)"""
         quantity = max(0, quantity)  # Ensure non-negative
-        
-        # Check if record exists
-        existing = self.db.fetch_one(
-            "SELECT product_id FROM inventory WHERE product_id = ?",
-            (product_id,)
+        self.db.execute(
+            """INSERT INTO inventory (product_id, quantity) VALUES (?, ?)
+               ON CONFLICT(product_id) DO UPDATE SET quantity = excluded.quantity""",
+            (product_id, quantity)
         )
-        
-        if existing:
-            self.db.execute(
-                "UPDATE inventory SET quantity = ? WHERE product_id = ?",
-                (quantity, product_id)
-            )
-        else:
-            self.db.execute(
-                "INSERT INTO inventory (product_id, quantity) VALUES (?, ?)",
-                (product_id, quantity)
+    
+    def set_many(self, quantities: Dict[str, int]):
+        """Set inventory quantities for many products in one executemany"""
+        if quantities:
+            self.db.execute_many(
+                """INSERT INTO inventory (product_id, quantity) VALUES (?, ?)
+                   ON CONFLICT(product_id) DO UPDATE SET quantity = excluded.quantity""",
+                [(product_id, max(0, qty)) for product_id, qty in quantities.items()]
             )
     
     def add_quantity(self, product_id: str, quantity: int):
-        """Add quantity to inventory"""
-        current = self.get_quantity(product_id)
-        self.set_quantity(product_id, current + quantity)
+        """Add quantity to inventory (single-statement upsert)"""
+        self.db.execute(
+            """INSERT INTO inventory (product_id, quantity) VALUES (?, MAX(?, 0))
+               ON CONFLICT(product_id) DO UPDATE SET quantity = MAX(quantity + ?, 0)""",
+            (product_id, quantity, quantity)
+        )
     
     def reduce_quantity(self, product_id: str, quantity: int) -> bool:
-        """Reduce quantity from inventory, returns True if successful"""
-        current = self.get_quantity(product_id)
-        if current >= quantity:
-            self.set_quantity(product_id, current - quantity)
-            return True
-        return False
+        """
+        Reduce quantity from inventory, returns True if successful.
+        The stock check and decrement are one conditional UPDATE, so concurrent
+        terminals can never take stock below zero.
+        """
+        cursor = self.db.execute(
+            """UPDATE inventory SET quantity = quantity - ?
+               WHERE product_id = ? AND quantity >= ?""",
+            (quantity, product_id, quantity)
+        )
+        return cursor.rowcount == 1
     
     def has_stock(self, product_id: str, quantity: int) -> bool:
         """Check if there is enough stock"""
         return self.get_quantity(product_id) >= quantity
     
+    def report_rows(self, after: str = None, limit: int = 500) -> List:
+        """
+        Get one page of products with their stock, ordered by product_id.
+        after is the last product_id of the previous page.
+        """
+        return self.db.fetch_all(
+            """SELECT p.product_id, p.name, COALESCE(i.quantity, 0) AS quantity
+               FROM products p
+               LEFT JOIN inventory i ON i.product_id = p.product_id
+               WHERE p.product_id > ?
+               ORDER BY p.product_id
+               LIMIT ?""",
+            (after if after is not None else "", limit)
+        )
+    
+    def summary(self, low_stock_threshold: int) -> dict:
+        """Get catalog-wide stock counts in one aggregate query"""
+        row = self.db.fetch_one(
+            """SELECT COUNT(*) AS total_products,
+                      COALESCE(SUM(quantity > 0), 0) AS in_stock,
+                      COALESCE(SUM(quantity = 0), 0) AS out_of_stock,
+                      COALESCE(SUM(quantity > 0 AND quantity < ?), 0) AS low_stock,
+                      COALESCE(SUM(quantity), 0) AS total_items
+               FROM (SELECT COALESCE(i.quantity, 0) AS quantity
+                     FROM products p
+                     LEFT JOIN inventory i ON i.product_id = p.product_id)""",
+            (low_stock_threshold,)
+        )
+        return dict(row)
+    
     def save_all(self, inventory: Dict[str, int]):
         """Save all inventory (useful for migration)"""
-        # Clear existing inventory
-        self.db.execute("DELETE FROM inventory")
-        # Insert all inventory records
-        if inventory:
-            self.db.execute_many(
-                "INSERT INTO inventory (product_id, quantity) VALUES (?, ?)",
-                [(product_id, qty) for product_id, qty in inventory.items()]
-            )
+        with self.db.transaction():
+            # Clear existing inventory
+            self.db.execute("DELETE FROM inventory")
+            # Insert all inventory records
+            if inventory:
+                self.db.execute_many(
+                    "INSERT INTO inventory (product_id, quantity) VALUES (?, ?)",
+                    [(product_id, qty) for product_id, qty in inventory.items()]
+                )
@@ -1,33 +1,39 @@
 """
 Order Storage - SQLite database storage for orders
 """
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from models.order import Order
 from models.order_item import OrderItem
 from models.product import Product
 from database.db_connection import DatabaseConnection
 from storage.product_storage import ProductStorage
+from storage.batching import in_batches
+from storage.sales_summary_storage import SalesSummaryStorage
 
 
 class OrderStorage:
     """Order storage using SQLite database"""
     
-    def __init__(self, db: DatabaseConnection = None):
-        """Initialize order storage"""
+    def __init__(self, db: DatabaseConnection = None, product_storage: ProductStorage = None,
+                 sales_summary: SalesSummaryStorage = None):
+        """Initialize order storage (every write also adjusts the sales summary)"""
         self.db = db or DatabaseConnection()
-        self.product_storage = ProductStorage(self.db)
+        self.product_storage = product_storage or ProductStorage(self.db)
+        self.sales_summary = sales_summary or SalesSummaryStorage(self.db)
     
     def load_all(self) -> List[Order]:
-        """Load all orders from database"""
-        orders = []
+        """Load all orders from database (three queries regardless of order count)"""
         order_rows = self.db.fetch_all("SELECT * FROM orders ORDER BY created_at DESC")
-        
-        for order_row in order_rows:
-            order = self._load_order_with_items(order_row['order_id'])
-            if order:
-                orders.append(order)
-        
-        return orders
+        if not order_rows:
+            return []
+        item_rows = self.db.fetch_all(
+            "SELECT order_key, product_id, quantity, unit_price FROM order_items ORDER BY id"
+        )
+        product_rows = self.db.fetch_all(
+            "SELECT * FROM products WHERE product_id IN (SELECT DISTINCT product_id FROM order_items)"
+        )
+        products = {row['product_id']: self.product_storage._row_to_product(row) for row in product_rows}
+        return self._build_orders(order_rows, item_rows, products)
     
     def get_by_id(self, order_id: str) -> Optional[Order]:
         """Get order by ID"""
@@ -38,105 +44,285 @@ class OrderStorage:
         if not order_row:
             return None
         
-        return self._load_order_with_items(order_id)
+        return self._hydrate_orders([order_row])[0]
     
-    def _load_order_with_items(self, order_id: str) -> Optional[Order]:
-        """Load order with its items"""
-        order_row = self.db.fetch_one(
-            "SELECT * FROM orders WHERE order_id = ?",
-            (order_id,)
-        )
-        if not order_row:
-            return None
+    def query(self, status: str = None, payment_status: str = None, payment_method: str = None,
+              start_date: str = None, end_date: str = None,
+              after: Tuple[str, str] = None, limit: int = 50) -> Tuple[List[Order], Optional[Tuple[str, str]]]:
+        """
+        Query orders newest first with keyset pagination.
+        start_date is inclusive and end_date exclusive ("YYYY-MM-DD" or full timestamps).
+        after is the cursor returned by the previous page.
+        Returns: (orders, next_cursor) - next_cursor is None on the last page
+        """
+        rows = self._query_rows(status, payment_status, payment_method,
+                                start_date, end_date, after, limit + 1)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]['created_at'], rows[-1]['order_id'])
+        return self._hydrate_orders(rows), next_cursor
+    
+    def iter_orders(self, status: str = None, payment_status: str = None, payment_method: str = None,
+                    start_date: str = None, end_date: str = None,
+                    batch_size: int = 500) -> Iterator[Order]:
+        """Stream matching orders newest first, holding at most one batch in memory"""
+        products: Dict[str, Product] = {}
+        after = None
+        while True:
+            rows = self._query_rows(status, payment_status, payment_method,
+                                    start_date, end_date, after, batch_size)
+            if not rows:
+                return
+            yield from self._hydrate_orders(rows, products)
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1]['created_at'], rows[-1]['order_id'])
+    
+    def _query_rows(self, status, payment_status, payment_method,
+                    start_date, end_date, after, limit) -> list:
+        """Fetch one page of order rows matching the filters"""
+        conditions = []
+        params = []
+        for column, value in (('status', status),
+                              ('payment_status', payment_status),
+                              ('payment_method', payment_method)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if start_date is not None:
+            conditions.append("created_at >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append("created_at < ?")
+            params.append(end_date)
+        if after is not None:
+            conditions.append("(created_at, order_id) < (?, ?)")
+            params.extend(after)
         
-        # Load order items
-        item_rows = self.db.fetch_all(
-            "SELECT * FROM order_items WHERE order_id = ?",
-            (order_id,)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        return self.db.fetch_all(
+            f"SELECT * FROM orders {where} ORDER BY created_at DESC, order_id DESC LIMIT ?",
+            tuple(params)
         )
+    
+    def _hydrate_orders(self, order_rows: list, products: Dict[str, Product] = None) -> List[Order]:
+        """
+        Build orders for the given order rows with batched item and product queries.
+        products is an identity map shared across calls so each Product is loaded once.
+        """
+        if products is None:
+            products = {}
         
-        items = []
+        order_keys = [row['order_key'] for row in order_rows]
+        item_rows = []
+        for batch, placeholders in in_batches(order_keys):
+            item_rows.extend(self.db.fetch_all(
+                f"""SELECT order_key, product_id, quantity, unit_price FROM order_items
+                    WHERE order_key IN ({placeholders}) ORDER BY id""",
+                tuple(batch)
+            ))
+        
+        missing = {row['product_id'] for row in item_rows} - products.keys()
+        if missing:
+            products.update(self.product_storage.get_many(missing))
+        
+        return self._build_orders(order_rows, item_rows, products)
+    
+    def _build_orders(self, order_rows: list, item_rows: list, products: Dict[str, Product]) -> List[Order]:
+        """Assemble Order objects from pre-fetched rows"""
+        items_by_order = {row['order_key']: [] for row in order_rows}
         for item_row in item_rows:
-            product = self.product_storage.get_by_id(item_row['product_id'])
-            if product:
-                item = OrderItem(
+            items = items_by_order.get(item_row['order_key'])
+            product = products.get(item_row['product_id'])
+            if items is not None and product:
+                items.append(OrderItem(
                     product=product,
                     quantity=item_row['quantity'],
                     unit_price=item_row['unit_price']
-                )
-                items.append(item)
+                ))
         
-        order = Order(
-            order_id=order_row['order_id'],
-            items=items,
-            total_amount=order_row['total_amount'],
-            payment_method=order_row['payment_method'],
-            payment_status=order_row['payment_status'],
-            created_at=order_row['created_at'],
-            status=order_row['status']
+        return [
+            Order(
+                order_id=order_row['order_id'],
+                items=items_by_order[order_row['order_key']],
+                total_amount=order_row['total_amount'],
+                payment_method=order_row['payment_method'],
+                payment_status=order_row['payment_status'],
+                created_at=order_row['created_at'],
+                status=order_row['status'],
+                paid_amount=order_row['paid_amount']
+            )
+            for order_row in order_rows
+        ]
+    
+    def get_status(self, order_id: str) -> Optional[Tuple[str, str]]:
+        """Get (status, payment_status) of an order without loading its items"""
+        row = self.db.fetch_one(
+            "SELECT status, payment_status FROM orders WHERE order_id = ?",
+            (order_id,)
         )
-        return order
+        return (row['status'], row['payment_status']) if row else None
+    
+    def get_items(self, order_id: str, product_ids: Iterable[str]) -> Dict[str, OrderItem]:
+        """Get an order's lines for the given products only, keyed by product_id"""
+        item_rows = []
+        for batch, placeholders in in_batches(product_ids):
+            item_rows.extend(self.db.fetch_all(
+                f"""SELECT product_id, SUM(quantity) AS quantity, MIN(unit_price) AS unit_price
+                    FROM order_items
+                    WHERE order_key = (SELECT order_key FROM orders WHERE order_id = ?)
+                      AND product_id IN ({placeholders})
+                    GROUP BY product_id""",
+                (order_id, *batch)
+            ))
+        products = self.product_storage.get_many(row['product_id'] for row in item_rows)
+        return {
+            row['product_id']: OrderItem(
+                product=products[row['product_id']],
+                quantity=row['quantity'],
+                unit_price=row['unit_price']
+            )
+            for row in item_rows if row['product_id'] in products
+        }
+    
+    def exists(self, order_id: str) -> bool:
+        """Check whether an order exists without loading it"""
+        row = self.db.fetch_one(
+            "SELECT 1 FROM orders WHERE order_id = ?",
+            (order_id,)
+        )
+        return row is not None
+    
+    def missing_ids(self, order_ids: List[str]) -> Set[str]:
+        """Get the order IDs that are not stored yet"""
+        existing = set()
+        for batch, placeholders in in_batches(order_ids):
+            rows = self.db.fetch_all(
+                f"SELECT order_id FROM orders WHERE order_id IN ({placeholders})",
+                tuple(batch)
+            )
+            existing.update(row['order_id'] for row in rows)
+        return set(order_ids) - existing
     
     def add(self, order: Order) -> bool:
         """Add a new order"""
-        # Check if order already exists
-        existing = self.get_by_id(order.order_id)
-        if existing:
-            return False
+        with self.db.transaction():
+            # Check if order already exists
+            if self.exists(order.order_id):
+                return False
+            
+            # Insert order (SQLite assigns the next order_key)
+            cursor = self.db.execute(
+                """INSERT INTO orders (order_id, total_amount, payment_method, 
+                   payment_status, created_at, status, paid_amount)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (order.order_id, order.total_amount, order.payment_method,
+                 order.payment_status, order.created_at, order.status, order.paid_amount)
+            )
+            
+            # Insert order items
+            self._insert_items(cursor.lastrowid, order)
+            self.sales_summary.record_orders(cursor.lastrowid, cursor.lastrowid)
         
-        # Insert order
-        self.db.execute(
-            """INSERT INTO orders (order_id, total_amount, payment_method, 
-               payment_status, created_at, status)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (order.order_id, order.total_amount, order.payment_method,
-             order.payment_status, order.created_at, order.status)
-        )
+        return True
+    
+    def add_many(self, orders: List[Order]) -> int:
+        """Add orders and their items with batched statements, skipping existing IDs; returns orders inserted"""
+        if not orders:
+            return 0
         
-        # Insert order items
-        if order.items:
+        with self.db.transaction():
+            missing = self.missing_ids([order.order_id for order in orders])
+            new_orders = {order.order_id: order for order in orders if order.order_id in missing}
+            if not new_orders:
+                return 0
+            
+            # Keys are handed out in batch order; safe because the transaction holds the write lock
+            first_key = self.db.fetch_one("SELECT COALESCE(MAX(order_key), 0) + 1 FROM orders")[0]
+            keyed = list(enumerate(new_orders.values(), first_key))
+            self.db.execute_many(
+                """INSERT INTO orders (order_key, order_id, total_amount, payment_method, 
+                   payment_status, created_at, status, paid_amount)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(key, order.order_id, order.total_amount, order.payment_method,
+                  order.payment_status, order.created_at, order.status, order.paid_amount)
+                 for key, order in keyed]
+            )
             self.db.execute_many(
-                """INSERT INTO order_items (order_id, product_id, quantity, unit_price)
+                """INSERT INTO order_items (order_key, product_id, quantity, unit_price)
                    VALUES (?, ?, ?, ?)""",
-                [(order.order_id, item.product.product_id, item.quantity, item.unit_price)
-                 for item in order.items]
+                [(key, item.product.product_id, item.quantity, item.unit_price)
+                 for key, order in keyed for item in order.items]
             )
-        
-        return True
+            self.sales_summary.record_orders(first_key, first_key + len(keyed) - 1)
+        return len(new_orders)
     
     def update(self, order: Order) -> bool:
         """Update an existing order"""
-        existing = self.get_by_id(order.order_id)
-        if not existing:
-            return False
+        with self.db.transaction():
+            if not self.exists(order.order_id):
+                return False
+            self._update_order(order)
+        return True
+    
+    def update_status(self, order_id: str, status: str, payment_status: str = None) -> bool:
+        """Change an order's status (and optionally payment status) without touching its items"""
+        if payment_status is None:
+            cursor = self.db.execute(
+                "UPDATE orders SET status = ? WHERE order_id = ?",
+                (status, order_id)
+            )
+        else:
+            cursor = self.db.execute(
+                "UPDATE orders SET status = ?, payment_status = ? WHERE order_id = ?",
+                (status, payment_status, order_id)
+            )
+        return cursor.rowcount > 0
+    
+    def _update_order(self, order: Order):
+        """Rewrite an order row and its items"""
+        order_key = self.db.fetch_one(
+            "SELECT order_key FROM orders WHERE order_id = ?",
+            (order.order_id,)
+        )['order_key']
+        self.sales_summary.record_orders(order_key, order_key, sign=-1)
         
         # Update order
         self.db.execute(
             """UPDATE orders 
-               SET total_amount = ?, payment_method = ?, payment_status = ?, status = ?
+               SET total_amount = ?, payment_method = ?, payment_status = ?, status = ?,
+                   paid_amount = ?
                WHERE order_id = ?""",
             (order.total_amount, order.payment_method,
-             order.payment_status, order.status, order.order_id)
+             order.payment_status, order.status, order.paid_amount, order.order_id)
         )
         
         # Delete existing items and insert new ones
-        self.db.execute("DELETE FROM order_items WHERE order_id = ?", (order.order_id,))
-        
+        self.db.execute("DELETE FROM order_items WHERE order_key = ?", (order_key,))
+        self._insert_items(order_key, order)
+        self.sales_summary.record_orders(order_key, order_key)
+    
+    def _insert_items(self, order_key: int, order: Order):
+        """Insert an order's items under its order_key"""
         if order.items:
             self.db.execute_many(
-                """INSERT INTO order_items (order_id, product_id, quantity, unit_price)
+                """INSERT INTO order_items (order_key, product_id, quantity, unit_price)
                    VALUES (?, ?, ?, ?)""",
-                [(order.order_id, item.product.product_id, item.quantity, item.unit_price)
+                [(order_key, item.product.product_id, item.quantity, item.unit_price)
                  for item in order.items]
             )
-        
-        return True
     
     def save_all(self, orders: List[Order]):
         """Save all orders (useful for migration)"""
-        # Clear existing orders
-        self.db.execute("DELETE FROM order_items")
-        self.db.execute("DELETE FROM orders")
-        # Insert all orders
-        for order in orders:
-            self.add(order)
+        with self.db.transaction():
+            # Clear existing orders and the returns recorded against them
+            self.db.execute("DELETE FROM return_items")
+            self.db.execute("DELETE FROM returns")
+            self.db.execute("DELETE FROM order_items")
+            self.db.execute("DELETE FROM orders")
+            self.db.execute("DELETE FROM sales_summary")
+            # Insert all orders
+            for order in orders:
+                self.add(order)
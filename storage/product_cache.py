@@ -0,0 +1,98 @@
+"""
+Product Cache - Bounded LRU cache of products keyed by ID and barcode
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from models.product import Product
+
+
+class ProductCache:
+    """Thread-safe LRU cache of Product objects with hit/miss counters"""
+    
+    def __init__(self, max_size: int = 50000):
+        """Initialize product cache"""
+        if max_size < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.max_size = max_size
+        self._products: "OrderedDict[str, Product]" = OrderedDict()
+        self._barcodes: Dict[str, str] = {}  # barcode -> product_id for cached products
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, product_id: str) -> Optional[Product]:
+        """Get cached product by ID"""
+        with self._lock:
+            product = self._products.get(product_id)
+            if product is None:
+                self.misses += 1
+                return None
+            self._products.move_to_end(product_id)
+            self.hits += 1
+            return product
+    
+    def get_by_barcode(self, barcode: str) -> Optional[Product]:
+        """Get cached product by barcode"""
+        with self._lock:
+            product_id = self._barcodes.get(barcode)
+            if product_id is None:
+                self.misses += 1
+                return None
+            self._products.move_to_end(product_id)
+            self.hits += 1
+            return self._products[product_id]
+    
+    def put(self, product: Product):
+        """Add or replace a product in the cache"""
+        with self._lock:
+            self._remove(product.product_id)
+            self._products[product.product_id] = product
+            if product.barcode:
+                self._barcodes[product.barcode] = product.product_id
+            while len(self._products) > self.max_size:
+                _, evicted = self._products.popitem(last=False)
+                self._forget_barcode(evicted)
+                self.evictions += 1
+    
+    def invalidate(self, product_id: str, barcode: Optional[str] = None):
+        """Drop one product, and whatever product is cached under barcode, from the cache"""
+        with self._lock:
+            self._remove(product_id)
+            if barcode and barcode in self._barcodes:
+                self._remove(self._barcodes[barcode])
+            self.invalidations += 1
+    
+    def clear(self):
+        """Drop every cached product"""
+        with self._lock:
+            self._products.clear()
+            self._barcodes.clear()
+            self.invalidations += 1
+    
+    def stats(self) -> dict:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._products),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+    
+    def _remove(self, product_id: str):
+        """Remove a product and its barcode mapping (lock must be held)"""
+        product = self._products.pop(product_id, None)
+        if product is not None:
+            self._forget_barcode(product)
+    
+    def _forget_barcode(self, product: Product):
+        """Remove the barcode mapping for a product (lock must be held)"""
+        if product.barcode and self._barcodes.get(product.barcode) == product.product_id:
+            del self._barcodes[product.barcode]
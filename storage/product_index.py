@@ -0,0 +1,125 @@
+"""
+Product Index - Preloaded in-memory lookup of products by ID or barcode
+"""
+import threading
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+from models.product import Product
+from database.change_watcher import ChangeWatcher
+
+
+class ProductIndex:
+    """
+    Hash index over the whole catalog keyed by both product_id and barcode.
+    Built with a single query at startup so a scan resolves without touching SQLite.
+    """
+    
+    def __init__(self, product_storage, coherence_interval: float = 1.0, background: bool = False):
+        """
+        Initialize product index
+        product_storage: ProductStorage used to (re)load the catalog
+        coherence_interval: seconds between checks for catalog changes made elsewhere
+        background: build the index on a daemon thread instead of blocking startup
+        """
+        self.product_storage = product_storage
+        self._by_id: Dict[str, Product] = {}
+        self._by_barcode: Dict[str, Product] = {}
+        self._watcher = ChangeWatcher(
+            product_storage.db, "SELECT version FROM catalog_version WHERE id = 1", coherence_interval
+        )
+        self.reloads = 0
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._pending: Optional[List[Tuple[str, Optional[Product]]]] = None  # Local writes made during a load
+        self._loader: Optional[threading.Thread] = None
+        if background:
+            self.refresh()
+        else:
+            self.load()
+    
+    @property
+    def ready(self) -> bool:
+        """Whether the initial load has finished"""
+        return self._ready.is_set()
+    
+    @property
+    def refreshing(self) -> bool:
+        """Whether a background rebuild is running (the index may miss recent products)"""
+        return self._loader is not None and self._loader.is_alive()
+    
+    def load(self):
+        """(Re)build the index from the database"""
+        with self._lock:
+            self._pending = []
+        by_id = {}
+        by_barcode = {}
+        for product in self.product_storage.load_all():
+            by_id[product.product_id] = product
+            if product.barcode:
+                by_barcode[product.barcode] = product
+        with self._lock:
+            # The snapshot may predate writes committed while it was read; replay them
+            for product_id, product in self._pending:
+                self._apply(by_id, by_barcode, product_id, product)
+            self._pending = None
+            # Swap whole dicts so concurrent readers never see a half-built index
+            self._by_id, self._by_barcode = by_id, by_barcode
+        self.reloads += 1
+        self._ready.set()
+    
+    def refresh(self):
+        """Rebuild the index on a background thread (no-op if one is already running)"""
+        with self._lock:
+            if self.refreshing:
+                return
+            self._loader = threading.Thread(target=self.load, name="product-index-load", daemon=True)
+            self._loader.start()
+    
+    def resolve(self, code: str) -> Optional[Product]:
+        """Find a product by ID, falling back to barcode"""
+        if self._watcher.changed():
+            # Changed elsewhere: keep answering from the current index while it is rebuilt
+            self.refresh()
+        return self._by_id.get(code) or self._by_barcode.get(code)
+    
+    def put(self, product: Product):
+        """Add or replace one product after a local write"""
+        product = replace(product)  # Don't alias the caller's object
+        self._record(product.product_id, product)
+    
+    def remove(self, product_id: str):
+        """Remove one product after a local write"""
+        self._record(product_id, None)
+    
+    def acknowledge(self, before, after):
+        """Take a local write that moved catalog_version from before to after as already applied"""
+        self._watcher.acknowledge(before, after)
+    
+    def _record(self, product_id: str, product: Optional[Product]):
+        """Apply a local write, and remember it for a load in progress"""
+        with self._lock:
+            self._apply(self._by_id, self._by_barcode, product_id, product)
+            if self._pending is not None:
+                self._pending.append((product_id, product))
+    
+    @staticmethod
+    def _apply(by_id: Dict[str, Product], by_barcode: Dict[str, Product],
+               product_id: str, product: Optional[Product]):
+        """Replace (or, with product None, remove) one product in a pair of index dicts"""
+        old = by_id.pop(product_id, None)
+        if old is not None and old.barcode and by_barcode.get(old.barcode) is old:
+            del by_barcode[old.barcode]
+        if product is not None:
+            by_id[product_id] = product
+            if product.barcode:
+                by_barcode[product.barcode] = product
+    
+    def close(self):
+        """Wait for a background load to finish and close the watcher connection"""
+        if self._loader is not None:
+            self._loader.join()
+        self._watcher.close()
+    
+    def __len__(self) -> int:
+        """Number of indexed products"""
+        return len(self._by_id)
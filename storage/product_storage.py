@@ -1,89 +1,304 @@
 """
 Product Storage - SQLite database storage for products
 """
-from typing import List, Optional
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
 from models.product import Product
 from database.db_connection import DatabaseConnection
+from database.change_watcher import ChangeWatcher
+from storage.product_cache import ProductCache
+from storage.product_index import ProductIndex
+from storage.batching import in_batches
 
 
 class ProductStorage:
     """Product storage using SQLite database"""
     
-    def __init__(self, db: DatabaseConnection = None):
-        """Initialize product storage"""
+    def __init__(self, db: DatabaseConnection = None, cache_size: int = 0,
+                 coherence_interval: float = 1.0, preload_index: bool = False,
+                 index_in_background: bool = False):
+        """
+        Initialize product storage
+        cache_size: maximum products kept in the read-through cache (0 disables caching)
+        coherence_interval: seconds between checks for catalog changes made elsewhere
+        preload_index: load the whole catalog into an ID/barcode index for resolve()
+        index_in_background: build that index on a background thread; resolve() queries
+            SQLite until it is ready, so startup time does not grow with the catalog
+        """
         self.db = db or DatabaseConnection()
+        self.cache: Optional[ProductCache] = None
+        self._watcher: Optional[ChangeWatcher] = None
+        if cache_size > 0:
+            self.cache = ProductCache(cache_size)
+            self._watcher = ChangeWatcher(
+                self.db, "SELECT version FROM catalog_version WHERE id = 1", coherence_interval
+            )
+        self._fts_available: Optional[bool] = None
+        self.index: Optional[ProductIndex] = None
+        if preload_index:
+            self.index = ProductIndex(self, coherence_interval, index_in_background)
     
     def load_all(self) -> List[Product]:
         """Load all products from database"""
         rows = self.db.fetch_all("SELECT * FROM products")
         return [self._row_to_product(row) for row in rows]
     
+    def is_empty(self) -> bool:
+        """Check whether the catalog has no products without scanning it"""
+        return self.db.fetch_one("SELECT 1 FROM products LIMIT 1") is None
+    
     def get_by_id(self, product_id: str) -> Optional[Product]:
         """Get product by ID"""
+        if self.cache is not None:
+            self._check_coherence()
+            product = self.cache.get(product_id)
+            if product is not None:
+                return product
+        
         row = self.db.fetch_one(
             "SELECT * FROM products WHERE product_id = ?",
             (product_id,)
         )
-        return self._row_to_product(row) if row else None
+        return self._cache_row(row)
+    
+    def resolve(self, code: str) -> Optional[Product]:
+        """Find a product by ID or barcode (ID wins if both match)"""
+        if self.index is not None and self.index.ready:
+            product = self.index.resolve(code)
+            # While a rebuild runs, products added elsewhere may not be indexed yet
+            if product is not None or not self.index.refreshing:
+                return product
+        
+        row = self.db.fetch_one(
+            """SELECT * FROM products WHERE product_id = ? OR barcode = ?
+               ORDER BY product_id = ? DESC LIMIT 1""",
+            (code, code, code)
+        )
+        return self._row_to_product(row)
+    
+    def get_many(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Get products by ID in batched IN queries, returns {product_id: product}"""
+        ids = list(dict.fromkeys(product_ids))
+        products = {}
+        for batch, placeholders in in_batches(ids):
+            rows = self.db.fetch_all(
+                f"SELECT * FROM products WHERE product_id IN ({placeholders})",
+                tuple(batch)
+            )
+            for row in rows:
+                products[row['product_id']] = self._row_to_product(row)
+        return products
     
     def get_by_barcode(self, barcode: str) -> Optional[Product]:
         """Get product by barcode"""
+        if self.cache is not None:
+            self._check_coherence()
+            product = self.cache.get_by_barcode(barcode)
+            if product is not None:
+                return product
+        
         row = self.db.fetch_one(
             "SELECT * FROM products WHERE barcode = ?",
             (barcode,)
         )
-        return self._row_to_product(row) if row else None
+        return self._cache_row(row)
+    
+    def search(self, text: str, limit: int = 20) -> List[Tuple[Product, int]]:
+        """
+        Search products by name or category, best matches first.
+        Every word is matched as a prefix ("coc col" finds "Coca Cola").
+        Returns: [(product, stock), ...]
+        """
+        tokens = re.findall(r"\w+", text)
+        if not tokens:
+            return []
+        
+        if self._has_search_index():
+            match = " ".join(f'"{token}"*' for token in tokens)
+            rows = self.db.fetch_all(
+                """SELECT p.*, COALESCE(i.quantity, 0) AS stock
+                   FROM products_fts f
+                   JOIN products p ON p.rowid = f.rowid
+                   LEFT JOIN inventory i ON i.product_id = p.product_id
+                   WHERE products_fts MATCH ?
+                   ORDER BY f.rank
+                   LIMIT ?""",
+                (match, limit)
+            )
+        else:
+            conditions = " AND ".join("(p.name LIKE ? OR p.category LIKE ?)" for _ in tokens)
+            params = []
+            for token in tokens:
+                params.extend([f"%{token}%", f"%{token}%"])
+            rows = self.db.fetch_all(
+                f"""SELECT p.*, COALESCE(i.quantity, 0) AS stock
+                    FROM products p
+                    LEFT JOIN inventory i ON i.product_id = p.product_id
+                    WHERE {conditions}
+                    ORDER BY p.name
+                    LIMIT ?""",
+                tuple(params) + (limit,)
+            )
+        return [(self._row_to_product(row), row['stock']) for row in rows]
     
     def add(self, product: Product) -> bool:
         """Add a new product"""
-        # Check if product already exists
-        existing = self.get_by_id(product.product_id)
-        if existing:
-            return False
-        
-        self.db.execute(
-            """INSERT INTO products (product_id, name, price, barcode, category)
-               VALUES (?, ?, ?, ?, ?)""",
-            (product.product_id, product.name, product.price,
-             product.barcode, product.category)
-        )
+        with self.db.transaction():
+            # Check if product already exists
+            existing = self.get_by_id(product.product_id)
+            if existing:
+                return False
+            
+            version = self._catalog_version()
+            self.db.execute(
+                """INSERT INTO products (product_id, name, price, barcode, category)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (product.product_id, product.name, product.price,
+                 product.barcode, product.category)
+            )
+            self._invalidate(product.product_id, product, version)
         return True
     
+    def add_many(self, products: List[Product]) -> int:
+        """Add products in one executemany, skipping existing IDs; returns rows inserted"""
+        if not products:
+            return 0
+        with self.db.transaction():
+            version = self._catalog_version()
+            cursor = self.db.execute_many(
+                """INSERT OR IGNORE INTO products (product_id, name, price, barcode, category)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(p.product_id, p.name, p.price, p.barcode, p.category) for p in products]
+            )
+            # Existing IDs were skipped, so cached products are still current
+            self._reload(version, clear_cache=False)
+        return cursor.rowcount
+    
     def update(self, product: Product) -> bool:
         """Update an existing product"""
-        existing = self.get_by_id(product.product_id)
-        if not existing:
-            return False
-        
-        self.db.execute(
-            """UPDATE products 
-               SET name = ?, price = ?, barcode = ?, category = ?
-               WHERE product_id = ?""",
-            (product.name, product.price, product.barcode,
-             product.category, product.product_id)
-        )
+        with self.db.transaction():
+            existing = self.get_by_id(product.product_id)
+            if not existing:
+                return False
+            
+            version = self._catalog_version()
+            self.db.execute(
+                """UPDATE products 
+                   SET name = ?, price = ?, barcode = ?, category = ?
+                   WHERE product_id = ?""",
+                (product.name, product.price, product.barcode,
+                 product.category, product.product_id)
+            )
+            self._invalidate(product.product_id, product, version)
         return True
     
     def delete(self, product_id: str) -> bool:
         """Delete a product"""
-        existing = self.get_by_id(product_id)
-        if not existing:
-            return False
-        
-        self.db.execute("DELETE FROM products WHERE product_id = ?", (product_id,))
+        with self.db.transaction():
+            existing = self.get_by_id(product_id)
+            if not existing:
+                return False
+            
+            version = self._catalog_version()
+            self.db.execute("DELETE FROM products WHERE product_id = ?", (product_id,))
+            self._invalidate(product_id, None, version)
         return True
     
     def save_all(self, products: List[Product]):
         """Save all products (useful for migration, but not efficient for large datasets)"""
-        # Clear existing products
-        self.db.execute("DELETE FROM products")
-        # Insert all products
-        if products:
-            self.db.execute_many(
-                """INSERT INTO products (product_id, name, price, barcode, category)
-                   VALUES (?, ?, ?, ?, ?)""",
-                [(p.product_id, p.name, p.price, p.barcode, p.category) for p in products]
+        with self.db.transaction():
+            version = self._catalog_version()
+            # Clear existing products
+            self.db.execute("DELETE FROM products")
+            # Insert all products
+            if products:
+                self.db.execute_many(
+                    """INSERT INTO products (product_id, name, price, barcode, category)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    [(p.product_id, p.name, p.price, p.barcode, p.category) for p in products]
+                )
+            self._reload(version)
+    
+    def close(self):
+        """Stop index loading and close change-watcher connections"""
+        if self.index is not None:
+            self.index.close()
+        if self._watcher is not None:
+            self._watcher.close()
+    
+    def _has_search_index(self) -> bool:
+        """Check once whether the FTS5 search index exists"""
+        if self._fts_available is None:
+            row = self.db.fetch_one(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
             )
+            self._fts_available = row is not None
+        return self._fts_available
+    
+    def cache_stats(self) -> dict:
+        """Get product cache statistics (empty if caching is disabled)"""
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def _check_coherence(self):
+        """Drop the cache if another connection or terminal changed the catalog"""
+        if self._watcher.changed():
+            self.cache.clear()
+    
+    def _catalog_version(self) -> Optional[int]:
+        """Current catalog_version counter (None if nothing watches it)"""
+        if self._watcher is None and self.index is None:
+            return None
+        row = self.db.fetch_one("SELECT version FROM catalog_version WHERE id = 1")
+        return row[0] if row else None
+    
+    def _invalidate(self, product_id: str, product: Optional[Product] = None, version: Optional[int] = None):
+        """
+        Refresh the cache and index for one product written in the current unit of work.
+        The index only changes once the write commits; version is catalog_version
+        before the write, so the bump it makes is not taken for a change made elsewhere.
+        """
+        barcode = product.barcode if product is not None else None
+        if self.cache is not None:
+            # Evict now so the rest of the transaction reads the new row
+            self.cache.invalidate(product_id, barcode)
+        written = self._catalog_version() if version is not None else None
+        
+        def apply():
+            if self.cache is not None:
+                # Again after commit, in case another thread cached the old row meanwhile
+                self.cache.invalidate(product_id, barcode)
+                self._watcher.acknowledge(version, written)
+            if self.index is not None:
+                if product is not None:
+                    self.index.put(product)
+                else:
+                    self.index.remove(product_id)
+                self.index.acknowledge(version, written)
+        
+        self.db.after_commit(apply)
+    
+    def _reload(self, version: Optional[int], clear_cache: bool = True):
+        """After a bulk write commits, rebuild the index (and drop the cache) from the database"""
+        written = self._catalog_version() if version is not None else None
+        
+        def apply():
+            if self.cache is not None:
+                if clear_cache:
+                    self.cache.clear()
+                self._watcher.acknowledge(version, written)
+            if self.index is not None:
+                self.index.load()
+                self.index.acknowledge(version, written)
+        
+        self.db.after_commit(apply)
+    
+    def _cache_row(self, row) -> Optional[Product]:
+        """Convert a row to a Product and remember it in the cache"""
+        product = self._row_to_product(row)
+        # Rows read inside a unit of work may still be rolled back, so don't cache them
+        if product is not None and self.cache is not None and not self.db.in_transaction:
+            self.cache.put(product)
+        return product
     
     def _row_to_product(self, row) -> Optional[Product]:
         """Convert database row to Product object"""
@@ -0,0 +1,69 @@
+"""
+Register Report Storage - One day's sales lines for register reports, and Z-report closings
+"""
+from typing import Callable, Iterator, Optional
+from database.db_connection import DatabaseConnection
+
+# Every line of the day's orders; order lines arrive contiguously because orders drive the join
+_ORDER_LINES = """
+    SELECT o.order_key, o.order_id, o.created_at, o.total_amount, o.payment_method, o.paid_amount,
+           oi.quantity, oi.quantity * oi.unit_price AS amount, COALESCE(p.category, '') AS category
+    FROM orders o
+    LEFT JOIN order_items oi ON oi.order_key = o.order_key
+    LEFT JOIN products p ON p.product_id = oi.product_id
+    WHERE o.created_at >= ? AND o.created_at < ?
+    ORDER BY o.created_at, o.order_id
+"""
+
+# Every line of the day's returns, with the payment method of the original order
+_RETURN_LINES = """
+    SELECT r.return_id, o.payment_method, ri.quantity, ri.quantity * ri.unit_price AS amount
+    FROM returns r
+    JOIN return_items ri ON ri.order_id = r.order_id AND ri.return_id = r.return_id
+    LEFT JOIN orders o ON o.order_id = r.order_id
+    WHERE r.created_at >= ? AND r.created_at < ?
+    ORDER BY r.created_at, r.return_id
+"""
+
+
+class RegisterReportStorage:
+    """
+    Streams the order and return lines of a time range in created_at order,
+    and records numbered Z-report closings in z_reports (one per day).
+    """
+    
+    def __init__(self, db: DatabaseConnection = None):
+        """Initialize register report storage"""
+        self.db = db or DatabaseConnection()
+    
+    def order_lines(self, start: str, end: str) -> Iterator:
+        """Order lines (one row per item; orders without items give one row with NULL quantity)"""
+        return self.db.iter_rows(_ORDER_LINES, (start, end))
+    
+    def return_lines(self, start: str, end: str) -> Iterator:
+        """Returned lines of returns processed in [start, end)"""
+        return self.db.iter_rows(_RETURN_LINES, (start, end))
+    
+    def get_closing(self, day: str) -> Optional[dict]:
+        """The Z report that closed a day, if any"""
+        row = self.db.fetch_one("SELECT * FROM z_reports WHERE day = ?", (day,))
+        return dict(row) if row else None
+    
+    def add_closing(self, day: str, generated_at: str, orders: int, net_sales: float,
+                    path_for: Callable[[int], str]) -> int:
+        """
+        Close a day under the next Z number and return the number (joins the caller's
+        transaction); path_for(z_number) is the path the report will be written to.
+        Raises ValueError if the day is already closed.
+        """
+        with self.db.transaction():
+            closed = self.get_closing(day)
+            if closed:
+                raise ValueError(f"{day} was already closed by Z report {closed['z_number']:04d}")
+            z_number = self.db.fetch_one("SELECT COALESCE(MAX(z_number), 0) + 1 FROM z_reports")[0]
+            self.db.execute(
+                """INSERT INTO z_reports (z_number, day, generated_at, orders, net_sales, report_path)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (z_number, day, generated_at, orders, round(net_sales, 2), path_for(z_number))
+            )
+        return z_number
@@ -0,0 +1,89 @@
+"""
+Return Storage - SQLite ledger of returns
+"""
+from typing import Dict, Iterable, List, Tuple
+from database.db_connection import DatabaseConnection
+from storage.batching import in_batches
+from storage.sales_summary_storage import SalesSummaryStorage
+
+
+class ReturnStorage:
+    """
+    Append-only return ledger.
+    Orders keep their original lines; what has been returned is the sum of
+    return_items per (order_id, product_id), read from a covering index.
+    """
+    
+    def __init__(self, db: DatabaseConnection = None, sales_summary: SalesSummaryStorage = None):
+        """Initialize return storage (every return also adjusts the sales summary)"""
+        self.db = db or DatabaseConnection()
+        self.sales_summary = sales_summary or SalesSummaryStorage(self.db)
+    
+    def returned_quantities(self, order_id: str, product_ids: Iterable[str] = None) -> Dict[str, int]:
+        """Quantity already returned per product of an order (all products, or only product_ids)"""
+        if product_ids is None:
+            rows = self.db.fetch_all(
+                """SELECT product_id, SUM(quantity) AS returned FROM return_items
+                   WHERE order_id = ? GROUP BY product_id""",
+                (order_id,)
+            )
+            return {row['product_id']: row['returned'] for row in rows}
+        
+        returned = {}
+        for batch, placeholders in in_batches(product_ids):
+            rows = self.db.fetch_all(
+                f"""SELECT product_id, SUM(quantity) AS returned FROM return_items
+                    WHERE order_id = ? AND product_id IN ({placeholders}) GROUP BY product_id""",
+                (order_id, *batch)
+            )
+            returned.update((row['product_id'], row['returned']) for row in rows)
+        return returned
+    
+    def has_returns(self, order_id: str) -> bool:
+        """Whether any return is recorded against an order"""
+        return self.db.fetch_one("SELECT 1 FROM returns WHERE order_id = ? LIMIT 1", (order_id,)) is not None
+    
+    def outstanding_units(self, order_id: str) -> int:
+        """Units of an order that have not been returned"""
+        row = self.db.fetch_one(
+            """SELECT COALESCE((SELECT SUM(oi.quantity) FROM order_items oi
+                                JOIN orders o ON o.order_key = oi.order_key
+                                WHERE o.order_id = ?), 0)
+                    - COALESCE((SELECT SUM(quantity) FROM return_items WHERE order_id = ?), 0)""",
+            (order_id, order_id)
+        )
+        return row[0]
+    
+    def add(self, return_id: str, order_id: str, lines: List[Tuple[str, int, float]],
+            return_amount: float, reason: str, created_at: str):
+        """Record a return; lines are (product_id, quantity, unit_price)"""
+        with self.db.transaction():
+            self.db.execute(
+                """INSERT INTO returns (return_id, order_id, return_amount, reason, created_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (return_id, order_id, return_amount, reason, created_at)
+            )
+            self.db.execute_many(
+                """INSERT INTO return_items (return_id, order_id, product_id, quantity, unit_price)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(return_id, order_id, product_id, quantity, unit_price)
+                 for product_id, quantity, unit_price in lines]
+            )
+            self.sales_summary.record_return(return_id)
+    
+    def get_by_order(self, order_id: str) -> List[dict]:
+        """Returns recorded against an order, oldest first, each with its lines"""
+        return_rows = self.db.fetch_all(
+            "SELECT * FROM returns WHERE order_id = ? ORDER BY created_at, return_id",
+            (order_id,)
+        )
+        item_rows = self.db.fetch_all(
+            """SELECT return_id, product_id, quantity, unit_price FROM return_items
+               WHERE order_id = ? ORDER BY id""",
+            (order_id,)
+        )
+        returns = {row['return_id']: dict(row, items=[]) for row in return_rows}
+        for row in item_rows:
+            if row['return_id'] in returns:
+                returns[row['return_id']]['items'].append(dict(row))
+        return list(returns.values())
@@ -0,0 +1,106 @@
+"""
+Sales Summary Storage - Per-day sales totals maintained alongside orders and returns
+"""
+from typing import Iterable, List, Optional
+from database.db_connection import DatabaseConnection
+from database.schema import (SUMMARY_ORDER_LINES, SUMMARY_RETURN_LINES, SUMMARY_ORDER_COLUMNS,
+                             SUMMARY_RETURN_COLUMNS, summary_upsert, rebuild_sales_summary)
+from storage.batching import in_batches
+
+# Breakdowns kept for every day; 'total' has a single row per day with key ''
+DIMENSIONS = ('total', 'payment_method', 'category', 'product')
+
+_RECORD_ORDERS = summary_upsert(SUMMARY_ORDER_LINES.format(where="o.order_key BETWEEN :first AND :last"),
+                                'order_key', SUMMARY_ORDER_COLUMNS)
+_RECORD_RETURN = summary_upsert(SUMMARY_RETURN_LINES.format(where="r.return_id = :return_id"),
+                                'return_id', SUMMARY_RETURN_COLUMNS)
+
+# Net units sold per catalog product in [?1, ?2) and the sum of squares of its daily net, as the
+# difference between the product's running totals before ?2 and before ?1: two primary-key
+# seeks per product, however long the range or the history is. {where} filters on p.product_id.
+_DEMAND = """
+    WITH bounds AS (
+        SELECT p.product_id, p.name,
+               (SELECT MAX(day) FROM product_demand WHERE product_id = p.product_id AND day < ?2) AS last_day,
+               (SELECT MAX(day) FROM product_demand WHERE product_id = p.product_id AND day < ?1) AS before_day
+        FROM products p
+        {where}
+    )
+    SELECT b.product_id, b.name, COALESCE(i.quantity, 0) AS stock,
+           e.units - COALESCE(s.units, 0) AS units, e.squares - COALESCE(s.squares, 0) AS squares
+    FROM bounds b
+    CROSS JOIN product_demand e ON e.product_id = b.product_id AND e.day = b.last_day
+    LEFT JOIN product_demand s ON s.product_id = b.product_id AND s.day = b.before_day
+    LEFT JOIN inventory i ON i.product_id = b.product_id
+    WHERE b.last_day >= ?1
+"""
+
+
+class SalesSummaryStorage:
+    """
+    Daily sales summary (orders, units, revenue, returns, refunds) broken down by
+    payment method, category and product. Orders count on the day they were
+    placed and returns on the day they were processed. Rows are adjusted inside
+    the transaction that writes the order or return, so reports read a handful
+    of primary-key rows instead of scanning order_items.
+    """
+    
+    def __init__(self, db: DatabaseConnection = None):
+        """Initialize sales summary storage"""
+        self.db = db or DatabaseConnection()
+    
+    def record_orders(self, first_key: int, last_key: int, sign: int = 1):
+        """Add orders with order_key in [first_key, last_key] to the summary (sign=-1 takes them back out)"""
+        self.db.execute(_RECORD_ORDERS, {'sign': sign, 'first': first_key, 'last': last_key})
+    
+    def record_return(self, return_id: str):
+        """Add a return to the summary"""
+        self.db.execute(_RECORD_RETURN, {'sign': 1, 'return_id': return_id})
+    
+    def rebuild(self):
+        """Recompute the whole summary from orders and returns"""
+        rebuild_sales_summary(self.db)
+    
+    def get(self, day: str, dimension: str = 'total', key: str = '') -> Optional[dict]:
+        """Get one summary row"""
+        row = self.db.fetch_one(
+            "SELECT * FROM sales_summary WHERE day = ? AND dimension = ? AND key = ?",
+            (day, dimension, key)
+        )
+        return dict(row) if row else None
+    
+    def breakdown(self, day: str, dimension: str, limit: int = -1) -> List[dict]:
+        """Rows of one dimension for a day, highest net revenue first (all rows unless limit is given)"""
+        rows = self.db.fetch_all(
+            """SELECT * FROM sales_summary WHERE day = ? AND dimension = ?
+               ORDER BY revenue - refunds DESC, key LIMIT ?""",
+            (day, dimension, limit)
+        )
+        return [dict(row) for row in rows]
+    
+    def days(self, start_day: str, end_day: str, dimension: str = 'total', key: str = '') -> List[dict]:
+        """Rows of one dimension key for each day in [start_day, end_day], oldest first"""
+        rows = self.db.fetch_all(
+            """SELECT * FROM sales_summary
+               WHERE day BETWEEN ? AND ? AND dimension = ? AND key = ?
+               ORDER BY day""",
+            (start_day, end_day, dimension, key)
+        )
+        return [dict(row) for row in rows]
+    
+    def product_demand(self, start_day: str, end_day: str, product_ids: Iterable[str] = None) -> List[dict]:
+        """
+        Net units (units sold less units returned) and sum of squared daily net units of every
+        catalog product with summary rows in [start_day, end_day), or of product_ids only,
+        with its name and stock
+        """
+        if product_ids is None:
+            rows = self.db.fetch_all(_DEMAND.format(where=""), (start_day, end_day))
+        else:
+            rows = []
+            for batch, placeholders in in_batches(product_ids):
+                rows += self.db.fetch_all(
+                    _DEMAND.format(where=f"WHERE p.product_id IN ({placeholders})"),
+                    (start_day, end_day, *batch)
+                )
+        return [dict(row) for row in rows]
@@ -4,6 +4,8 @@ UI Module
 from .checkout_ui import CheckoutUI
 from .return_ui import ReturnUI
 from .inventory_ui import InventoryUI
+from .stats_ui import StatsUI
+from .report_ui import ReportUI
 
-__all__ = ['CheckoutUI', 'ReturnUI', 'InventoryUI']
+__all__ = ['CheckoutUI', 'ReturnUI', 'InventoryUI', 'StatsUI', 'ReportUI']
 
@@ -2,20 +2,20 @@
 Checkout UI - User interface for checkout process
 """
 from services.checkout_service import CheckoutService
-from storage.product_storage import ProductStorage
 
 
 class CheckoutUI:
     """Checkout user interface"""
     
-    def __init__(self):
+    def __init__(self, checkout_service: CheckoutService = None):
         """Initialize checkout UI"""
-        self.checkout_service = CheckoutService()
-        self.product_storage = ProductStorage()
+        self.checkout_service = checkout_service or CheckoutService()
+        # Share the service's indexed product storage instead of opening another one
+        self.product_storage = self.checkout_service.product_storage
     
     def display_current_order(self):
         """Display current order details"""
-        if self.checkout_service.current_order is None or len(self.checkout_service.current_order.items) == 0:
+        if self.checkout_service.get_line_count() == 0:
             print("\nCurrent order is empty")
             return
         
@@ -41,10 +41,8 @@ class CheckoutUI:
         if product_input.lower() in ['done', 'finish', 'complete']:
             return False
         
-        # Try to find product by ID or barcode
-        product = self.product_storage.get_by_id(product_input)
-        if product is None:
-            product = self.product_storage.get_by_barcode(product_input)
+        # Find product by ID or barcode
+        product = self.product_storage.resolve(product_input)
         
         if product is None:
             print(f"Product not found: {product_input}")
@@ -75,7 +73,7 @@ class CheckoutUI:
     
     def process_payment(self):
         """Process payment"""
-        if self.checkout_service.current_order is None or len(self.checkout_service.current_order.items) == 0:
+        if self.checkout_service.get_line_count() == 0:
             print("Order is empty, cannot process payment")
             return
         
@@ -159,7 +157,7 @@ class CheckoutUI:
                 break
         
         # Check if order has items
-        if self.checkout_service.current_order is None or len(self.checkout_service.current_order.items) == 0:
+        if self.checkout_service.get_line_count() == 0:
             print("Order cancelled")
             return
         
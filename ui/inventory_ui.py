@@ -1,17 +1,24 @@
 """
 Inventory UI - User interface for viewing inventory
 """
+import math
 from services.inventory_service import InventoryService
+from services.reorder_service import ReorderService
 from storage.product_storage import ProductStorage
 
 
 class InventoryUI:
     """Inventory user interface"""
     
-    def __init__(self):
+    SEARCH_LIMIT = 20  # Maximum search results shown
+    REORDER_LIMIT = 50  # Maximum reorder list rows shown
+    
+    def __init__(self, inventory_service: InventoryService = None, product_storage: ProductStorage = None,
+                 reorder_service: ReorderService = None):
         """Initialize inventory UI"""
-        self.inventory_service = InventoryService()
-        self.product_storage = ProductStorage()
+        self.inventory_service = inventory_service or InventoryService()
+        self.product_storage = product_storage or ProductStorage(self.inventory_service.db)
+        self.reorder_service = reorder_service or ReorderService(self.inventory_service.db)
     
     def display_all_inventory(self):
         """Display all inventory with product details"""
@@ -21,53 +28,28 @@ class InventoryUI:
         print(f"{'Product ID':<12} {'Product Name':<25} {'Stock':<10} {'Status':<15}")
         print("-"*70)
         
-        # Get all products
-        products = self.product_storage.load_all()
+        # Stream the report in product ID order, one page at a time
+        total_rows = 0
+        for item in self.inventory_service.iter_inventory_report():
+            print(f"{item['product_id']:<12} {item['name']:<25} {item['stock']:<10} {item['status']:<15}")
+            total_rows += 1
         
-        if len(products) == 0:
+        if total_rows == 0:
             print("No products found in system")
             print("="*70)
             return
         
-        # Get inventory for each product
-        inventory_data = []
-        for product in products:
-            stock = self.inventory_service.get_stock(product.product_id)
-            status = "In Stock" if stock > 0 else "Out of Stock"
-            if stock > 0 and stock < 10:
-                status = "Low Stock"
-            
-            inventory_data.append({
-                'product': product,
-                'stock': stock,
-                'status': status
-            })
-        
-        # Sort by product ID
-        inventory_data.sort(key=lambda x: x['product'].product_id)
-        
-        # Display inventory
-        for item in inventory_data:
-            product = item['product']
-            stock = item['stock']
-            status = item['status']
-            print(f"{product.product_id:<12} {product.name:<25} {stock:<10} {status:<15}")
-        
         print("-"*70)
         
         # Summary
-        total_products = len(inventory_data)
-        in_stock = sum(1 for item in inventory_data if item['stock'] > 0)
-        out_of_stock = sum(1 for item in inventory_data if item['stock'] == 0)
-        low_stock = sum(1 for item in inventory_data if 0 < item['stock'] < 10)
-        total_items = sum(item['stock'] for item in inventory_data)
+        summary = self.inventory_service.get_inventory_summary()
         
         print(f"Summary:")
-        print(f"  Total Products: {total_products}")
-        print(f"  In Stock: {in_stock}")
-        print(f"  Out of Stock: {out_of_stock}")
-        print(f"  Low Stock (<10): {low_stock}")
-        print(f"  Total Items: {total_items}")
+        print(f"  Total Products: {summary['total_products']}")
+        print(f"  In Stock: {summary['in_stock']}")
+        print(f"  Out of Stock: {summary['out_of_stock']}")
+        print(f"  Low Stock (<{self.inventory_service.LOW_STOCK_THRESHOLD}): {summary['low_stock']}")
+        print(f"  Total Items: {summary['total_items']}")
         print("="*70)
     
     def display_product_inventory(self, product_id: str):
@@ -78,9 +60,7 @@ class InventoryUI:
             return
         
         stock = self.inventory_service.get_stock(product_id)
-        status = "In Stock" if stock > 0 else "Out of Stock"
-        if stock > 0 and stock < 10:
-            status = "Low Stock"
+        status = self.inventory_service.get_stock_status(stock)
         
         print("\n" + "="*60)
         print("Product Inventory Details")
@@ -92,34 +72,71 @@ class InventoryUI:
             print(f"Category: {product.category}")
         print(f"Current Stock: {stock}")
         print(f"Status: {status}")
+        forecast = self.reorder_service.forecast([product_id])
+        if forecast:
+            item = forecast[0]
+            print(f"Sales Velocity: {item['velocity']:.2f}/day (last {self.reorder_service.window_days} days)")
+            print(f"Days of Cover: {self._days(item['days_of_cover'])}")
+            print(f"Reorder Point: {math.ceil(item['reorder_point'])}")
+            if item['reorder']:
+                print(f"Reorder Now: {item['order_quantity']} units")
         print("="*60)
     
+    def display_reorder_list(self):
+        """Display products at or below their reorder point"""
+        reorder = self.reorder_service.reorder_list()
+        
+        print("\n" + "="*78)
+        print(f"Reorder List (sales velocity over the last {self.reorder_service.window_days} days, "
+              f"lead time {self.reorder_service.lead_time_days} days)")
+        print("="*78)
+        if not reorder:
+            print("No products need reordering")
+            print("="*78)
+            return
+        
+        print(f"{'Product ID':<12} {'Product Name':<25} {'Stock':>6} {'Per Day':>8} "
+              f"{'Cover':>7} {'Point':>6} {'Order':>7}")
+        print("-"*78)
+        for item in reorder[:self.REORDER_LIMIT]:
+            print(f"{item['product_id']:<12} {item['name'][:25]:<25} {item['stock']:>6} "
+                  f"{item['velocity']:>8.2f} {self._days(item['days_of_cover']):>7} "
+                  f"{math.ceil(item['reorder_point']):>6} {item['order_quantity']:>7}")
+        print("-"*78)
+        if len(reorder) > self.REORDER_LIMIT:
+            print(f"(showing the {self.REORDER_LIMIT} products with the least cover)")
+        print(f"Products to reorder: {len(reorder)}")
+        print(f"Units to order: {sum(item['order_quantity'] for item in reorder)}")
+        print("="*78)
+    
     def search_inventory(self):
         """Search inventory by product ID or name"""
-        print("\nEnter product ID to view details (or press Enter to view all):")
+        print("\nEnter product ID to view details, 'R' for the reorder list (or press Enter to view all):")
         search_input = input("> ").strip()
         
         if not search_input:
             self.display_all_inventory()
+        elif search_input.upper() == 'R':
+            self.display_reorder_list()
         else:
             # Try product ID first
             product = self.product_storage.get_by_id(search_input)
             if product:
                 self.display_product_inventory(search_input)
             else:
-                # Try searching by name (partial match)
-                products = self.product_storage.load_all()
-                matching = [p for p in products if search_input.lower() in p.name.lower()]
+                # Search by name or category (word prefixes)
+                matching = self.product_storage.search(search_input, limit=self.SEARCH_LIMIT)
                 
                 if len(matching) == 0:
                     print(f"No product found matching: {search_input}")
                 elif len(matching) == 1:
-                    self.display_product_inventory(matching[0].product_id)
+                    self.display_product_inventory(matching[0][0].product_id)
                 else:
                     print(f"\nFound {len(matching)} matching products:")
+                    if len(matching) == self.SEARCH_LIMIT:
+                        print(f"(showing the best {self.SEARCH_LIMIT} matches, refine your search to narrow down)")
                     print("-"*60)
-                    for p in matching:
-                        stock = self.inventory_service.get_stock(p.product_id)
+                    for p, stock in matching:
                         print(f"{p.product_id} - {p.name} (Stock: {stock})")
                     print("-"*60)
                     print("\nEnter product ID to view details:")
@@ -127,6 +144,11 @@ class InventoryUI:
                     if product_id:
                         self.display_product_inventory(product_id)
     
+    @staticmethod
+    def _days(days: float) -> str:
+        """Format days of cover"""
+        return "-" if math.isinf(days) else f"{days:.1f}d"
+    
     def run(self):
         """Run inventory viewing process"""
         print("\n" + "="*60)
@@ -0,0 +1,42 @@
+"""
+Report UI - User interface for register reports
+"""
+from services.register_report_service import RegisterReportService
+
+
+class ReportUI:
+    """Register report user interface"""
+    
+    def __init__(self, register_report_service: RegisterReportService):
+        """Initialize report UI"""
+        self.register_report_service = register_report_service
+    
+    def run(self):
+        """Run register report"""
+        print("\n" + "="*60)
+        print("Register Report")
+        print("="*60)
+        print("1. X report (mid-day, does not close the day)")
+        print("2. Z report (end of day, closes the day)")
+        choice = input("> ").strip()
+        
+        if choice == '1':
+            report = self.register_report_service.x_report()
+        elif choice == '2':
+            day = input("Day to close (YYYY-MM-DD, Enter for yesterday): ").strip() or None
+            print(f"\nClose {day or 'yesterday'}? This can only be done once per day (y/n):")
+            if input("> ").strip().lower() != 'y':
+                print("Z report cancelled")
+                return
+            try:
+                report = self.register_report_service.z_report(day)
+            except ValueError as e:
+                print(f"\n✗ {e}")
+                return
+        else:
+            print("Invalid selection")
+            return
+        
+        print()
+        print(self.register_report_service.render(report), end="")
+        print(f"Report saved to {report['path']}")
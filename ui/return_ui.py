@@ -7,9 +7,9 @@ from services.return_service import ReturnService
 class ReturnUI:
     """Return user interface"""
     
-    def __init__(self):
+    def __init__(self, return_service: ReturnService = None):
         """Initialize return UI"""
-        self.return_service = ReturnService()
+        self.return_service = return_service or ReturnService()
     
     def display_order(self, order):
         """Display order details"""
@@ -157,6 +157,7 @@ class ReturnUI:
         print("\n" + "="*60)
         print("RETURN RECEIPT")
         print("="*60)
+        print(f"Return ID: {return_info['return_id']}")
         print(f"Order ID: {return_info['order_id']}")
         print(f"Return Time: {return_info['return_time']}")
         if return_info.get('reason'):
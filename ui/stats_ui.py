@@ -0,0 +1,55 @@
+"""
+Stats UI - User interface for query and latency statistics
+"""
+from database.instrumentation import instrumentation
+
+
+class StatsUI:
+    """Statistics user interface"""
+    
+    TOP_STATEMENTS = 10  # Number of slowest statements shown
+    
+    def display_stats(self):
+        """Display collected operation and statement statistics"""
+        stats = instrumentation.snapshot()
+        
+        print("\n" + "="*90)
+        print("Performance Statistics")
+        print("="*90)
+        print(f"Connections opened: {stats['connections_opened']}")
+        print(f"SQL statements executed: {stats['statement_count']}")
+        
+        print("-"*90)
+        print(f"{'Operation':<30} {'Count':>8} {'Mean ms':>10} {'p50 ms':>10} {'p99 ms':>10} {'Max ms':>10}")
+        print("-"*90)
+        if not stats['operations']:
+            print("No operations recorded yet")
+        for name, summary in sorted(stats['operations'].items()):
+            print(f"{name:<30} {summary['count']:>8} {summary['mean_ms']:>10.3f} "
+                  f"{summary['p50_ms']:>10.3f} {summary['p99_ms']:>10.3f} {summary['max_ms']:>10.3f}")
+        
+        print("-"*90)
+        print(f"Top {self.TOP_STATEMENTS} statements by total time:")
+        print(f"{'Count':>8} {'Total ms':>10} {'Mean ms':>10} {'p99 ms':>10}  Statement")
+        print("-"*90)
+        statements = sorted(stats['statements'].items(), key=lambda x: x[1]['total_ms'], reverse=True)
+        for sql, summary in statements[:self.TOP_STATEMENTS]:
+            print(f"{summary['count']:>8} {summary['total_ms']:>10.2f} {summary['mean_ms']:>10.3f} "
+                  f"{summary['p99_ms']:>10.3f}  {sql[:45]}")
+        print("="*90)
+    
+    def run(self):
+        """Run statistics viewing process"""
+        if not instrumentation.enabled:
+            print("\nStatistics collection is disabled.")
+            print("Enable it now? (y/n):")
+            if input("> ").strip().lower() == 'y':
+                instrumentation.enable()
+                print("Statistics collection enabled")
+            return
+        
+        self.display_stats()
+        print("\nReset statistics? (y/n):")
+        if input("> ").strip().lower() == 'y':
+            instrumentation.reset()
+            print("Statistics reset")